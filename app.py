@@ -7,8 +7,11 @@ Supports voyoutube.com URL pattern (like ssyoutube.com)
 import os
 import re
 import threading
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, session, g
-from flask_cors import CORS
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, redirect, url_for, session, g, make_response
 from dotenv import load_dotenv
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -22,6 +25,10 @@ logger = get_logger(__name__)
 
 # Import central configuration
 from src.config import Config
+from src.redis_config import get_probe_redis_client
+
+# Credentials in a database URL (masked in /health output)
+DB_URL_MASK_PATTERN = re.compile(r'://[^:]+:[^@]+@')
 
 # Set Google credentials if file exists
 google_creds_path = os.path.join(
@@ -33,6 +40,8 @@ if os.path.exists(google_creds_path):
 
 # Import database and tasks
 from src.database import Database, Video
+from src.cache import SingleFlightCache, LocalTTLCache
+from src.view_counter import create_view_counter
 from src.storage import R2Storage
 from src.validators import (
     validate_youtube_url,
@@ -42,50 +51,148 @@ from src.validators import (
     ValidationError
 )
 
-# Try to import Celery tasks and check if Redis is available
+# Jobs are enqueued by task name, so the web process only loads the Celery
+# app - not src.tasks and the pipeline libraries it imports. Whether Redis is
+# reachable is checked lazily in use_celery() so startup never blocks on it
+PROCESS_VIDEO_TASK = 'src.tasks.process_video_task'
+
 try:
-    from src.tasks import process_video_task
-    from src.redis_config import get_redis_url, test_redis_connection
-    import redis
-    import time
+    from celery_app import celery_app
+    CELERY_IMPORTED = True
+except Exception as e:
+    CELERY_IMPORTED = False
+    logger.error("celery_unavailable",
+                error=str(e),
+                fallback="threading",
+                hint="Celery app could not be imported")
+    if Config.REQUIRE_CELERY:
+        # No in-app fallback allowed: fail the deploy instead of refusing every job
+        raise
+
+USE_CELERY = None  # None = not checked yet
+CELERY_RECHECK_INTERVAL = 30  # Seconds before re-checking Redis after a failure
+_celery_checked_at = 0.0
+_celery_lock = threading.Lock()
+
+
+def use_celery():
+    """
+    Whether jobs should go to Celery (Redis reachable) or run in a thread.
 
-    # Get Redis URL from environment
-    redis_url = os.getenv('REDIS_URL')
-    max_retries = 3
-    retry_delay = 2
+    Checked on first use instead of at import. A successful check is cached
+    for the life of the process; a failed one is retried after
+    CELERY_RECHECK_INTERVAL so Redis can come up after the app.
+    """
+    global USE_CELERY, _celery_checked_at
+
+    if USE_CELERY or not CELERY_IMPORTED:
+        return bool(USE_CELERY)
+
+    with _celery_lock:
+        if USE_CELERY is not None and (
+            USE_CELERY or time.time() - _celery_checked_at < CELERY_RECHECK_INTERVAL
+        ):
+            return USE_CELERY
 
-    for attempt in range(max_retries):
+        redis_url = os.getenv('REDIS_URL')
         try:
-            # Increased timeout for Railway's internal network
-            # socket_keepalive causes "Error 22" on Railway, so disabled
-            r = redis.from_url(redis_url, socket_connect_timeout=10)
-            r.ping()
+            # Short-timeout probe pool: this runs on a request thread (/process)
+            get_probe_redis_client(redis_url).ping()
             USE_CELERY = True
             logger.info("celery_available",
                        status="using celery for task processing",
-                       redis_url=redis_url,
-                       attempt=attempt + 1)
-            break
+                       redis_url=redis_url)
         except Exception as e:
-            if attempt < max_retries - 1:
-                logger.warning(f"Redis connection attempt {attempt + 1} failed, retrying in {retry_delay}s: {e}")
-                time.sleep(retry_delay)
-            else:
-                raise e
+            USE_CELERY = False
+            # Log detailed error for debugging
+            logger.error("celery_unavailable",
+                        error=str(e),
+                        redis_url=redis_url or 'NOT SET',
+                        fallback="threading",
+                        hint="Redis connection failed. Check Railway logs!")
+            logger.warning("IMPORTANT: Running in threading mode - Celery worker will NOT receive tasks!")
+
+        _celery_checked_at = time.time()
+        return USE_CELERY
+
+
+# Pipeline components for local (non-Celery) jobs, imported once at startup
+# (and once per job worker process) instead of on every job. With
+# REQUIRE_CELERY jobs never run here, so the heavy imports are skipped.
+PIPELINE_IMPORTED = False
+PIPELINE_IMPORT_ERROR = "REQUIRE_CELERY is set; jobs only run on Celery workers"
+
+if not Config.REQUIRE_CELERY:
+    try:
+        from src.downloader import VideoDownloader
+        from src.transcriber import Transcriber
+        from src.translator import Translator
+        from src.tts_factory import get_tts_provider
+        from src.audio_mixer import AudioMixer
+        from src.video_processor import VideoProcessor
+        from src.gender_detector import detect_speaker_genders
+
+        # Stateless, so one mixer (volumes from Config) serves every job
+        audio_mixer = AudioMixer(
+            original_volume=Config.ORIGINAL_AUDIO_VOLUME,
+            voiceover_volume=Config.VOICEOVER_VOLUME
+        )
+        PIPELINE_IMPORTED = True
+        PIPELINE_IMPORT_ERROR = None
+    except Exception as e:
+        PIPELINE_IMPORT_ERROR = str(e)
+        logger.error("pipeline_unavailable",
+                    error=str(e),
+                    hint="Local (non-Celery) processing will fail until this is fixed")
 
-except Exception as e:
-    USE_CELERY = False
-    # Log detailed error for debugging
-    logger.error("celery_unavailable",
-                error=str(e),
-                redis_url=os.getenv('REDIS_URL', 'NOT SET'),
-                fallback="threading",
-                hint="Redis connection failed after retries. Check Railway logs!")
-    logger.warning("IMPORTANT: Running in threading mode - Celery worker will NOT receive tasks!")
-    import threading
 
 app = Flask(__name__)
-CORS(app, supports_credentials=True)
+
+# CORS: comma-separated allowed origins; '*' echoes any Origin (with credentials)
+CORS_ALLOWED_ORIGINS = frozenset(
+    origin.strip() for origin in os.getenv('CORS_ALLOWED_ORIGINS', '*').split(',') if origin.strip()
+)
+CORS_ALLOW_ANY_ORIGIN = '*' in CORS_ALLOWED_ORIGINS
+CORS_ALLOW_METHODS = 'GET, HEAD, POST, OPTIONS'
+
+
+@app.after_request
+def add_cors_headers(response):
+    """Add CORS headers to cross-origin responses (same-origin requests skip this)"""
+    origin = request.headers.get('Origin')
+    if not origin:
+        return response
+
+    response.vary.add('Origin')
+    if CORS_ALLOW_ANY_ORIGIN or origin in CORS_ALLOWED_ORIGINS:
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Access-Control-Allow-Credentials'] = 'true'
+        if request.method == 'OPTIONS':
+            # Preflight (answered by Flask's automatic OPTIONS handling)
+            response.headers['Access-Control-Allow-Methods'] = CORS_ALLOW_METHODS
+            requested_headers = request.headers.get('Access-Control-Request-Headers')
+            if requested_headers:
+                response.headers['Access-Control-Allow-Headers'] = requested_headers
+    return response
+
+
+# orjson-backed jsonify() when available (falls back to Flask's default)
+from src.json_provider import init_json_provider
+init_json_provider(app)
+
+# Compress JSON/HTML responses (optional dependency)
+try:
+    from flask_compress import Compress
+    app.config['COMPRESS_MIMETYPES'] = [
+        'application/json', 'text/html', 'text/css', 'application/javascript'
+    ]
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_LEVEL'] = 4    # gzip: fast, most of the gain
+    app.config['COMPRESS_BR_LEVEL'] = 4
+    Compress(app)
+    logger.info("Response compression enabled (br, gzip)")
+except ImportError:
+    logger.warning("flask-compress not available - responses sent uncompressed")
 
 # Security Configuration
 from flask_talisman import Talisman
@@ -124,9 +231,16 @@ logger.info(f"Security: Rate limiting enabled (storage: {'Redis' if os.getenv('R
 # Configuration from central config
 app.config['OUTPUT_DIR'] = Config.OUTPUT_DIR
 app.config['TEMP_DIR'] = Config.TEMP_DIR
+
+# Absolute, resolved once: /download checks every request against it
+# (send_from_directory would resolve a relative dir against the app root)
+OUTPUT_ROOT = Path(app.config['OUTPUT_DIR']).resolve()
+app.config['DOWNLOAD_ACCEL_PREFIX'] = Config.DOWNLOAD_ACCEL_PREFIX
+app.config['USE_X_SENDFILE'] = Config.USE_X_SENDFILE  # Honoured by send_from_directory
 app.config['MAX_VIDEO_LENGTH'] = Config.MAX_VIDEO_LENGTH
 app.config['MAX_FILE_SIZE'] = Config.MAX_FILE_SIZE
 app.config['MAX_CONCURRENT_JOBS'] = Config.MAX_CONCURRENT_JOBS
+app.config['STATUS_EVENTS_ENABLED'] = Config.STATUS_EVENTS_ENABLED
 app.config['SECRET_KEY'] = Config.SECRET_KEY
 
 # Session configuration
@@ -153,6 +267,9 @@ except Exception as e:
 # Initialize database and storage
 db = Database()
 
+# Page views are buffered and written to the database in batches
+view_counter = create_view_counter(db)
+
 # Initialize default tiers and admin user
 try:
     db.init_default_tiers()
@@ -171,11 +288,17 @@ except Exception as e:
     use_r2 = False
 
 
+# Polled/anonymous endpoints that never use g.user (skip the user lookup)
+ANONYMOUS_ENDPOINTS = frozenset({
+    'static', 'get_status', 'status_events', 'health_check', 'download_file'
+})
+
+
 @app.before_request
 def load_logged_in_user():
     """Load user before each request"""
     user_id = session.get('user_id')
-    if user_id is None:
+    if user_id is None or request.endpoint in ANONYMOUS_ENDPOINTS:
         g.user = None
     else:
         g.user = db.get_user_by_id(user_id)
@@ -186,11 +309,14 @@ def inject_user():
     """Inject user into all templates"""
     return dict(current_user=g.get('user', None))
 
-# Store Celery task IDs mapped to video IDs (Celery mode)
-task_id_map = {}  # video_id -> celery_task_id
-
 # Import distributed status tracker (Redis-based with in-memory fallback)
-from src.status_tracker import status_tracker
+from src.status_tracker import status_tracker, CoalescingStatusWriter
+
+# Coalesces threading-mode progress updates into one tracker/DB write per interval
+status_writer = CoalescingStatusWriter(
+    status_tracker,
+    persist=lambda vid, data: db.update_video_progress(vid, data['status'], data['progress'])
+)
 
 # Import the consolidated extract_video_id from validators
 from src.validators import extract_video_id
@@ -203,19 +329,14 @@ def construct_youtube_url(video_id):
 
 def process_video_threading(video_id, youtube_url, user_id=None):
     """Fallback threading-based video processing when Celery unavailable"""
-    from src.downloader import VideoDownloader
-    from src.transcriber import Transcriber
-    from src.translator import Translator
-    from src.tts_factory import get_tts_provider
-    from src.audio_mixer import AudioMixer
-    from src.video_processor import VideoProcessor
-    from src.gender_detector import detect_speaker_genders
-
     video_duration_minutes = 0  # Track for usage charging
 
     try:
+        if not PIPELINE_IMPORTED:
+            raise Exception(f"Processing pipeline unavailable: {PIPELINE_IMPORT_ERROR}")
+
         def update_status(message, progress=None):
-            status_tracker.update_status(video_id, {
+            status_writer.submit(video_id, {
                 'status': message,
                 'progress': progress or 0,
                 'video_id': video_id
@@ -227,10 +348,7 @@ def process_video_threading(video_id, youtube_url, user_id=None):
         transcriber = Transcriber()
         translator = Translator()
         tts = get_tts_provider()
-        mixer = AudioMixer(
-            original_volume=float(os.getenv('ORIGINAL_AUDIO_VOLUME', 0.05)),
-            voiceover_volume=float(os.getenv('VOICEOVER_VOLUME', 1.0))
-        )
+        mixer = audio_mixer
         processor = VideoProcessor(output_dir=app.config['OUTPUT_DIR'])
 
         # Step 1: Download video
@@ -240,13 +358,7 @@ def process_video_threading(video_id, youtube_url, user_id=None):
         video_duration_minutes = video_info.get('duration', 0) / 60  # Convert seconds to minutes
 
         # Update database with title
-        db.update_video_status(video_id, 'processing')
-        session = db.get_session()
-        video = session.query(Video).filter_by(video_id=video_id).first()
-        if video:
-            video.title = video_title
-            session.commit()
-        db.close_session(session)
+        db.update_video_status(video_id, 'processing', title=video_title)
 
         # Step 2: Transcribe audio
         update_status("Transcribing audio...", 25)
@@ -286,18 +398,18 @@ def process_video_threading(video_id, youtube_url, user_id=None):
 
         update_status(f"Transcription complete: {len(segments)} segments", 40)
 
-        # Step 3: Translate to Georgian
-        update_status("Translating to Georgian...", 45)
-        translated_segments = translator.translate_segments(
-            segments,
-            progress_callback=lambda msg: update_status(f"Translation: {msg}", 50),
-            speakers=speakers  # Pass speaker info for context-aware translation
-        )
-        update_status("Translation complete", 55)
-
-        # Step 4: Generate Georgian voiceover
+        # Step 3+4: Translate to Georgian and generate voiceover
         # Check if we have multiple speakers for multi-voice synthesis
         if speakers and len(speakers) > 1:
+            # Voice assignment needs the full translation, so translate up front
+            update_status("Translating to Georgian...", 45)
+            translated_segments = translator.translate_segments(
+                segments,
+                progress_callback=lambda msg: update_status(f"Translation: {msg}", 50),
+                speakers=speakers  # Pass speaker info for context-aware translation
+            )
+            update_status("Translation complete", 55)
+
             update_status(f"Starting multi-voice synthesis for {len(speakers)} speakers...", 60)
 
             # Initialize voice manager
@@ -331,35 +443,32 @@ def process_video_threading(video_id, youtube_url, user_id=None):
             )
             update_status("Multi-voice generation complete", 75)
         else:
-            # Single voice
-            update_status("Generating Georgian voiceover...", 60)
-            voiceover_segments = tts.generate_voiceover(
-                translated_segments,
+            # Single voice: stream translated chunks into TTS so synthesis
+            # runs while later chunks are still being translated
+            update_status("Translating and generating Georgian voiceover...", 45)
+            voiceover_segments = tts.synthesize_stream(
+                translator.translate_stream(
+                    segments,
+                    progress_callback=lambda msg: update_status(f"Translation: {msg}", 55),
+                    speakers=speakers
+                ),
                 temp_dir=app.config['TEMP_DIR'],
                 progress_callback=lambda msg: update_status(f"TTS: {msg}", 70)
             )
             update_status("Voiceover generation complete", 75)
 
-        # Step 5: Mix audio
-        update_status("Mixing audio tracks...", 80)
-        mixed_audio_path = os.path.join(app.config['TEMP_DIR'], f"{video_id}_mixed.wav")
-        mixer.mix_audio(
-            video_info['audio_path'],
-            voiceover_segments,
-            mixed_audio_path,
-            progress_callback=lambda msg: update_status(f"Mixing: {msg}", 85)
-        )
-        update_status("Audio mixing complete", 90)
-
-        # Step 6: Combine with video
-        update_status("Creating final video...", 92)
+        # Step 5+6: Mix audio and combine with video in a single ffmpeg pass
+        update_status("Mixing audio and creating final video...", 80)
+        downloader.wait_for_video_download(timeout=600)
         output_filename = f"{video_id}_georgian.mp4"
-        final_video_path = processor.combine_video_audio(
+        final_video_path = mixer.mix_and_mux(
             video_info['video_path'],
-            mixed_audio_path,
-            output_filename,
-            progress_callback=lambda msg: update_status(f"Video: {msg}", 95)
+            video_info['audio_path'],
+            voiceover_segments,
+            processor.output_dir / output_filename,
+            progress_callback=lambda msg: update_status(f"Mixing: {msg}", 88)
         )
+        update_status("Final video created", 95)
 
         # Step 7: Upload to R2 if configured
         r2_url = None
@@ -376,6 +485,7 @@ def process_video_threading(video_id, youtube_url, user_id=None):
 
         # Update database
         update_status("Processing complete!", 100)
+        status_writer.flush(video_id)
         db.update_video_status(video_id, 'completed', r2_url=r2_url)
 
         # Charge user for minutes used
@@ -391,6 +501,7 @@ def process_video_threading(video_id, youtube_url, user_id=None):
             'r2_url': r2_url,
             'title': video_title
         })
+        status_tracker.notify_changed(video_id)
 
         # Cleanup temporary files
         downloader.cleanup(video_id)
@@ -398,6 +509,7 @@ def process_video_threading(video_id, youtube_url, user_id=None):
     except Exception as e:
         error_msg = str(e)
         logger.error("processing_error", video_id=video_id, error=error_msg, exc_info=True)
+        status_writer.flush(video_id)
         status_tracker.update_status(video_id, {
             'status': f"Error: {error_msg}",
             'error': error_msg,
@@ -405,6 +517,156 @@ def process_video_threading(video_id, youtube_url, user_id=None):
             'progress': 0
         })
         db.update_video_status(video_id, 'failed', error_message=error_msg)
+        status_tracker.notify_changed(video_id)
+
+
+_job_executor = None
+_job_executor_lock = threading.Lock()
+
+
+def _init_job_worker():
+    """Load the Whisper model when a job worker starts, not during its first job"""
+    if not PIPELINE_IMPORTED:
+        return
+    try:
+        from src.transcriber import get_backend
+        get_backend()
+    except Exception as e:
+        # The job itself will report the failure
+        logger.warning("job_worker_warmup_failed", error=str(e))
+
+
+def _get_job_executor():
+    """
+    Executor for jobs when Celery is unavailable (created on first use)
+
+    A process pool by default; LOCAL_JOB_EXECUTOR=thread uses a thread pool
+    in this process instead. Either way at most MAX_CONCURRENT_JOBS run at once.
+    """
+    global _job_executor
+
+    if _job_executor is None:
+        with _job_executor_lock:
+            if _job_executor is None:
+                max_workers = app.config['MAX_CONCURRENT_JOBS']
+                if Config.LOCAL_JOB_EXECUTOR == 'thread':
+                    _job_executor = ThreadPoolExecutor(
+                        max_workers=max_workers,
+                        thread_name_prefix='vo',
+                        initializer=_init_job_worker
+                    )
+                else:
+                    # spawn, not fork: this process has live threads and DB connections
+                    _job_executor = ProcessPoolExecutor(
+                        max_workers=max_workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_job_worker
+                    )
+    return _job_executor
+
+
+def _reset_job_executor(executor):
+    """
+    Drop a broken process pool so the next job builds a fresh one.
+
+    A worker process that dies (e.g. killed for memory) breaks the whole
+    ProcessPoolExecutor; every later submit() would raise BrokenProcessPool.
+    """
+    global _job_executor
+
+    with _job_executor_lock:
+        if _job_executor is executor:
+            _job_executor = None
+    executor.shutdown(wait=False)
+
+
+# Jobs running without Celery; checked in /process instead of scanning the status tracker
+active_jobs = 0
+active_jobs_lock = threading.Lock()
+
+
+def _reserve_job_slot():
+    """Claim a local job slot; returns False if MAX_CONCURRENT_JOBS are already running"""
+    global active_jobs
+
+    with active_jobs_lock:
+        if active_jobs >= app.config['MAX_CONCURRENT_JOBS']:
+            return False
+        active_jobs += 1
+        return True
+
+
+def _release_job_slot(video_id):
+    """Free a local job slot and drop the job's in-memory status"""
+    global active_jobs
+
+    with active_jobs_lock:
+        active_jobs = max(active_jobs - 1, 0)
+
+    # The final status is in the database, which /status reads first
+    status_tracker.delete_status(video_id)
+
+
+def _on_local_job_done(video_id, executor, future):
+    """Clean up after a pool job; its final status is already in the database"""
+    try:
+        # exception() raises CancelledError on a cancelled future (pool shutdown)
+        error = 'Job cancelled' if future.cancelled() else future.exception()
+        if error is not None:
+            # The job crashed outside its own error handling, e.g. the worker
+            # process was killed for memory before reporting
+            logger.error("processing_error", video_id=video_id, error=str(error))
+            db.update_video_status(video_id, 'failed', error_message=str(error))
+            if isinstance(error, BrokenProcessPool):
+                _reset_job_executor(executor)
+
+        # Pool jobs signal in their own process; wake this process's SSE streams
+        status_tracker.notify_changed(video_id)
+    finally:
+        _release_job_slot(video_id)
+
+
+def start_local_job(video_id, youtube_url, user_id=None):
+    """
+    Run a job without Celery.
+
+    By default each job runs in a separate worker process so ffmpeg/Whisper
+    work doesn't compete with request handling for the GIL. Progress reaches
+    /status through the database. LOCAL_JOB_EXECUTOR=thread runs jobs on a
+    bounded thread pool in this process instead.
+
+    The caller must hold a slot from _reserve_job_slot(); it is released
+    when the job finishes.
+    """
+    try:
+        executor = _get_job_executor()
+        try:
+            future = executor.submit(process_video_threading, video_id, youtube_url, user_id)
+        except BrokenProcessPool:
+            # A worker died since the last job; retry once on a fresh pool
+            logger.warning("job_pool_broken_rebuilding", video_id=video_id)
+            _reset_job_executor(executor)
+            executor = _get_job_executor()
+            future = executor.submit(process_video_threading, video_id, youtube_url, user_id)
+    except Exception:
+        _release_job_slot(video_id)
+        raise
+    future.add_done_callback(lambda f: _on_local_job_done(video_id, executor, f))
+
+
+# Pages that look the same to every visitor (finished videos, video lists)
+# may be reused by browsers and a fronting CDN for this long
+PUBLIC_PAGE_MAX_AGE = 300
+
+
+def _public_page(html):
+    """Cacheable, conditional response for a page with no per-user content"""
+    response = make_response(html)
+    # Body hash; view counts come from cached rows, so it stays stable between refreshes
+    response.add_etag()
+    response.cache_control.public = True
+    response.cache_control.max_age = PUBLIC_PAGE_MAX_AGE
+    return response.make_conditional(request)
 
 
 @app.route('/')
@@ -430,35 +692,43 @@ def watch():
 
     if video and video.processing_status == 'completed':
         # Video already processed, show player
-        db.increment_view_count(video_id)
-        return render_template('player.html', video=video.to_dict())
+        # (views served from a browser/CDN cache aren't counted)
+        view_counter.record(video_id)
+        return _public_page(render_template('player.html', video=video.to_dict()))
 
     # For processing/new/failed videos, redirect to main page with video ID
     # Main page will show the video preview and wait for user to click translate
     return redirect(url_for('index', v=video_id))
 
 
+# The /shorts -> /watch mapping never changes, so browsers and a CDN may keep it
+SHORTS_REDIRECT_MAX_AGE = 86400
+
+
 @app.route('/shorts/<video_id>')
 def shorts(video_id):
-    """Handle YouTube Shorts URLs"""
-    return redirect(url_for('watch', v=video_id))
+    """Handle YouTube Shorts URLs (permanent, cacheable redirect)"""
+    response = redirect(url_for('watch', v=video_id), code=301)
+    response.cache_control.public = True
+    response.cache_control.max_age = SHORTS_REDIRECT_MAX_AGE
+    return response
 
 
 @app.route('/library')
 def library():
     """Show library of processed videos"""
+    # Already plain dicts (cached in Redis, invalidated when a video completes)
     recent_videos = db.get_recent_videos(limit=50)
-    return render_template('library.html',
-                         videos=[v.to_dict() for v in recent_videos])
+    return _public_page(render_template('library.html', videos=recent_videos))
 
 
 @app.route('/popular')
 def popular():
     """Show popular videos"""
     popular_videos = db.get_popular_videos(limit=50)
-    return render_template('library.html',
-                         videos=[v.to_dict() for v in popular_videos],
-                         title="Popular Videos")
+    return _public_page(render_template('library.html',
+                                        videos=popular_videos,
+                                        title="Popular Videos"))
 
 
 @app.route('/login')
@@ -495,14 +765,16 @@ def process_video():
     try:
         # Check authentication only if enabled
         if AUTH_ENABLED:
-            user = get_current_user()
+            user = g.user  # Loaded once per request by load_logged_in_user()
             if not user:
                 return jsonify({
                     'error': 'Please login to translate videos',
                     'login_required': True
                 }), 401
 
-            # Check if user has remaining minutes
+            # Check if user has remaining minutes, on a fresh row: the cached
+            # one can miss minutes a Celery worker charged since it was loaded
+            user = db.get_user_by_id(user.id, fresh=True) or user
             remaining = user.get_remaining_minutes()
             if remaining <= 0:
                 return jsonify({
@@ -547,15 +819,24 @@ def process_video():
                 'message': 'Video is already being processed. Please wait.'
             })
 
+        # Decide once, so the slot reserved below is released by the same path
+        celery_mode = use_celery()
+
+        # Production can require the task queue: never run the pipeline in a web worker
+        if should_process and not celery_mode and Config.REQUIRE_CELERY:
+            db.update_video_status(video_id, 'failed', error_message='Task queue unavailable')
+            return jsonify({
+                'success': False,
+                'error': 'Processing is temporarily unavailable. Please try again shortly.'
+            }), 503
+
         # Check concurrent job limits (only if we should process)
-        if should_process and not USE_CELERY:
-            all_statuses = status_tracker.get_all_statuses()
-            active_jobs = sum(1 for status in all_statuses.values()
-                            if not status.get('complete', False))
-            if active_jobs >= app.config['MAX_CONCURRENT_JOBS']:
-                # Rollback: Mark video as failed if we just created it
-                if created:
-                    db.update_video_status(video_id, 'failed', error_message='Too many concurrent jobs')
+        # (the slot is held until the local job finishes)
+        if should_process and not celery_mode:
+            if not _reserve_job_slot():
+                # Rollback: this request created or claimed the video, so
+                # hand it back as failed for a later retry
+                db.update_video_status(video_id, 'failed', error_message='Too many concurrent jobs')
                 return jsonify({
                     'success': False,
                     'error': f"Too many videos processing. Maximum {app.config['MAX_CONCURRENT_JOBS']} allowed."
@@ -570,14 +851,12 @@ def process_video():
 
         # Start background processing (Celery or threading)
         # Pass user_id to charge minutes after completion
-        user_id = None
-        if AUTH_ENABLED:
-            user = get_current_user()
-            user_id = user.id if user else None
+        user_id = g.user.id if AUTH_ENABLED and g.user else None
 
-        if USE_CELERY:
-            task = process_video_task.delay(video_id, youtube_url, user_id)
-            task_id_map[video_id] = task.id
+        if celery_mode:
+            task = celery_app.send_task(PROCESS_VIDEO_TASK, args=(video_id, youtube_url, user_id))
+            # In the database, not process memory, so every web worker can find it
+            db.set_video_task_id(video_id, task.id)
         else:
             # Initialize processing status for threading mode
             status_tracker.update_status(video_id, {
@@ -585,12 +864,7 @@ def process_video():
                 'progress': 0,
                 'video_id': video_id
             })
-            thread = threading.Thread(
-                target=process_video_threading,
-                args=(video_id, youtube_url, user_id)
-            )
-            thread.daemon = True
-            thread.start()
+            start_local_job(video_id, youtube_url, user_id)
 
         # Always return video_id as job_id for unified interface
         return jsonify({
@@ -605,6 +879,83 @@ def process_video():
         return jsonify({'error': error_msg}), 500
 
 
+# Coalesces concurrent polls: N clients polling one video cost one DB read per 0.5s
+status_cache = SingleFlightCache(ttl=0.5)
+
+# A completed video's status payload never changes (completed videos are never
+# reprocessed), so it's kept for much longer than in-progress snapshots
+completed_status_cache = LocalTTLCache(ttl=3600, maxsize=10000)
+
+
+def _get_status_payload(video_id, fresh=False):
+    """
+    Status payload for /status: long-lived copy if completed, else a 0.5s snapshot
+
+    Args:
+        video_id: YouTube video ID
+        fresh: Skip the 0.5s snapshot (used right after a change signal)
+    """
+    payload = completed_status_cache.get(video_id)
+    if payload is not None:
+        return payload
+
+    if fresh:
+        payload = _load_status(video_id)
+    else:
+        payload = status_cache.get_or_load(video_id, lambda: _load_status(video_id))
+    if payload.get('complete'):
+        completed_status_cache.set(video_id, payload)
+    return payload
+
+
+def _load_status(video_id):
+    """Build the /status payload for a video (DB first, then threading status)"""
+    # Check database first
+    video = db.get_video_by_id(video_id)
+    if video:
+        if video.processing_status == 'completed':
+            return {
+                'complete': True,
+                'status': video.status_message or 'Processing complete!',
+                'progress': 100,
+                'video_id': video_id,
+                'r2_url': video.r2_url,
+                'title': video.title
+            }
+        elif video.processing_status == 'failed':
+            return {
+                'complete': False,
+                'status': f"Error: {video.error_message}",
+                'error': video.error_message,
+                'progress': video.progress or 0
+            }
+        elif video.processing_status == 'processing':
+            # Return live progress updates!
+            return {
+                'complete': False,
+                'status': video.status_message or 'Processing...',
+                'progress': video.progress or 0,
+                'video_id': video_id
+            }
+
+    # If database doesn't have completed/failed status, check in-memory status
+    # For Celery mode, the task updates the database directly
+    # For threading mode, check the in-memory dict
+    if not use_celery():
+        # Check threading mode status
+        threading_status = status_tracker.get_status(video_id)
+        if threading_status:
+            return threading_status
+
+    # Default response - video is being processed
+    return {
+        'complete': False,
+        'status': 'Processing...',
+        'progress': 0,
+        'video_id': video_id
+    }
+
+
 @app.route('/status/<video_id>')
 def get_status(video_id):
     """Get processing status (Celery or threading)"""
@@ -615,50 +966,12 @@ def get_status(video_id):
         except ValidationError as ve:
             return jsonify({'error': ve.message}), ve.status_code
 
-        # Check database first
-        video = db.get_video_by_id(video_id)
-        if video:
-            if video.processing_status == 'completed':
-                return jsonify({
-                    'complete': True,
-                    'status': video.status_message or 'Processing complete!',
-                    'progress': 100,
-                    'video_id': video_id,
-                    'r2_url': video.r2_url,
-                    'title': video.title
-                })
-            elif video.processing_status == 'failed':
-                return jsonify({
-                    'complete': False,
-                    'status': f"Error: {video.error_message}",
-                    'error': video.error_message,
-                    'progress': video.progress or 0
-                })
-            elif video.processing_status == 'processing':
-                # Return live progress updates!
-                return jsonify({
-                    'complete': False,
-                    'status': video.status_message or 'Processing...',
-                    'progress': video.progress or 0,
-                    'video_id': video_id
-                })
-
-        # If database doesn't have completed/failed status, check in-memory status
-        # For Celery mode, the task updates the database directly
-        # For threading mode, check the in-memory dict
-        if not USE_CELERY:
-            # Check threading mode status
-            threading_status = status_tracker.get_status(video_id)
-            if threading_status:
-                return jsonify(threading_status)
+        response = jsonify(_get_status_payload(video_id))
 
-        # Default response - video is being processed
-        return jsonify({
-            'complete': False,
-            'status': 'Processing...',
-            'progress': 0,
-            'video_id': video_id
-        })
+        # Unchanged status -> 304 with an empty body
+        response.add_etag()
+        response.cache_control.max_age = 1
+        return response.make_conditional(request)
 
     except Exception as e:
         # Log the error and return JSON error response
@@ -672,28 +985,102 @@ def get_status(video_id):
         }), 500
 
 
+# /events/<video_id> stream timing (seconds)
+STATUS_STREAM_MAX_SECONDS = 300     # Close and let EventSource reconnect (frees the thread)
+STATUS_STREAM_RECHECK_SECONDS = 2   # Re-read without a signal (pool jobs, lost pub/sub)
+STATUS_STREAM_KEEPALIVE_SECONDS = 15
+STATUS_STREAM_RETRY_MS = 1000
+
+
+def _status_event_stream(video_id):
+    """Yield SSE frames with the status payload whenever it changes"""
+    deadline = time.monotonic() + STATUS_STREAM_MAX_SECONDS
+    seen = status_tracker.notifier.version(video_id)
+    last_data = None
+    last_sent = time.monotonic()
+
+    yield f"retry: {STATUS_STREAM_RETRY_MS}\n\n"
+    while True:
+        payload = _get_status_payload(video_id, fresh=True)
+        data = app.json.dumps(payload)
+        now = time.monotonic()
+
+        if data != last_data:
+            yield f"data: {data}\n\n"
+            last_data, last_sent = data, now
+        elif now - last_sent >= STATUS_STREAM_KEEPALIVE_SECONDS:
+            yield ": keepalive\n\n"
+            last_sent = now
+
+        if payload.get('complete') or payload.get('error') or now >= deadline:
+            return
+
+        seen = status_tracker.wait_for_change(video_id, seen, STATUS_STREAM_RECHECK_SECONDS)
+
+
+@app.route('/events/<video_id>')
+def status_events(video_id):
+    """Stream processing status as Server-Sent Events (pushes only on change)"""
+    try:
+        video_id = validate_video_id(video_id)
+    except ValidationError as ve:
+        return jsonify({'error': ve.message}), ve.status_code
+
+    return Response(
+        _status_event_stream(video_id),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Don't let nginx buffer the stream
+        }
+    )
+
+
 @app.route('/download/<filename>')
 def download_file(filename):
-    """Download processed video (fallback if R2 not configured)"""
+    """Download processed video (R2 signed URL, or local file if R2 not configured)"""
     # Sanitize filename to prevent path traversal attacks
     try:
         filename = sanitize_filename(filename)
     except ValidationError as ve:
         return jsonify({'error': ve.message}), ve.status_code
 
-    file_path = os.path.join(app.config['OUTPUT_DIR'], filename)
-
-    # Double-check the resolved path is within OUTPUT_DIR
-    output_dir_abs = os.path.abspath(app.config['OUTPUT_DIR'])
-    file_path_abs = os.path.abspath(file_path)
-    if not file_path_abs.startswith(output_dir_abs):
+    # Already uploaded: send the client straight to R2 so the bytes never
+    # pass through the app (local copy may have been cleaned up anyway).
+    # r2_url is only set to an R2 URL after a successful upload.
+    if use_r2 and storage:
+        video = db.get_video_by_id(filename.removesuffix('_georgian.mp4'))
+        if video and video.r2_url and not video.r2_url.startswith('/download/'):
+            return redirect(storage.presign_get(filename), code=302)
+
+    # One normalization pass; symlinks resolving outside OUTPUT_DIR are rejected too
+    file_path = (OUTPUT_ROOT / filename).resolve()
+    if not file_path.is_relative_to(OUTPUT_ROOT):
         return jsonify({'error': 'Invalid file path'}), 403
 
-    if os.path.exists(file_path):
-        return send_file(file_path, as_attachment=True)
-    else:
+    if not file_path.is_file():
         return jsonify({'error': 'File not found'}), 404
 
+    # Behind nginx: hand the transfer to the proxy (zero-copy sendfile)
+    # so the worker returns immediately instead of streaming the MP4
+    accel_prefix = app.config['DOWNLOAD_ACCEL_PREFIX']
+    if accel_prefix:
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{filename}"
+        response.headers['Content-Type'] = 'video/mp4' if filename.endswith('.mp4') else 'application/octet-stream'
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    # Conditional: honours Range (seeking, resumed downloads), ETag and If-Modified-Since
+    return send_from_directory(
+        OUTPUT_ROOT,
+        filename,
+        as_attachment=True,
+        conditional=True,
+        etag=True,
+        max_age=3600
+    )
+
 
 @app.route('/debug/<video_id>')
 @login_required
@@ -713,12 +1100,16 @@ def debug_video(video_id):
         debug_info = {
             'video_id': video_id,
             'database_record': video.to_dict(),
-            'celery_mode': USE_CELERY,
+            'celery_mode': use_celery(),
             'timestamp': datetime.now().isoformat()
         }
 
+        # The task stores no result (ignore_result), so only its id is known here
+        if video.celery_task_id:
+            debug_info['celery_task'] = {'id': video.celery_task_id}
+
         # If threading mode, include status tracker info
-        if not USE_CELERY:
+        if not use_celery():
             threading_status = status_tracker.get_status(video_id)
             if threading_status:
                 debug_info['threading_status'] = threading_status
@@ -752,15 +1143,18 @@ def get_console_logs(video_id):
     from src.console_logger import console
 
     try:
-        logs = console.get_logs(session_id=video_id, last_n=200)
-        formatted = console.format_for_display(logs)
+        # ?since=<next_cursor from the previous poll> returns only new lines
+        cursor = request.args.get('since', 0, type=int)
+        logs, lines, next_cursor, reset = console.get_logs_since(video_id, cursor=max(cursor, 0))
 
         return jsonify({
             'success': True,
             'video_id': video_id,
             'logs': logs,
-            'formatted': formatted,
-            'count': len(logs)
+            'formatted': '\n'.join(lines),
+            'count': len(logs),
+            'next_cursor': next_cursor,
+            'reset': reset
         })
     except Exception as e:
         logger.error(f"Error fetching console logs: {e}")
@@ -813,7 +1207,7 @@ def api_pipeline_debug(video_id):
             return jsonify({
                 'success': False,
                 'error': 'Debug data not available for this video. It may have been processed before debug logging was enabled.',
-                'video': video.to_dict()
+                'video': video.to_dict(include_debug_data=False)
             }), 404
 
         # Get video info too
@@ -822,7 +1216,7 @@ def api_pipeline_debug(video_id):
         return jsonify({
             'success': True,
             'video_id': video_id,
-            'video': video.to_dict() if video else None,
+            'video': video.to_dict(include_debug_data=False) if video else None,
             'debug_data': debug_data
         })
 
@@ -858,32 +1252,48 @@ def pipeline_viewer(video_id):
                              error=str(e))
 
 
+HEALTH_REDIS_CACHE_SECONDS = 5.0  # Liveness probes reuse one ping result for this long
+
+_health_redis_status = {'checked_at': 0.0, 'status': None}
+
+
+def _check_redis_health(redis_url):
+    """Ping Redis for /health, at most once per HEALTH_REDIS_CACHE_SECONDS"""
+    now = time.monotonic()
+    if (_health_redis_status['status'] is not None
+            and now - _health_redis_status['checked_at'] < HEALTH_REDIS_CACHE_SECONDS):
+        return _health_redis_status['status']
+
+    try:
+        get_probe_redis_client(redis_url).ping()
+        status = "connected"
+    except Exception as e:
+        status = f"error: {str(e)}"
+
+    _health_redis_status.update(checked_at=now, status=status)
+    return status
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint showing system status"""
     redis_status = "not_configured"
     redis_url = os.getenv('REDIS_URL', 'NOT SET')
+    celery_enabled = use_celery()
 
-    # Test Redis connection
+    # Test Redis connection (cached briefly; see _check_redis_health)
     if redis_url != 'NOT SET':
-        try:
-            import redis
-            r = redis.from_url(redis_url, socket_connect_timeout=2)
-            r.ping()
-            redis_status = "connected"
-        except Exception as e:
-            redis_status = f"error: {str(e)}"
+        redis_status = _check_redis_health(redis_url)
 
     # Show database URL (masked) for debugging
     db_url = os.getenv('DATABASE_URL', 'NOT SET (using SQLite!)')
     if db_url and '@' in db_url:
         # Mask password
-        import re
-        db_url = re.sub(r'://[^:]+:[^@]+@', '://***:***@', db_url)
+        db_url = DB_URL_MASK_PATTERN.sub('://***:***@', db_url)
 
     return jsonify({
         'status': 'healthy',
-        'mode': 'celery' if USE_CELERY else 'threading',
+        'mode': 'celery' if celery_enabled else 'threading',
         'database': {
             'url': db_url,
             'type': 'PostgreSQL' if os.getenv('DATABASE_URL') else 'SQLite (LOCAL!)'
@@ -892,11 +1302,34 @@ def health_check():
             'url': redis_url if redis_url != 'NOT SET' else None,
             'status': redis_status
         },
-        'celery_enabled': USE_CELERY,
-        'warning': None if USE_CELERY else 'Running in threading mode - Celery worker not receiving tasks!'
+        'celery_enabled': celery_enabled,
+        'warning': None if celery_enabled else 'Running in threading mode - Celery worker not receiving tasks!'
     })
 
 
+def run_gunicorn(port):
+    """
+    Serve the app with gunicorn instead of the Werkzeug dev server
+
+    Uses the same gunicorn.conf.py as the Procfile, binding to `port`.
+
+    Args:
+        port: Port to bind
+    """
+    from gunicorn.app.base import Application
+
+    class StandaloneApplication(Application):
+        def load_config(self):
+            self.load_config_from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py'))
+            self.cfg.set('bind', f'0.0.0.0:{port}')
+
+        def load(self):
+            return app
+
+    logger.info("gunicorn_starting", port=port)
+    StandaloneApplication().run()
+
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', os.getenv('FLASK_PORT', 5000)))
 
@@ -924,4 +1357,7 @@ Storage: {'Cloudflare R2' if use_r2 else 'Local files'}
 
 Press CTRL+C to stop the server
 """)
-    app.run(host='0.0.0.0', port=port, debug=True, threaded=True)
+    if os.getenv('FLASK_ENV') == 'production':
+        run_gunicorn(port)
+    else:
+        app.run(host='0.0.0.0', port=port, debug=True, threaded=True)
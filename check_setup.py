@@ -175,6 +175,7 @@ else:
     print()
     print("🚀 You can now start the application:")
     print("   PYTHONIOENCODING=utf-8 python app.py")
+    print("   (production: gunicorn -c gunicorn.conf.py app:app)")
     print()
     print("🌐 Then open: http://localhost:5001")
     print()
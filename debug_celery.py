@@ -20,6 +20,7 @@ Prerequisites:
 import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Try to load dotenv
@@ -29,6 +30,13 @@ try:
 except ImportError:
     print("[WARNING] python-dotenv not installed. Environment variables must be set manually.")
 
+# Use orjson for task bodies if installed (its JSONDecodeError subclasses json's)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -187,8 +195,15 @@ else:
         # Default queue name is 'celery'
         default_queue = 'celery'
 
-        # Check queue length
-        queue_len = r.llen(default_queue)
+        # Check queue length and peek at the head in one round-trip.
+        # LINDEX per position is O(1) at the head on every Redis version
+        # (missing positions come back as None on a short or empty queue)
+        pipe = r.pipeline(transaction=False)
+        pipe.llen(default_queue)
+        for position in range(5):
+            pipe.lindex(default_queue, position)
+        queue_len, *peeked = pipe.execute()
+        pending_tasks = [task_data for task_data in peeked if task_data is not None]
         print(f"\n[INFO] Default queue '{default_queue}' length: {queue_len}")
 
         if queue_len > 0:
@@ -198,10 +213,9 @@ else:
 
             # Peek at first few tasks
             print("\nPeeking at pending tasks (first 5):")
-            pending_tasks = r.lrange(default_queue, 0, 4)
             for i, task_data in enumerate(pending_tasks):
                 try:
-                    task_json = json.loads(task_data)
+                    task_json = _json_loads(task_data)
                     task_name = task_json.get('headers', {}).get('task', 'unknown')
                     task_id = task_json.get('headers', {}).get('id', 'unknown')
                     task_args = task_json.get('body', '')
@@ -209,8 +223,7 @@ else:
                     # Try to decode body if it's base64 encoded
                     try:
                         import base64
-                        body_decoded = base64.b64decode(task_args).decode('utf-8')
-                        body_json = json.loads(body_decoded)
+                        body_json = _json_loads(base64.b64decode(task_args))
                         args = body_json[0] if body_json else []
                     except:
                         args = 'encoded'
@@ -228,24 +241,36 @@ else:
 
         # Check other potential queues
         print("\nSearching for other Celery-related keys in Redis:")
-        celery_keys = r.keys('celery*') + r.keys('_kombu*') + r.keys('unacked*')
+        # SCAN instead of KEYS: KEYS walks the whole keyspace in one blocking call
+        celery_keys = []
+        for pattern in ('celery*', '_kombu*', 'unacked*'):
+            for key in r.scan_iter(match=pattern, count=1000):
+                celery_keys.append(key)
+                if len(celery_keys) >= 20:  # Limit to first 20
+                    break
+            if len(celery_keys) >= 20:
+                break
         if celery_keys:
-            for key in celery_keys[:20]:  # Limit to first 20
+            # Two pipelined round-trips (all TYPEs, then all sizes) instead of two per key
+            pipe = r.pipeline(transaction=False)
+            for key in celery_keys:
+                pipe.type(key)
+            key_types = [
+                t.decode('utf-8') if isinstance(t, bytes) else t
+                for t in pipe.execute()
+            ]
+
+            size_commands = {'list': pipe.llen, 'set': pipe.scard, 'hash': pipe.hlen, 'zset': pipe.zcard}
+            sized = []
+            for key, key_type_str in zip(celery_keys, key_types):
+                if key_type_str in size_commands:
+                    size_commands[key_type_str](key)
+                    sized.append(key)
+            sizes = dict(zip(sized, pipe.execute())) if sized else {}
+
+            for key, key_type_str in zip(celery_keys, key_types):
                 key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-                key_type = r.type(key)
-                key_type_str = key_type.decode('utf-8') if isinstance(key_type, bytes) else key_type
-
-                if key_type_str == 'list':
-                    size = r.llen(key)
-                elif key_type_str == 'set':
-                    size = r.scard(key)
-                elif key_type_str == 'hash':
-                    size = r.hlen(key)
-                elif key_type_str == 'zset':
-                    size = r.zcard(key)
-                else:
-                    size = 'N/A'
-
+                size = sizes.get(key, 'N/A')
                 print(f"  - {key_str}: type={key_type_str}, size={size}")
         else:
             print("  - No Celery-related keys found in Redis")
@@ -267,12 +292,18 @@ active = None  # Initialize for later use in summary
 
 try:
     # Try to inspect workers
-    i = celery_app.control.inspect()
-
-    # Check for active workers
-    active = i.active()
-    registered = i.registered()
-    stats = i.stats()
+    i = celery_app.control.inspect(timeout=1.0)
+
+    # Check for active workers. Each probe is a broadcast that waits out the
+    # full timeout, so run the three concurrently instead of back to back
+    # (each call takes its own broker connection from the pool)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        active_future = executor.submit(i.active)
+        registered_future = executor.submit(i.registered)
+        stats_future = executor.submit(i.stats)
+        active = active_future.result()
+        registered = registered_future.result()
+        stats = stats_future.result()
 
     if active is None and registered is None:
         print("\n[WARNING] No Celery workers are responding!")
@@ -321,28 +352,44 @@ print("7. DATABASE CHECK (Stuck videos)")
 print("=" * 70)
 
 try:
+    from sqlalchemy import func
     from src.database import Database, Video
     db = Database()
     session = db.get_session()
 
-    # Find videos stuck in 'processing'
-    processing_videos = session.query(Video).filter_by(processing_status='processing').all()
-
-    if processing_videos:
-        print(f"\n[WARNING] Found {len(processing_videos)} videos stuck in 'processing' status:")
-        for video in processing_videos[:10]:  # Limit output
+    # Find videos stuck in 'processing': count in the database, load only the rows shown
+    processing_count = session.query(func.count(Video.id)).filter_by(processing_status='processing').scalar()
+
+    if processing_count:
+        processing_videos = (
+            session.query(
+                Video.video_id, Video.title, Video.processing_status, Video.progress,
+                Video.status_message, Video.created_at
+            )
+            .filter_by(processing_status='processing')
+            .order_by(Video.created_at.desc())
+            .limit(10)  # Limit output
+            .all()
+        )
+        print(f"\n[WARNING] Found {processing_count} videos stuck in 'processing' status:")
+        for video in processing_videos:
             print(f"\n  Video ID: {video.video_id}")
             print(f"    - Title: {video.title}")
             print(f"    - Status: {video.processing_status}")
             print(f"    - Progress: {video.progress}%")
             print(f"    - Status Message: {video.status_message}")
             print(f"    - Created: {video.created_at}")
-            print(f"    - Updated: {video.updated_at}")
     else:
         print("\n[OK] No videos stuck in 'processing' status")
 
     # Also check failed videos
-    failed_videos = session.query(Video).filter_by(processing_status='failed').order_by(Video.updated_at.desc()).limit(5).all()
+    failed_videos = (
+        session.query(Video.video_id, Video.error_message)
+        .filter_by(processing_status='failed')
+        .order_by(Video.created_at.desc())
+        .limit(5)
+        .all()
+    )
     if failed_videos:
         print(f"\n[INFO] Recent failed videos ({len(failed_videos)} shown):")
         for video in failed_videos:
@@ -0,0 +1,23 @@
+"""
+Gunicorn configuration
+Used by the Procfile / nixpacks start command and by `python app.py` in production
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Each worker loads the pipeline and warms Whisper, so keep the process count
+# modest and serve concurrency with threads
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# gthread by default: local jobs run in process/thread pools, which gevent's
+# monkey-patching would interfere with. gevent is fine when every job goes to
+# Celery (REQUIRE_CELERY=true) and helps with many open /events streams.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+worker_connections = 1000  # gevent/eventlet only
+
+keepalive = 30   # /status pollers reuse their connection
+timeout = 600    # Long uploads/downloads
+graceful_timeout = 30
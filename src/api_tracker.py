@@ -7,13 +7,18 @@ Version: 2.0.0 - Redis-based with file fallback
 import time
 import json
 import os
+import atexit
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Tuple, Dict, Any
 from src.logging_config import get_logger
+from src.redis_config import get_redis_client
 
 logger = get_logger(__name__)
 
+# Seconds between writes of the file-based tracker's counters (also written at exit)
+USAGE_FLUSH_INTERVAL = 5
+
 # Try to import Redis - optional dependency
 try:
     import redis
@@ -23,6 +28,19 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("Redis not available - falling back to file-based API tracking")
 
+# Try to import orjson - optional dependency (faster usage file (de)serialization)
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(data) -> bytes:
+        return json.dumps(data, indent=2).encode('utf-8')
+
 
 class RedisAPITracker:
     """
@@ -81,18 +99,6 @@ class RedisAPITracker:
                 logger.warning(f"Hourly API limit reached: {hourly_count}/{self.hourly_limit}")
                 return False, "Hourly API limit reached. Please try again in the next hour."
 
-            # Check rate limiting using Redis timestamp
-            last_request = self.redis.get(self._get_rate_limit_key())
-            if last_request:
-                last_request_time = float(last_request)
-                current_time = time.time()
-                time_since_last = current_time - last_request_time
-
-                if time_since_last < self.min_request_interval:
-                    wait_time = self.min_request_interval - time_since_last
-                    logger.info(f"Rate limiting: waiting {wait_time:.1f}s")
-                    time.sleep(wait_time)
-
             return True, "OK"
 
         except RedisError as e:
@@ -100,6 +106,24 @@ class RedisAPITracker:
             # Fail open - allow request if Redis is down
             return True, "OK (Redis unavailable)"
 
+    def retry_after(self) -> float:
+        """
+        Seconds to wait before the next request to respect min_request_interval.
+
+        The timestamp is shared by every process, so this one uses wall-clock time.
+        The caller decides whether to sleep; nothing here blocks.
+        """
+        try:
+            last_request = self.redis.get(self._get_rate_limit_key())
+        except RedisError as e:
+            logger.error(f"Redis error in retry_after: {e}")
+            return 0.0
+
+        if not last_request:
+            return 0.0
+        time_since_last = time.time() - float(last_request)
+        return max(0.0, self.min_request_interval - time_since_last)
+
     def record_request(self, success: bool = True) -> None:
         """Record that an API request was made"""
         try:
@@ -200,21 +224,25 @@ class FileAPITracker:
         self.tracker_file = Path(tracker_file)
         self.usage_data = self._load_usage_data()
 
+        # Counters are written back lazily; see _flush_if_due()
+        self._dirty = False
+        self._last_flush = 0.0
+        atexit.register(self._flush)
+
         # Daily limits (adjust based on your RapidAPI plan)
         self.daily_limit = int(os.getenv('RAPIDAPI_DAILY_LIMIT', 100))
         self.hourly_limit = int(os.getenv('RAPIDAPI_HOURLY_LIMIT', 20))
 
         # Rate limiting
         self.min_request_interval = 2  # Minimum seconds between requests
-        self.last_request_time = 0
+        self.last_request_time = float('-inf')  # time.monotonic() of the last request
 
     def _load_usage_data(self) -> Dict[str, Any]:
         """Load usage data from file"""
         if self.tracker_file.exists():
             try:
-                with open(self.tracker_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
+                return _json_loads(self.tracker_file.read_bytes())
+            except (OSError, json.JSONDecodeError) as e:
                 logger.error(f"Failed to load usage data: {e}")
 
         return {
@@ -227,13 +255,27 @@ class FileAPITracker:
         }
 
     def _save_usage_data(self) -> None:
-        """Save usage data to file"""
+        """Save usage data to file (atomically, so a crash can't leave it half-written)"""
+        tmp_file = self.tracker_file.with_suffix('.json.tmp')
         try:
-            with open(self.tracker_file, 'w') as f:
-                json.dump(self.usage_data, f, indent=2)
-        except Exception as e:
+            with open(tmp_file, 'wb') as f:
+                f.write(_json_dumps(self.usage_data))
+            os.replace(tmp_file, self.tracker_file)
+        except OSError as e:
             logger.error(f"Failed to save API usage data: {e}")
 
+    def _flush(self) -> None:
+        """Write counters to disk if they changed since the last write"""
+        if self._dirty:
+            self._save_usage_data()
+            self._dirty = False
+            self._last_flush = time.time()
+
+    def _flush_if_due(self) -> None:
+        """Write changed counters at most every USAGE_FLUSH_INTERVAL seconds"""
+        if time.time() - self._last_flush > USAGE_FLUSH_INTERVAL:
+            self._flush()
+
     def _reset_counters_if_needed(self) -> None:
         """Reset daily/hourly counters if time period has passed"""
         now = datetime.now()
@@ -245,14 +287,17 @@ class FileAPITracker:
             logger.info(f"Resetting daily API counter. Previous: {self.usage_data['daily_count']}")
             self.usage_data['daily_count'] = 0
             self.usage_data['last_reset_day'] = current_day
+            self._dirty = True
 
         # Reset hourly counter
         if self.usage_data['last_reset_hour'] != current_hour:
             logger.info(f"Resetting hourly API counter. Previous: {self.usage_data['hourly_count']}")
             self.usage_data['hourly_count'] = 0
             self.usage_data['last_reset_hour'] = current_hour
+            self._dirty = True
 
-        self._save_usage_data()
+        # Only a rollover changes anything here; write it straight away
+        self._flush()
 
     def can_make_request(self) -> Tuple[bool, str]:
         """Check if we can make an API request without exceeding limits"""
@@ -268,16 +313,13 @@ class FileAPITracker:
             logger.warning(f"Hourly API limit reached: {self.usage_data['hourly_count']}/{self.hourly_limit}")
             return False, "Hourly API limit reached. Please try again in the next hour."
 
-        # Check rate limiting (minimum interval between requests)
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            wait_time = self.min_request_interval - time_since_last
-            logger.info(f"Rate limiting: waiting {wait_time:.1f}s")
-            time.sleep(wait_time)
-
         return True, "OK"
 
+    def retry_after(self) -> float:
+        """Seconds to wait before the next request (the caller decides whether to sleep)"""
+        time_since_last = time.monotonic() - self.last_request_time
+        return max(0.0, self.min_request_interval - time_since_last)
+
     def record_request(self, success: bool = True) -> None:
         """Record that an API request was made"""
         self._reset_counters_if_needed()
@@ -289,8 +331,9 @@ class FileAPITracker:
         if not success:
             self.usage_data['failed_requests'] += 1
 
-        self.last_request_time = time.time()
-        self._save_usage_data()
+        self.last_request_time = time.monotonic()
+        self._dirty = True
+        self._flush_if_due()
 
         logger.info(
             f"API request recorded. "
@@ -333,13 +376,7 @@ def create_api_tracker():
     if REDIS_AVAILABLE and redis_url:
         try:
             # Try to connect to Redis
-            redis_client = redis.from_url(
-                redis_url,
-                decode_responses=False,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True
-            )
+            redis_client = get_redis_client(redis_url)
 
             # Test connection
             redis_client.ping()
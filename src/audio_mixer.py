@@ -1,19 +1,23 @@
 """
 Audio Mixing Module
 Mixes original audio with Georgian voiceover, lowering original volume during speech
-Uses pydub for audio processing - with manual sample mixing to avoid overlay issues
+The voiceover track is assembled in NumPy and piped to ffmpeg, which lowers the
+original audio and sums both tracks (amerge + pan) while muxing the video
 """
 
-import os
-import math
-import array
+import subprocess
 from pathlib import Path
+import numpy as np
 from pydub import AudioSegment
 from src.logging_config import get_logger
-from src.ffmpeg_utils import get_ffmpeg_path, get_ffprobe_path
+from src.ffmpeg_utils import get_ffmpeg_path, get_ffprobe_path, FFMPEG_QUIET_ARGS
+from src.audio_utils import decode_to_pcm
 
 logger = get_logger(__name__)
 
+# Mixer working format: 44.1kHz 16-bit mono (same as the TTS providers' PCM)
+SAMPLE_RATE = 44100
+
 # Configure pydub to use our ffmpeg/ffprobe paths
 AudioSegment.converter = get_ffmpeg_path()
 AudioSegment.ffprobe = get_ffprobe_path()
@@ -31,84 +35,100 @@ class AudioMixer:
         self.original_volume = original_volume
         self.voiceover_volume = voiceover_volume
 
-    def mix_audio(self, original_audio_path, voiceover_segments, output_path, progress_callback=None):
-        """
-        Mix original audio with Georgian voiceover.
-
-        Process:
-        1. Build ONE voiceover track by concatenating segments with silence gaps
-        2. Mix the two tracks by adding their samples together (no pydub overlay)
+    def mix_and_mux(self, video_path, original_audio_path, voiceover_segments, output_path, progress_callback=None):
         """
+        Mix original audio with Georgian voiceover and mux it into the video
+        in a single ffmpeg invocation (no intermediate mixed WAV on disk).
 
-        # ============================================================
-        # STEP 1: Load and prepare original audio
-        # ============================================================
+        The voiceover track is built in memory and piped to ffmpeg as raw PCM;
+        ffmpeg lowers the original audio, sums both tracks and copies the video
+        stream without re-encoding.
 
+        Args:
+            video_path: Path to original video file
+            original_audio_path: Path to original audio track
+            voiceover_segments: Segments with 'start' and 'audio_pcm' or 'audio_path'
+            output_path: Path for the final MP4
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            Path to final video file
+        """
         if progress_callback:
-            progress_callback("Loading original audio...")
-
-        # Use from_file to auto-detect format (supports wav, m4a, mp3, webm, etc.)
-        original = AudioSegment.from_file(original_audio_path)
-        original = original.set_frame_rate(44100).set_channels(1)
-        duration_ms = len(original)
-
-        logger.info(f"Original audio: {duration_ms}ms")
+            progress_callback("Building voiceover track...")
 
-        # Lower the original audio volume
-        if self.original_volume > 0:
-            volume_db = 20 * math.log10(self.original_volume)
+        cmd = [
+            get_ffmpeg_path(),
+            *FFMPEG_QUIET_ARGS,  # -nostdin is safe: the PCM arrives via the pipe: protocol
+            '-i', str(video_path),
+            '-i', str(original_audio_path),
+        ]
+
+        # Lower the original audio volume (linear gain)
+        original_chain = f"[1:a]aformat=sample_rates=44100:channel_layouts=mono,volume={self.original_volume}"
+
+        if voiceover_segments:
+            # total_duration_ms=0: no end padding, apad below extends to the original length
+            voiceover_track = self._build_voiceover_track(voiceover_segments, 0, progress_callback)
+            voiceover_pcm = voiceover_track.raw_data
+            logger.info(f"Voiceover track: {len(voiceover_track)}ms")
+
+            cmd += ['-f', 's16le', '-ar', '44100', '-ac', '1', '-i', 'pipe:0']
+            # amerge + pan sums the samples without amix's normalization
+            filter_graph = (
+                f"{original_chain}[orig];"
+                "[2:a]apad[vo];"
+                "[orig][vo]amerge=inputs=2,pan=mono|c0=c0+c1[aout]"
+            )
         else:
-            volume_db = -60
-
-        original_lowered = original + volume_db
-        logger.info(f"Lowered original audio by {volume_db:.1f}dB")
-
-        if not voiceover_segments:
-            if progress_callback:
-                progress_callback("No voiceover segments, exporting original...")
-            original_lowered.export(output_path, format="wav")
-            return output_path
-
-        # ============================================================
-        # STEP 2: Build ONE voiceover track (no mixing, just placement)
-        # ============================================================
+            voiceover_pcm = None
+            filter_graph = f"{original_chain}[aout]"
+
+        cmd += [
+            '-filter_complex', filter_graph,
+            '-map', '0:v:0',  # Use video from first input
+            '-map', '[aout]', # Use the mixed audio
+            '-c:v', 'copy',   # Copy video stream (no re-encoding)
+            '-c:a', 'aac',    # Encode audio to AAC
+            '-b:a', '192k',   # Audio bitrate
+            '-shortest',      # Match shortest stream duration
+            '-y',             # Overwrite output file
+            str(output_path)
+        ]
 
         if progress_callback:
-            progress_callback("Building voiceover track...")
-
-        voiceover_track = self._build_voiceover_track(
-            voiceover_segments,
-            duration_ms,
-            progress_callback
+            progress_callback("Mixing audio and encoding final video...")
+
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if voiceover_pcm is not None else subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            bufsize=1 << 20
         )
+        # communicate() feeds stdin while draining stderr, so neither pipe can deadlock
+        _, stderr = process.communicate(input=voiceover_pcm)
 
-        logger.info(f"Voiceover track: {len(voiceover_track)}ms")
-
-        # ============================================================
-        # STEP 3: Mix by adding samples directly (NOT using pydub overlay)
-        # ============================================================
-
-        if progress_callback:
-            progress_callback("Mixing audio tracks...")
-
-        final_mix = self._mix_two_tracks(original_lowered, voiceover_track)
+        if process.returncode != 0:
+            raise Exception(f"Failed to mix and mux audio: {stderr.decode('utf-8', errors='replace')}")
 
-        if progress_callback:
-            progress_callback("Exporting final mix...")
-
-        final_mix.export(output_path, format="wav")
-
-        logger.info(f"Audio mixing complete: {output_path}")
+        logger.info(f"Mix and mux complete: {output_path}")
 
         if progress_callback:
-            progress_callback("Audio mixing complete!")
+            progress_callback("Audio mixing and video encoding complete!")
 
-        return output_path
+        return str(output_path)
 
     def _build_voiceover_track(self, voiceover_segments, total_duration_ms, progress_callback=None):
         """
         Build a single voiceover track by placing segments at their timestamps.
-        NO overlay, NO mixing - just concatenation.
+        NO overlay, NO mixing - a clip that would overlap the previous one
+        starts right after it instead.
+
+        Segments carry either 'audio_pcm' (44.1kHz 16-bit mono, used as-is)
+        or 'audio_path' (an audio file, decoded and converted). Clips are
+        copied into one preallocated sample buffer and the voiceover volume
+        is applied to the whole track in a single vectorized pass.
         """
 
         logger.info(f"Building voiceover track from {len(voiceover_segments)} segments")
@@ -116,114 +136,44 @@ class AudioMixer:
         # Sort by start time
         sorted_segments = sorted(voiceover_segments, key=lambda s: s['start'])
 
-        # Build the track by concatenation
-        pieces = []
-        current_time_ms = 0
+        # First pass: decode clips (in-memory PCM needs no decoding) and
+        # work out where each one lands, in samples
+        placements = []
+        current_sample = 0
 
         for i, segment in enumerate(sorted_segments):
-            start_ms = int(segment['start'] * 1000)
-            segment_path = segment['audio_path']
-
-            # Load the voiceover clip
-            clip = AudioSegment.from_wav(segment_path)
-            clip = clip.set_frame_rate(44100).set_channels(1)
-
-            # Apply volume adjustment if needed
-            if self.voiceover_volume != 1.0 and self.voiceover_volume > 0:
-                vo_volume_db = 20 * math.log10(self.voiceover_volume)
-                clip = clip + vo_volume_db
-
-            # Add silence gap before this segment
-            if start_ms > current_time_ms:
-                gap_duration = start_ms - current_time_ms
-                silence = AudioSegment.silent(duration=gap_duration, frame_rate=44100)
-                silence = silence.set_channels(1)
-                pieces.append(silence)
-                current_time_ms = start_ms
-
-            # Add the voiceover clip
-            pieces.append(clip)
-            current_time_ms += len(clip)
+            if segment.get('audio_pcm') is not None:
+                clip = np.frombuffer(segment['audio_pcm'], dtype='<i2')
+            else:
+                clip = np.frombuffer(decode_to_pcm(segment['audio_path'], SAMPLE_RATE), dtype='<i2')
+
+            start_sample = max(int(segment['start'] * SAMPLE_RATE), current_sample)
+            placements.append((start_sample, clip))
+            current_sample = start_sample + len(clip)
 
             if progress_callback and (i + 1) % 5 == 0:
                 progress_callback(f"Placed {i + 1}/{len(sorted_segments)} segments")
 
-        # Add silence padding at the end
-        if current_time_ms < total_duration_ms:
-            end_padding = total_duration_ms - current_time_ms
-            silence = AudioSegment.silent(duration=end_padding, frame_rate=44100)
-            silence = silence.set_channels(1)
-            pieces.append(silence)
-
-        # Concatenate all pieces by joining raw bytes
-        # This is the most direct way - no pydub operations that could affect volume
-        logger.info(f"Concatenating {len(pieces)} pieces")
-
-        # Collect all raw bytes efficiently (avoiding O(n²) concatenation)
-        # Using list and join is O(n) instead of O(n²)
-        all_bytes_list = []
-        for piece in pieces:
-            all_bytes_list.append(piece.raw_data)
-        all_bytes = b''.join(all_bytes_list)
-
-        # Create single AudioSegment from concatenated bytes
+        # Silence padding at the end
+        total_samples = max(current_sample, int(total_duration_ms * SAMPLE_RATE / 1000))
+
+        # Second pass: copy clips into one buffer (gaps stay zero = silence)
+        track = np.zeros(total_samples, dtype='<i2')
+        for start_sample, clip in placements:
+            track[start_sample:start_sample + len(clip)] = clip
+
+        # Apply volume adjustment if needed (saturating, like pydub's gain)
+        if self.voiceover_volume != 1.0 and self.voiceover_volume > 0:
+            scaled = track.astype(np.float32) * self.voiceover_volume
+            track = np.clip(np.rint(scaled), -32768, 32767).astype('<i2')
+
         voiceover_track = AudioSegment(
-            data=all_bytes,
+            data=track.tobytes(),
             sample_width=2,  # 16-bit
-            frame_rate=44100,
+            frame_rate=SAMPLE_RATE,
             channels=1
         )
 
         logger.info(f"Voiceover track complete: {len(voiceover_track)}ms")
 
         return voiceover_track
-
-    def _mix_two_tracks(self, track1, track2):
-        """
-        Mix two audio tracks by directly adding their samples.
-        This avoids any potential issues with pydub's overlay() method.
-
-        Both tracks must have the same sample rate and channels.
-        """
-
-        # Ensure same length
-        len1 = len(track1)
-        len2 = len(track2)
-
-        if len1 > len2:
-            # Pad track2
-            padding = AudioSegment.silent(duration=len1 - len2, frame_rate=44100)
-            padding = padding.set_channels(1)
-            track2 = track2 + padding
-        elif len2 > len1:
-            # Pad track1
-            padding = AudioSegment.silent(duration=len2 - len1, frame_rate=44100)
-            padding = padding.set_channels(1)
-            track1 = track1 + padding
-
-        # Get raw sample data
-        samples1 = array.array('h', track1.raw_data)
-        samples2 = array.array('h', track2.raw_data)
-
-        # Add samples together with clipping
-        mixed_samples = array.array('h')
-        for s1, s2 in zip(samples1, samples2):
-            mixed = s1 + s2
-            # Clip to 16-bit range
-            if mixed > 32767:
-                mixed = 32767
-            elif mixed < -32768:
-                mixed = -32768
-            mixed_samples.append(mixed)
-
-        # Create new AudioSegment from mixed samples
-        mixed_audio = AudioSegment(
-            data=mixed_samples.tobytes(),
-            sample_width=2,  # 16-bit = 2 bytes
-            frame_rate=44100,
-            channels=1
-        )
-
-        logger.info(f"Mixed two tracks: {len(mixed_audio)}ms")
-
-        return mixed_audio
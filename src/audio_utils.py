@@ -0,0 +1,287 @@
+"""
+Audio Utilities
+In-process decoding helpers and voice activity detection that shrinks
+audio before transcription
+"""
+
+import io
+import os
+import subprocess
+import wave
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple, Union
+from pydub import AudioSegment
+from src.logging_config import get_logger
+from src.ffmpeg_utils import get_ffmpeg_path, get_ffprobe_path, FFMPEG_QUIET_ARGS
+
+logger = get_logger(__name__)
+
+# Try to import PyAV - optional dependency (in-process libav, no ffmpeg fork per file)
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+    logger.warning("PyAV not available - falling back to ffmpeg subprocesses for audio decoding")
+
+# Try to import webrtcvad - optional dependency
+try:
+    import webrtcvad
+    VAD_AVAILABLE = True
+except ImportError:
+    VAD_AVAILABLE = False
+    logger.warning("webrtcvad not available - silence trimming before transcription disabled")
+
+AudioSource = Union[str, os.PathLike, bytes]
+
+
+def decode_to_pcm(source: AudioSource, sample_rate: int = 44100) -> bytes:
+    """
+    Decode any audio (file path or encoded bytes) to raw 16-bit mono PCM
+
+    Uses PyAV in-process when available, otherwise a single ffmpeg call.
+
+    Args:
+        source: Path to an audio file, or encoded audio bytes (MP3, WAV, ...)
+        sample_rate: Output sample rate
+
+    Returns:
+        Little-endian s16 mono samples
+    """
+    if AV_AVAILABLE:
+        container_input = io.BytesIO(source) if isinstance(source, bytes) else str(source)
+        resampler = av.AudioResampler(format='s16', layout='mono', rate=sample_rate)
+        chunks = []
+
+        def collect(frames):
+            for frame in frames:
+                # Plane buffers may carry alignment padding past the samples
+                chunks.append(bytes(frame.planes[0])[:frame.samples * 2])
+
+        with av.open(container_input) as container:
+            for frame in container.decode(audio=0):
+                collect(resampler.resample(frame))
+            collect(resampler.resample(None))  # Flush buffered samples
+
+        return b''.join(chunks)
+
+    from_pipe = isinstance(source, bytes)
+    cmd = [
+        get_ffmpeg_path(),
+        *FFMPEG_QUIET_ARGS,
+        '-i', 'pipe:0' if from_pipe else str(source),
+        '-f', 's16le',           # Raw 16-bit PCM
+        '-ar', str(sample_rate),
+        '-ac', '1',              # Mono
+        'pipe:1'
+    ]
+    result = subprocess.run(cmd, input=source if from_pipe else None, capture_output=True)
+    if result.returncode != 0:
+        stderr = result.stderr.decode('utf-8', errors='replace')
+        raise Exception(f"Failed to decode audio: {stderr}")
+
+    return result.stdout
+
+
+def decode_to_wav(source: AudioSource, wav_path, sample_rate: int = 44100):
+    """
+    Decode any audio (file path or encoded bytes) to 16-bit mono WAV
+
+    Args:
+        source: Path to an audio file, or encoded audio bytes (e.g. MP3)
+        wav_path: Output WAV path
+        sample_rate: Output sample rate
+
+    Returns:
+        wav_path
+    """
+    pcm = decode_to_pcm(source, sample_rate)
+
+    with wave.open(str(wav_path), 'wb') as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(sample_rate)
+        out.writeframes(pcm)
+
+    return wav_path
+
+
+def wav_to_pcm(data: bytes, sample_rate: int = 44100) -> bytes:
+    """
+    Strip the header from WAV bytes already in 16-bit mono at sample_rate
+
+    Anything in another format is decoded and resampled instead.
+    """
+    try:
+        with wave.open(io.BytesIO(data), 'rb') as wav:
+            if (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) == (1, 2, sample_rate):
+                return wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        pass
+
+    return decode_to_pcm(data, sample_rate)
+
+
+def pcm_duration(pcm: bytes, sample_rate: int = 44100) -> float:
+    """Duration in seconds of raw 16-bit mono PCM"""
+    return len(pcm) / (2.0 * sample_rate)
+
+
+def get_audio_duration(audio_path) -> float:
+    """
+    Get audio duration in seconds
+
+    Reads the WAV header directly; only non-WAV files go through ffprobe.
+    """
+    try:
+        with wave.open(str(audio_path), 'rb') as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except (wave.Error, EOFError):
+        pass
+
+    cmd = [
+        get_ffprobe_path(),
+        '-v', 'quiet',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        str(audio_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode == 0 and result.stdout.strip():
+        return float(result.stdout.strip())
+    return 0.0
+
+
+VAD_SAMPLE_RATE = 16000   # webrtcvad accepts 8/16/32/48 kHz; Whisper works at 16 kHz
+VAD_FRAME_MS = 20         # webrtcvad accepts 10/20/30 ms frames
+KEEP_GAP_MS = 500         # Pauses shorter than this are kept for context
+PAD_MS = 150              # Padding around speech so word edges aren't clipped
+SPACER_MS = 500           # Silence inserted between kept regions
+MIN_SAVINGS = 0.05        # Don't bother if less than 5% would be removed
+
+BYTES_PER_MS = VAD_SAMPLE_RATE * 2 // 1000  # 16-bit mono
+
+# (compact_start, original_start, duration) per kept region, in seconds
+Offsets = List[Tuple[float, float, float]]
+
+
+def _voiced_regions(raw: bytes, aggressiveness: int) -> List[List[int]]:
+    """Find speech regions (in ms) in 16 kHz mono 16-bit PCM"""
+    vad = webrtcvad.Vad(aggressiveness)
+    frame_bytes = VAD_FRAME_MS * BYTES_PER_MS
+    regions = []
+
+    for i, offset in enumerate(range(0, len(raw) - frame_bytes + 1, frame_bytes)):
+        if not vad.is_speech(raw[offset:offset + frame_bytes], VAD_SAMPLE_RATE):
+            continue
+
+        start = i * VAD_FRAME_MS
+        if regions and start - regions[-1][1] < KEEP_GAP_MS:
+            regions[-1][1] = start + VAD_FRAME_MS
+        else:
+            regions.append([start, start + VAD_FRAME_MS])
+
+    return regions
+
+
+def remove_silence(path: str, aggressiveness: int = 2) -> Tuple[str, Optional[Offsets]]:
+    """
+    Write a copy of the audio with long silences removed
+
+    Speech regions are concatenated with short constant silence spacers
+    between them. Use restore_timestamps() with the returned offsets to map
+    transcription timestamps back onto the original timeline.
+
+    Args:
+        path: Path to the source audio file
+        aggressiveness: webrtcvad aggressiveness (0-3)
+
+    Returns:
+        (compact_path, offsets). If VAD is unavailable, finds no speech or
+        would not save much, returns (path, None) unchanged.
+    """
+    if not VAD_AVAILABLE:
+        return path, None
+
+    try:
+        audio = (
+            AudioSegment.from_file(path)
+            .set_channels(1)
+            .set_frame_rate(VAD_SAMPLE_RATE)
+            .set_sample_width(2)
+        )
+        total_ms = len(audio)
+        raw = audio.raw_data
+
+        regions = _voiced_regions(raw, aggressiveness)
+        if not regions:
+            logger.info("No speech detected by VAD, transcribing original audio")
+            return path, None
+
+        for region in regions:
+            region[0] = max(region[0] - PAD_MS, 0)
+            region[1] = min(region[1] + PAD_MS, total_ms)
+
+        kept_ms = sum(end - start for start, end in regions) + SPACER_MS * (len(regions) - 1)
+        if kept_ms > total_ms * (1 - MIN_SAVINGS):
+            return path, None
+
+        spacer = b'\x00' * (SPACER_MS * BYTES_PER_MS)
+        chunks = []
+        offsets = []
+        compact_ms = 0
+
+        for start, end in regions:
+            if chunks:
+                chunks.append(spacer)
+                compact_ms += SPACER_MS
+            offsets.append((compact_ms / 1000, start / 1000, (end - start) / 1000))
+            chunks.append(raw[start * BYTES_PER_MS:end * BYTES_PER_MS])
+            compact_ms += end - start
+
+        compact_path = f"{os.path.splitext(path)[0]}_voiced.wav"
+        AudioSegment(
+            data=b''.join(chunks),
+            sample_width=2,
+            frame_rate=VAD_SAMPLE_RATE,
+            channels=1
+        ).export(compact_path, format="wav")
+
+        logger.info(
+            f"Trimmed silence: {total_ms / 1000:.1f}s -> {compact_ms / 1000:.1f}s "
+            f"({len(regions)} speech regions)"
+        )
+        return compact_path, offsets
+
+    except Exception as e:
+        logger.warning(f"Silence trimming failed, transcribing original audio: {e}")
+        return path, None
+
+
+def restore_timestamps(segments: List[Dict], offsets: Optional[Offsets]) -> List[Dict]:
+    """
+    Shift segment 'start'/'end' from the compacted timeline back to the original
+
+    Args:
+        segments: Segments with 'start' and 'end' in seconds (modified in place)
+        offsets: Offsets returned by remove_silence(), or None
+
+    Returns:
+        The same segments list
+    """
+    if not offsets:
+        return segments
+
+    compact_starts = [compact_start for compact_start, _, _ in offsets]
+
+    def to_original(t):
+        i = max(bisect_right(compact_starts, t) - 1, 0)
+        compact_start, original_start, duration = offsets[i]
+        # Times inside a spacer clamp to the end of the preceding region
+        return original_start + min(max(t - compact_start, 0.0), duration)
+
+    for segment in segments:
+        segment['start'] = to_original(segment['start'])
+        segment['end'] = to_original(segment['end'])
+
+    return segments
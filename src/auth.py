@@ -28,8 +28,8 @@ def login_required(f):
         if 'user_id' not in session:
             return jsonify({'error': 'Login required'}), 401
 
-        # Load user into g
-        user = db.get_user_by_id(session['user_id'])
+        # Load user into g (reusing the before_request lookup when present)
+        user = get_current_user()
         if not user or not user.is_active:
             session.clear()
             return jsonify({'error': 'Invalid session'}), 401
@@ -46,7 +46,7 @@ def admin_required(f):
         if 'user_id' not in session:
             return jsonify({'error': 'Login required'}), 401
 
-        user = db.get_user_by_id(session['user_id'])
+        user = get_current_user()
         if not user or not user.is_active:
             session.clear()
             return jsonify({'error': 'Invalid session'}), 401
@@ -63,6 +63,10 @@ def get_current_user():
     """Get currently logged in user or None"""
     if 'user_id' not in session:
         return None
+    # Reuse the user already loaded for this request
+    user = g.get('user')
+    if user is not None and user.id == session['user_id']:
+        return user
     return db.get_user_by_id(session['user_id'])
 
 
@@ -5,22 +5,37 @@ Provides decorators and utilities for caching expensive database queries and API
 
 import os
 import json
+import time
 import hashlib
 import functools
-from typing import Any, Callable, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
 from src.logging_config import get_logger
+from src.redis_config import get_redis_client
 
 logger = get_logger(__name__)
 
 # Try to import Redis - optional dependency
 try:
     import redis
-    from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
+    from redis.exceptions import RedisError, WatchError, ConnectionError as RedisConnectionError
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("Redis not available - caching disabled")
 
+# Try to import orjson - optional dependency (faster cache (de)serialization)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Lifetime of a key's invalidation counter (see RedisCache.version); only has
+# to outlive a single load, refreshed on every invalidate()
+CACHE_VERSION_TTL = 3600
+
 
 class RedisCache:
     """Redis-based caching with automatic serialization/deserialization"""
@@ -54,7 +69,7 @@ class RedisCache:
         try:
             data = self.redis.get(key)
             if data:
-                return json.loads(data)
+                return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
             return None
         except RedisError as e:
             logger.error(f"Redis cache get error: {e}")
@@ -73,7 +88,10 @@ class RedisCache:
             True if successful, False otherwise
         """
         try:
-            data = json.dumps(value, default=str)
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(value, default=str)
+            else:
+                data = json.dumps(value, default=str)
             self.redis.setex(key, ttl, data)
             return True
         except (RedisError, TypeError, ValueError) as e:
@@ -89,6 +107,71 @@ class RedisCache:
             logger.error(f"Redis cache delete error: {e}")
             return False
 
+    def version(self, key: str) -> Optional[bytes]:
+        """
+        Read a key's invalidation counter before loading its value.
+
+        Pass the result to set_if_version() once the value is loaded; the set
+        is skipped if invalidate() ran in between, so a slow reader can't put
+        back a value that a concurrent write already replaced.
+
+        Returns:
+            Opaque version token, or None if Redis is unreachable
+        """
+        try:
+            return self.redis.get(f"{key}:version") or b'0'
+        except RedisError as e:
+            logger.error(f"Redis cache version error: {e}")
+            return None
+
+    def set_if_version(self, key: str, version: Optional[bytes], value: Any, ttl: int = 300) -> bool:
+        """
+        Set value with TTL, unless the key was invalidated since version() was read.
+
+        Args:
+            key: Cache key
+            version: Token from version()
+            value: Value to cache (must be JSON serializable)
+            ttl: Time to live in seconds (default: 5 minutes)
+
+        Returns:
+            True if the value was stored, False otherwise
+        """
+        if version is None:
+            return False
+
+        version_key = f"{key}:version"
+        try:
+            data = orjson.dumps(value, default=str) if ORJSON_AVAILABLE else json.dumps(value, default=str)
+            with self.redis.pipeline() as pipe:
+                # WATCH makes EXEC fail if invalidate() bumps the counter after this check
+                pipe.watch(version_key)
+                if (pipe.get(version_key) or b'0') != version:
+                    return False
+                pipe.multi()
+                pipe.setex(key, ttl, data)
+                pipe.execute()
+            return True
+        except WatchError:
+            return False
+        except (RedisError, TypeError, ValueError) as e:
+            logger.error(f"Redis cache set error: {e}")
+            return False
+
+    def invalidate(self, key: str) -> bool:
+        """Delete key and bump its version, so in-flight loads can't re-cache a stale value"""
+        version_key = f"{key}:version"
+        try:
+            pipe = self.redis.pipeline()
+            pipe.incr(version_key)
+            pipe.expire(version_key, CACHE_VERSION_TTL)
+            pipe.delete(key)
+            pipe.execute()
+            return True
+        except RedisError as e:
+            logger.error(f"Redis cache invalidate error: {e}")
+            return False
+
     def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching pattern.
@@ -130,6 +213,15 @@ class NoOpCache:
     def delete(self, key: str) -> bool:
         return False
 
+    def version(self, key: str) -> None:
+        return None
+
+    def set_if_version(self, key: str, version: Optional[bytes], value: Any, ttl: int = 300) -> bool:
+        return False
+
+    def invalidate(self, key: str) -> bool:
+        return False
+
     def delete_pattern(self, pattern: str) -> int:
         return 0
 
@@ -146,13 +238,7 @@ def create_cache() -> RedisCache:
 
     if REDIS_AVAILABLE and redis_url:
         try:
-            redis_client = redis.from_url(
-                redis_url,
-                decode_responses=False,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True
-            )
+            redis_client = get_redis_client(redis_url)
             redis_client.ping()
 
             logger.info("OK: Redis cache enabled")
@@ -232,3 +318,106 @@ def invalidate_cache(namespace: str) -> int:
         Number of keys deleted
     """
     return cache.clear_namespace(namespace)
+
+
+class SingleFlightCache:
+    """
+    Process-local TTL cache that coalesces concurrent loads of the same key.
+
+    While one caller loads a key, other callers for that key wait for its
+    result instead of loading it again; the result is then reused for `ttl`
+    seconds. Meant for very short TTLs on hot polling endpoints.
+    """
+
+    def __init__(self, ttl: float = 0.5, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._values: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, calling loader() at most once per TTL"""
+        while True:
+            with self._lock:
+                entry = self._values.get(key)
+                if entry and time.monotonic() - entry[0] < self.ttl:
+                    return entry[1]
+
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = self._inflight[key] = threading.Event()
+
+            if not leader:
+                # Another caller is loading; re-check once it's done
+                # (if it failed, one of the waiters becomes the new leader)
+                event.wait()
+                continue
+
+            try:
+                value = loader()
+                with self._lock:
+                    if len(self._values) >= self.maxsize:
+                        self._evict_expired()
+                    self._values[key] = (time.monotonic(), value)
+                return value
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    def invalidate(self, key: str) -> None:
+        """Drop a cached value"""
+        with self._lock:
+            self._values.pop(key, None)
+
+    def _evict_expired(self) -> None:
+        """Drop expired entries (caller holds the lock); clear all if still full"""
+        now = time.monotonic()
+        self._values = {
+            k: entry for k, entry in self._values.items()
+            if now - entry[0] < self.ttl
+        }
+        if len(self._values) >= self.maxsize:
+            self._values.clear()
+
+
+class LocalTTLCache:
+    """
+    Thread-safe, process-local LRU cache whose entries expire after `ttl` seconds.
+
+    Unlike SingleFlightCache the caller decides what gets stored, so it can
+    cache only values that are safe to reuse (e.g. finished records).
+    """
+
+    def __init__(self, ttl: float = 60, maxsize: int = 4096):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._values: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._values[key]
+                return None
+            self._values.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a cached value"""
+        with self._lock:
+            self._values.pop(key, None)
@@ -0,0 +1,93 @@
+"""
+Pipeline Stage Checkpoints
+Saves each finished stage's result next to the job's temp files, so a retried
+task resumes after the last completed stage instead of starting over
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from src.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _json_default(value):
+    """Serialize numpy scalars as numbers; anything else as its string form"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class StageCheckpoints:
+    """
+    JSON checkpoints for one video's pipeline run.
+
+    Each stage is stored as temp/<video_id>_<stage>.ckpt.json together with a
+    key derived from the job inputs; a checkpoint written for different inputs
+    (or whose files have since been removed) is ignored.
+    """
+
+    SUFFIX = '.ckpt.json'
+
+    def __init__(self, temp_dir, video_id: str, *inputs: Any):
+        self.temp_dir = Path(temp_dir)
+        self.video_id = video_id
+        self.key = hashlib.sha1(
+            json.dumps([video_id, *inputs], default=str).encode('utf-8')
+        ).hexdigest()
+
+    def _path(self, stage: str) -> Path:
+        return self.temp_dir / f"{self.video_id}_{stage}{self.SUFFIX}"
+
+    def load(self, stage: str, file_fields: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """
+        Load a stage result saved by an earlier attempt.
+
+        Args:
+            stage: Stage name
+            file_fields: Keys of the result holding paths that must still exist
+
+        Returns:
+            The saved result, or None if missing, stale or unreadable
+        """
+        path = self._path(stage)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path.name}: {e}")
+            return None
+
+        if saved.get('key') != self.key:
+            return None
+
+        data = saved.get('data') or {}
+        if not all(data.get(field) and os.path.exists(data[field]) for field in file_fields):
+            return None
+
+        logger.info(f"Resuming {self.video_id} from '{stage}' checkpoint")
+        return data
+
+    def save(self, stage: str, data: Dict[str, Any]) -> None:
+        """Save a stage result (written atomically; failures are only logged)"""
+        path = self._path(stage)
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': self.key, 'data': data}, f, ensure_ascii=False, default=_json_default)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not save '{stage}' checkpoint for {self.video_id}: {e}")
+
+    def clear(self) -> None:
+        """Remove all checkpoints for this video"""
+        for path in self.temp_dir.glob(f"{self.video_id}_*{self.SUFFIX}"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -27,8 +27,14 @@ class Config:
     MAX_VIDEO_LENGTH = int(os.getenv('MAX_VIDEO_LENGTH', 1800))  # 30 minutes
     MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE', 500 * 1024 * 1024))  # 500MB
     MAX_CONCURRENT_JOBS = int(os.getenv('MAX_CONCURRENT_JOBS', 3))
+    LOCAL_JOB_EXECUTOR = os.getenv('LOCAL_JOB_EXECUTOR', 'process')  # Without Celery: 'process' or 'thread'
+    REQUIRE_CELERY = os.getenv('REQUIRE_CELERY', 'false').lower() == 'true'  # Refuse jobs instead of running them in-app
     MAX_MEMORY_PER_JOB = int(os.getenv('MAX_MEMORY_PER_JOB', 2048))  # 2GB in MB
 
+    # Push status over Server-Sent Events (/events/<id>) instead of polling /status.
+    # Each open stream holds a server thread, so enable with gevent workers or spare threads
+    STATUS_EVENTS_ENABLED = os.getenv('STATUS_EVENTS_ENABLED', 'false').lower() == 'true'
+
     # Audio Settings
     ORIGINAL_AUDIO_VOLUME = float(os.getenv('ORIGINAL_AUDIO_VOLUME', 0.05))
     VOICEOVER_VOLUME = float(os.getenv('VOICEOVER_VOLUME', 1.0))
@@ -44,6 +50,10 @@ class Config:
     OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'output')
     TEMP_DIR = os.getenv('TEMP_DIR', 'temp')
 
+    # Local downloads - let a front proxy stream files instead of a Flask worker
+    DOWNLOAD_ACCEL_PREFIX = os.getenv('DOWNLOAD_ACCEL_PREFIX', '')  # nginx internal location, e.g. /internal-outputs/
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', 'false').lower() == 'true'  # Apache mod_xsendfile
+
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL')
     if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
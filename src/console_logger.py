@@ -4,10 +4,26 @@ Shows processing logs in the web UI console
 """
 
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import threading
 from collections import deque
 
+# Level -> display prefix used by format_entry()
+LEVEL_PREFIXES = {
+    'ERROR': '[ERROR]',
+    'WARNING': '[WARN]',
+    'SUCCESS': '[OK]',
+    'DEBUG': '[DEBUG]',
+}
+
+
+def format_entry(entry: Dict) -> str:
+    """Format a single log entry as a console line"""
+    timestamp = entry['timestamp'].split('T')[1].split('.')[0]  # Just time
+    prefix = LEVEL_PREFIXES.get(entry['level'], '[INFO]')
+    return f"{prefix} [{timestamp}] {entry['message']}"
+
+
 class ConsoleLogger:
     """Singleton console logger for web UI display"""
 
@@ -26,7 +42,11 @@ class ConsoleLogger:
         """Initialize the console logger"""
         # Keep last 500 log entries
         self.logs = deque(maxlen=500)
-        self.session_logs = {}  # Logs per session/job
+        # Logs per session/job as (entry, formatted line) pairs; entries carry
+        # a per-session monotonic 'seq' so pollers can ask for new lines only
+        self.session_logs = {}
+        self._session_seq = {}
+        self._write_lock = threading.Lock()
 
     def log(self, message: str, level: str = "INFO", session_id: Optional[str] = None):
         """Add a log entry"""
@@ -41,45 +61,64 @@ class ConsoleLogger:
 
         # Add to session-specific logs if session_id provided
         if session_id:
-            if session_id not in self.session_logs:
-                self.session_logs[session_id] = deque(maxlen=200)
-            self.session_logs[session_id].append(entry)
+            with self._write_lock:
+                seq = self._session_seq.get(session_id, 0) + 1
+                self._session_seq[session_id] = seq
+                session_entry = {**entry, 'seq': seq}
+                if session_id not in self.session_logs:
+                    self.session_logs[session_id] = deque(maxlen=200)
+                self.session_logs[session_id].append((session_entry, format_entry(session_entry)))
 
     def get_logs(self, session_id: Optional[str] = None, last_n: int = 100) -> List[Dict]:
         """Get recent logs"""
         if session_id and session_id in self.session_logs:
-            logs = list(self.session_logs[session_id])
+            logs = [entry for entry, _ in list(self.session_logs[session_id])]
         else:
             logs = list(self.logs)
 
         # Return last N logs
         return logs[-last_n:]
 
+    def get_logs_since(self, session_id: str, cursor: int = 0) -> Tuple[List[Dict], List[str], int, bool]:
+        """
+        Get session logs newer than a cursor
+
+        Args:
+            session_id: Session/job ID
+            cursor: Last 'seq' the caller has seen (0 for everything buffered)
+
+        Returns:
+            Tuple of (new entries, their formatted lines, next cursor, reset).
+            reset is True when the cursor is ahead of this logger (restart or
+            cleared session) and the whole buffer is returned instead.
+        """
+        # Snapshot under the writers' lock so the buffer and seq agree
+        with self._write_lock:
+            buffered = list(self.session_logs.get(session_id, ()))
+            last_seq = self._session_seq.get(session_id, 0)
+
+        reset = cursor > last_seq
+        if reset:
+            cursor = 0
+
+        # Entries are in seq order; walk back from the newest
+        start = len(buffered)
+        while start > 0 and buffered[start - 1][0]['seq'] > cursor:
+            start -= 1
+        new = buffered[start:]
+
+        next_cursor = new[-1][0]['seq'] if new else cursor
+        return [entry for entry, _ in new], [line for _, line in new], next_cursor, reset
+
     def clear_session(self, session_id: str):
         """Clear logs for a specific session"""
-        if session_id in self.session_logs:
-            del self.session_logs[session_id]
+        with self._write_lock:
+            self.session_logs.pop(session_id, None)
+            self._session_seq.pop(session_id, None)
 
     def format_for_display(self, logs: List[Dict]) -> str:
         """Format logs for console display"""
-        formatted = []
-        for log in logs:
-            timestamp = log['timestamp'].split('T')[1].split('.')[0]  # Just time
-            level = log['level'].ljust(5)
-
-            # Color coding for different levels
-            if log['level'] == 'ERROR':
-                formatted.append(f"[ERROR] [{timestamp}] {log['message']}")
-            elif log['level'] == 'WARNING':
-                formatted.append(f"[WARN] [{timestamp}] {log['message']}")
-            elif log['level'] == 'SUCCESS':
-                formatted.append(f"[OK] [{timestamp}] {log['message']}")
-            elif log['level'] == 'DEBUG':
-                formatted.append(f"[DEBUG] [{timestamp}] {log['message']}")
-            else:
-                formatted.append(f"[INFO] [{timestamp}] {log['message']}")
-
-        return '\n'.join(formatted)
+        return '\n'.join(format_entry(log) for log in logs)
 
 # Global console logger instance
 console = ConsoleLogger()
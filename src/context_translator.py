@@ -26,8 +26,8 @@ class ContextAwareTranslator:
 
         if gemini_key:
             # Use Gemini (FREE!)
-            from google import genai
-            self.client = genai.Client(api_key=gemini_key)
+            from src.gemini_translator import get_genai_client
+            self.client = get_genai_client(gemini_key)
             self.model_name = 'models/gemini-2.5-flash'
             self.backend = 'gemini'
             logger.info("Using Gemini API for context-aware translation (FREE)")
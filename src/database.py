@@ -4,18 +4,37 @@ Tracks processed videos, users, and usage
 """
 
 import os
+from contextlib import contextmanager
 from datetime import datetime
 from sqlalchemy import create_engine, Column, String, DateTime, Integer, Boolean, Float, ForeignKey, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, scoped_session, relationship, joinedload
+from sqlalchemy.orm import sessionmaker, scoped_session, relationship, joinedload, defer
+from sqlalchemy.orm.attributes import set_committed_value
 from werkzeug.security import generate_password_hash, check_password_hash
 from src.logging_config import get_logger
-from src.cache import cached, invalidate_cache
+from src.cache import cache, cached, invalidate_cache, LocalTTLCache
 
 logger = get_logger(__name__)
 
 Base = declarative_base()
 
+# Completed videos are effectively immutable; serve repeat lookups
+# (/watch, /status, /debug) from memory for a short while
+COMPLETED_VIDEO_CACHE_TTL = int(os.getenv('COMPLETED_VIDEO_CACHE_TTL', 60))
+COMPLETED_VIDEO_CACHE_SIZE = 4096
+
+# Video rows are also cached in Redis, shared by every web worker: briefly
+# while processing (every write invalidates), longer once completed
+# (view counts in a cached completed row may lag by up to that TTL)
+VIDEO_ROW_CACHE_TTL = 5
+COMPLETED_VIDEO_ROW_CACHE_TTL = int(os.getenv('COMPLETED_VIDEO_ROW_CACHE_TTL', 300))
+
+# Users are looked up on every logged-in request; tier/usage changes made in
+# this process invalidate the entry, other processes see them within the TTL.
+# Module-level because app.py and auth.py each create their own Database.
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 30))
+_user_cache = LocalTTLCache(ttl=USER_CACHE_TTL, maxsize=10000)
+
 
 class Video(Base):
     """Video model for tracking processed videos"""
@@ -32,6 +51,7 @@ class Video(Base):
     status_message = Column(String(500))  # Current processing step message
     error_message = Column(Text)  # Use Text for long error messages
     debug_data = Column(Text)  # JSON: transcription, translation, TTS details for debugging
+    celery_task_id = Column(String(50))  # Celery task processing this video (Celery mode)
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, index=True)  # Index for recent videos query
     view_count = Column(Integer, default=0, index=True)  # Index for popular videos query
@@ -44,9 +64,9 @@ class Video(Base):
         Index('idx_status_view_count', 'processing_status', 'view_count'),
     )
 
-    def to_dict(self):
-        """Convert model to dictionary"""
-        return {
+    def to_dict(self, include_debug_data=True):
+        """Convert model to dictionary (optionally without the large debug_data column)"""
+        data = {
             'id': self.id,
             'video_id': self.video_id,
             'title': self.title,
@@ -58,10 +78,23 @@ class Video(Base):
             'status_message': self.status_message,
             'error_message': self.error_message,
             'debug_data': self.debug_data,
+            'celery_task_id': self.celery_task_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'view_count': self.view_count
         }
+        if not include_debug_data:
+            del data['debug_data']
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a detached Video from to_dict() output"""
+        data = dict(data)
+        for field in ('created_at', 'completed_at'):
+            if data.get(field):
+                data[field] = datetime.fromisoformat(data[field])
+        return cls(**data)
 
 
 class Tier(Base):
@@ -185,6 +218,22 @@ class UserVideo(Base):
         }
 
 
+# Columns the library/popular listings need; skips debug_data and
+# error_message (large Text columns) and ORM object hydration
+LISTING_COLUMNS = (
+    Video.id,
+    Video.video_id,
+    Video.title,
+    Video.original_url,
+    Video.r2_url,
+    Video.duration,
+    Video.processing_status,
+    Video.progress,
+    Video.status_message,
+    Video.view_count,
+)
+
+
 class Database:
     def __init__(self, database_url=None):
         """
@@ -247,6 +296,12 @@ class Database:
 
         self.Session = scoped_session(sessionmaker(bind=self.engine))
 
+        # Detached Video objects, only ever in the 'completed' state
+        self._completed_videos = LocalTTLCache(
+            ttl=COMPLETED_VIDEO_CACHE_TTL,
+            maxsize=COMPLETED_VIDEO_CACHE_SIZE
+        )
+
         # Create tables
         Base.metadata.create_all(self.engine)
 
@@ -261,6 +316,26 @@ class Database:
         """Close database session"""
         session.close()
 
+    @contextmanager
+    def session_scope(self):
+        """
+        Session for one unit of work: commits on success, rolls back on
+        error, and is always closed
+
+        Usage:
+            with db.session_scope() as session:
+                session.add(video)
+        """
+        session = self.get_session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self.close_session(session)
+
     def _run_migrations(self):
         """Run database migrations for new columns"""
         from sqlalchemy import inspect, text
@@ -284,30 +359,89 @@ class Database:
                 except Exception as e:
                     logger.warning(f"Migration: debug_data column may already exist: {e}")
 
+        # Add celery_task_id column if it doesn't exist
+        if 'celery_task_id' not in columns:
+            with self.engine.connect() as conn:
+                try:
+                    conn.execute(text('ALTER TABLE videos ADD COLUMN celery_task_id VARCHAR(50)'))
+                    conn.commit()
+                    logger.info("Migration: Added celery_task_id column to videos table")
+                except Exception as e:
+                    logger.warning(f"Migration: celery_task_id column may already exist: {e}")
+
     def get_video_by_id(self, video_id):
         """
         Get video by YouTube ID
 
+        Completed videos are served from a short-TTL in-memory cache; all
+        rows are also cached in Redis (see VIDEO_ROW_CACHE_TTL). Every write
+        through this class invalidates the Redis copy, and a load that
+        overlaps a write doesn't cache what it read.
+
+        debug_data is not loaded (it is large and rewritten while a video
+        processes); it reads as None here. Use get_debug_data() for it.
+
         Args:
             video_id: YouTube video ID
 
         Returns:
-            Video object or None
+            Video object or None (treat as read-only)
         """
+        video = self._completed_videos.get(video_id)
+        if video is not None:
+            return video
+
+        row_key = self._video_cache_key(video_id)
+        row = cache.get(row_key)
+        if row is not None:
+            video = Video.from_dict(row)
+            if video.processing_status == 'completed':
+                self._completed_videos.set(video_id, video)
+            return video
+
+        # Read before querying: if a write invalidates the row while this
+        # load runs, the stale result isn't cached
+        version = cache.version(row_key)
+
         session = self.get_session()
         try:
-            # Expire all to force fresh data from database
+            # Expire all so the query reloads rows this session already holds
             session.expire_all()
-            video = session.query(Video).filter_by(video_id=video_id).first()
+            video = (
+                session.query(Video)
+                .options(defer(Video.debug_data))
+                .filter_by(video_id=video_id)
+                .first()
+            )
             if video:
-                # Refresh to get latest data
-                session.refresh(video)
+                # Mark the deferred column loaded (as None) so reading it after
+                # detaching doesn't raise; get_debug_data() reads the real value
+                set_committed_value(video, 'debug_data', None)
                 # Detach from session to avoid LazyLoadingError after session closes
                 session.expunge(video)
+                completed = video.processing_status == 'completed'
+                if completed:
+                    self._completed_videos.set(video_id, video)
+                cache.set_if_version(
+                    row_key,
+                    version,
+                    video.to_dict(include_debug_data=False),
+                    COMPLETED_VIDEO_ROW_CACHE_TTL if completed else VIDEO_ROW_CACHE_TTL
+                )
             return video
         finally:
             self.close_session(session)
 
+    @staticmethod
+    def _video_cache_key(video_id):
+        """Redis key for a cached video row"""
+        return f"cache:video:{video_id}"
+
+    def _invalidate_video(self, video_id):
+        """Drop cached copies of a video row after a write"""
+        self._completed_videos.invalidate(video_id)
+        cache.invalidate(self._video_cache_key(video_id))
+
     def create_video(self, video_id, title, original_url):
         """
         Create new video record
@@ -378,10 +512,11 @@ class Database:
                 elif video.processing_status == 'processing':
                     return (video, False, False)  # Already processing, don't process
                 elif video.processing_status == 'failed':
-                    # Failed previously, allow retry - update status to processing
-                    self.update_video_status(video_id, 'processing')
-                    self.update_video_progress(video_id, "Retrying...", 0)
-                    return (video, False, True)  # Retry processing
+                    # Failed previously, allow retry - but only one of several
+                    # concurrent retries may flip it back to processing
+                    should_process = self.claim_failed_video(video_id)
+                    video.processing_status = 'processing'
+                    return (video, False, should_process)
 
             # Video doesn't exist - try to create
             try:
@@ -430,30 +565,94 @@ class Database:
             self.close_session(session)
             raise e
 
+    def claim_failed_video(self, video_id):
+        """
+        Move a failed video back to processing, if no one else has yet
+
+        A single conditional UPDATE, so when several requests retry the same
+        video at once exactly one of them wins and starts the job.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            True if this call claimed the retry, False otherwise
+        """
+        session = self.get_session()
+        try:
+            updated = session.query(Video)\
+                .filter_by(video_id=video_id, processing_status='failed')\
+                .update({
+                    'processing_status': 'processing',
+                    'status_message': "Retrying...",
+                    'progress': 0,
+                }, synchronize_session=False)
+            session.commit()
+            if updated:
+                self._invalidate_video(video_id)
+            return bool(updated)
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            self.close_session(session)
+
+    def set_video_task_id(self, video_id, task_id):
+        """
+        Record the Celery task processing a video (shared by all web workers)
+
+        Args:
+            video_id: YouTube video ID
+            task_id: Celery task ID
+
+        Returns:
+            Number of rows updated
+        """
+        session = self.get_session()
+        try:
+            updated = session.query(Video)\
+                .filter_by(video_id=video_id)\
+                .update({'celery_task_id': task_id}, synchronize_session=False)
+            session.commit()
+            cache.invalidate(self._video_cache_key(video_id))
+            return updated
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error recording task ID for {video_id}: {e}")
+            return 0
+        finally:
+            self.close_session(session)
+
     def update_video_progress(self, video_id, status_message, progress):
         """
         Update video progress and status message
 
+        Issues a single UPDATE statement instead of loading the row first
+        (this runs on every flushed progress update).
+
         Args:
             video_id: YouTube video ID
             status_message: Current status message
             progress: Progress percentage (0-100)
 
         Returns:
-            Updated Video object
+            Number of rows updated
         """
         session = self.get_session()
         try:
-            video = session.query(Video).filter_by(video_id=video_id).first()
-            if video:
-                video.processing_status = 'processing'
-                video.progress = progress
-                video.status_message = status_message
-                session.commit()
-                return video
-            else:
+            updated = session.query(Video)\
+                .filter_by(video_id=video_id)\
+                .update({
+                    'processing_status': 'processing',
+                    'progress': progress,
+                    'status_message': status_message,
+                }, synchronize_session=False)
+            session.commit()
+            cache.invalidate(self._video_cache_key(video_id))
+
+            if not updated:
                 logger.error(f"Video not found for progress update: {video_id}")
-                return None
+            return updated
         except Exception as e:
             session.rollback()
             logger.error(f"Error updating progress: {e}")
@@ -461,38 +660,47 @@ class Database:
         finally:
             self.close_session(session)
 
-    def update_video_status(self, video_id, status, error_message=None, r2_url=None):
+    def update_video_status(self, video_id, status, error_message=None, r2_url=None, **fields):
         """
         Update video processing status and invalidate caches
 
+        Issues a single UPDATE statement instead of loading the row first.
+
         Args:
             video_id: YouTube video ID
             status: New status (processing, completed, failed)
             error_message: Error message if failed
             r2_url: R2 storage URL if completed
+            **fields: Extra Video columns to set in the same UPDATE (e.g. title)
 
         Returns:
-            Updated Video object
+            Number of rows updated
         """
+        values = {'processing_status': status, **fields}
+        if error_message:
+            values['error_message'] = error_message
+        if r2_url:
+            values['r2_url'] = r2_url
+        if status == 'completed':
+            values['completed_at'] = datetime.utcnow()
+
         session = self.get_session()
         try:
-            video = session.query(Video).filter_by(video_id=video_id).first()
-            if video:
-                video.processing_status = status
-                if error_message:
-                    video.error_message = error_message
-                if r2_url:
-                    video.r2_url = r2_url
-                if status == 'completed':
-                    video.completed_at = datetime.utcnow()
-
-                    # Invalidate video list caches when a video is completed
-                    invalidate_cache("videos:recent")
-                    invalidate_cache("videos:popular")
+            updated = session.query(Video)\
+                .filter_by(video_id=video_id)\
+                .update(values, synchronize_session=False)
+            session.commit()
 
-                session.commit()
-                session.refresh(video)
-            return video
+            # Back to processing (retry) or failed: stop serving the cached copy;
+            # completed: replace the in-progress row cached in Redis
+            self._invalidate_video(video_id)
+
+            if updated and status == 'completed':
+                # Invalidate video list caches when a video is completed
+                invalidate_cache("videos:recent")
+                invalidate_cache("videos:popular")
+
+            return updated
         except Exception as e:
             session.rollback()
             raise e
@@ -506,17 +714,40 @@ class Database:
         Args:
             video_id: YouTube video ID
         """
+        try:
+            self.add_view_counts({video_id: 1})
+        except Exception as e:
+            logger.error(f"Error incrementing view count for {video_id}: {e}")
+
+    def add_view_counts(self, counts):
+        """
+        Add buffered views to several videos in one transaction
+
+        Args:
+            counts: Dict mapping video_id -> views to add
+
+        Returns:
+            Number of rows updated
+        """
+        if not counts:
+            return 0
+
         session = self.get_session()
         try:
-            video = session.query(Video).filter_by(video_id=video_id).first()
-            if video:
-                video.view_count += 1
-                session.commit()
+            updated = 0
+            for video_id, delta in counts.items():
+                updated += session.query(Video)\
+                    .filter_by(video_id=video_id)\
+                    .update({'view_count': Video.view_count + delta}, synchronize_session=False)
+            session.commit()
 
-                # Invalidate popular videos cache (view count changed)
+            # Invalidate popular videos cache (view counts changed)
+            if updated:
                 invalidate_cache("videos:popular")
+            return updated
         except Exception as e:
             session.rollback()
+            raise e
         finally:
             self.close_session(session)
 
@@ -535,6 +766,7 @@ class Database:
             if video:
                 video.debug_data = json.dumps(debug_data, ensure_ascii=False)
                 session.commit()
+                self._invalidate_video(video_id)
         except Exception as e:
             session.rollback()
             logger.error(f"Failed to save debug data: {e}")
@@ -552,10 +784,16 @@ class Database:
             Dictionary with debug data or None
         """
         import json
-        video = self.get_video(video_id)
-        if video and video.debug_data:
+        session = self.get_session()
+        try:
+            # Only the one column; get_video_by_id() rows don't carry it
+            raw = session.query(Video.debug_data).filter_by(video_id=video_id).scalar()
+        finally:
+            self.close_session(session)
+
+        if raw:
             try:
-                return json.loads(video.debug_data)
+                return json.loads(raw)
             except:
                 return None
         return None
@@ -569,18 +807,18 @@ class Database:
             limit: Number of videos to return
 
         Returns:
-            List of Video dictionaries (JSON-serializable)
+            List of video dictionaries (LISTING_COLUMNS, JSON-serializable)
         """
         session = self.get_session()
         try:
-            videos = session.query(Video)\
-                .filter_by(processing_status='completed')\
+            rows = session.query(*LISTING_COLUMNS)\
+                .filter(Video.processing_status == 'completed')\
                 .order_by(Video.completed_at.desc())\
                 .limit(limit)\
                 .all()
 
-            # Convert to dictionaries for caching
-            return [video.to_dict() for video in videos]
+            # Plain dictionaries for caching
+            return [dict(row._mapping) for row in rows]
         finally:
             self.close_session(session)
 
@@ -593,18 +831,18 @@ class Database:
             limit: Number of videos to return
 
         Returns:
-            List of Video dictionaries (JSON-serializable)
+            List of video dictionaries (LISTING_COLUMNS, JSON-serializable)
         """
         session = self.get_session()
         try:
-            videos = session.query(Video)\
-                .filter_by(processing_status='completed')\
+            rows = session.query(*LISTING_COLUMNS)\
+                .filter(Video.processing_status == 'completed')\
                 .order_by(Video.view_count.desc())\
                 .limit(limit)\
                 .all()
 
-            # Convert to dictionaries for caching
-            return [video.to_dict() for video in videos]
+            # Plain dictionaries for caching
+            return [dict(row._mapping) for row in rows]
         finally:
             self.close_session(session)
 
@@ -736,14 +974,32 @@ class Database:
         finally:
             self.close_session(session)
 
-    def get_user_by_id(self, user_id):
-        """Get user by ID"""
+    def get_user_by_id(self, user_id, fresh=False):
+        """
+        Get user by ID (detached, cached for USER_CACHE_TTL seconds; treat as read-only)
+
+        The cache is per process and Celery workers charge minutes, so a cached
+        row can lag behind usage. Quota checks must pass fresh=True.
+
+        Args:
+            user_id: User ID
+            fresh: Skip the cache and load the row from the database
+
+        Returns:
+            User object or None
+        """
+        if not fresh:
+            user = _user_cache.get(user_id)
+            if user is not None:
+                return user
+
         session = self.get_session()
         try:
             user = session.query(User).filter_by(id=user_id).first()
             if user:
                 _ = user.tier
                 session.expunge(user)
+                _user_cache.set(user_id, user)
             return user
         finally:
             self.close_session(session)
@@ -756,6 +1012,7 @@ class Database:
             if user and user.check_password(password):
                 user.last_login = datetime.utcnow()
                 session.commit()
+                _user_cache.invalidate(user.id)
                 _ = user.tier
                 session.expunge(user)
                 return user
@@ -777,6 +1034,7 @@ class Database:
 
             user.tier_id = tier.id
             session.commit()
+            _user_cache.invalidate(user_id)
             logger.info(f"User {user.email} tier updated to {tier_name}")
             return user
         except Exception as e:
@@ -793,6 +1051,7 @@ class Database:
             if user:
                 user.add_usage(minutes)
                 session.commit()
+                _user_cache.invalidate(user_id)
                 return True
             return False
         except Exception as e:
@@ -868,6 +1127,7 @@ class Database:
                 user.add_usage(minutes_charged)
 
             session.commit()
+            _user_cache.invalidate(user_id)
             return user_video
         except Exception as e:
             session.rollback()
@@ -17,7 +17,7 @@ from src.ffmpeg_utils import get_ffmpeg_path, get_ffprobe_path
 logger = get_logger(__name__)
 
 # Rate limiting for API calls
-LAST_API_CALL_TIME = 0
+LAST_API_CALL_TIME = float('-inf')  # time.monotonic() of the last call
 MIN_TIME_BETWEEN_CALLS = 2  # Minimum 2 seconds between API calls
 
 
@@ -253,16 +253,15 @@ class VideoDownloader:
                 progress_callback(f"Error: {message}")
             raise Exception(message)
 
-        # Rate limiting
+        # Rate limiting: this process's own spacing, and the tracker's (shared across workers)
         global LAST_API_CALL_TIME
-        current_time = time.time()
-        time_since_last_call = current_time - LAST_API_CALL_TIME
-        if time_since_last_call < MIN_TIME_BETWEEN_CALLS:
-            wait_time = MIN_TIME_BETWEEN_CALLS - time_since_last_call
+        time_since_last_call = time.monotonic() - LAST_API_CALL_TIME
+        wait_time = max(MIN_TIME_BETWEEN_CALLS - time_since_last_call, api_tracker.retry_after())
+        if wait_time > 0:
             logger.info(f"Rate limiting: waiting {wait_time:.1f}s before API call")
             time.sleep(wait_time)
 
-        LAST_API_CALL_TIME = time.time()
+        LAST_API_CALL_TIME = time.monotonic()
 
         try:
             with requests.Session() as session:
@@ -609,6 +608,10 @@ class VideoDownloader:
             'quiet': False,  # Show output for debugging
             'no_warnings': False,
             'extract_flat': False,
+            # Read the socket in 64 KiB blocks (default starts at 1 KiB) and
+            # fetch in 10 MiB ranged requests, which YouTube throttles less
+            'buffersize': 64 * 1024,
+            'http_chunk_size': 10 * 1024 * 1024,
         }
 
         try:
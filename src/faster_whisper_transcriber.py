@@ -0,0 +1,108 @@
+"""
+Faster-Whisper Transcriber
+Runs Whisper on CTranslate2 with int8 weights and batched decoding
+(several times faster than openai-whisper on the same hardware)
+"""
+
+import os
+from typing import List, Dict, Optional
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+from src.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _pick_device():
+    """Use CUDA when CTranslate2 can see a GPU, otherwise CPU"""
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return 'cuda', 'int8_float16'
+    except Exception:
+        pass
+    return 'cpu', 'int8'
+
+
+class FasterWhisperTranscriber:
+    """Local faster-whisper transcriber - free, no API needed"""
+
+    def __init__(self, model_size: str = "base", batch_size: int = 8):
+        """
+        Initialize faster-whisper transcriber
+
+        Args:
+            model_size: Model size - "tiny", "base", "small", "medium", "large-v3"
+            batch_size: Number of audio chunks decoded together
+        """
+        self.model_size = model_size
+        self.batch_size = batch_size
+        self.device, self.compute_type = _pick_device()
+
+        logger.info(f"Loading faster-whisper {model_size} model ({self.device}, {self.compute_type})...")
+        try:
+            model = WhisperModel(model_size, device=self.device, compute_type=self.compute_type)
+            self.model = BatchedInferencePipeline(model=model)
+            logger.info(f"faster-whisper {model_size} model loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load faster-whisper model: {e}")
+            raise ValueError(f"faster-whisper model loading failed: {e}")
+
+    def transcribe(
+        self,
+        audio_path: str,
+        progress_callback: Optional[callable] = None
+    ) -> List[Dict]:
+        """
+        Transcribe audio file using faster-whisper
+
+        Args:
+            audio_path: Path to audio file
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            List of segment dictionaries with start, end, text, speaker
+        """
+        try:
+            if not os.path.exists(audio_path):
+                raise Exception(f"Audio file not found: {audio_path}")
+
+            if progress_callback:
+                progress_callback(f"Transcribing with faster-whisper {self.model_size} model...")
+
+            # vad_filter skips silence and cuts audio into chunks for batching
+            segments_iter, info = self.model.transcribe(
+                audio_path,
+                language="en",
+                task="transcribe",
+                batch_size=self.batch_size,
+                without_timestamps=False,
+                vad_filter=True
+            )
+
+            # Segments are decoded lazily as the generator is consumed
+            segments = []
+            for segment in segments_iter:
+                segments.append({
+                    "start": segment.start,
+                    "end": segment.end,
+                    "text": segment.text.strip(),
+                    "speaker": "Speaker 1"  # No speaker diarization
+                })
+
+                if progress_callback and info.duration and len(segments) % 10 == 0:
+                    progress_callback(f"Transcribed {segment.end:.0f}s of {info.duration:.0f}s")
+
+            logger.info(f"faster-whisper transcription complete: {len(segments)} segments")
+            return segments
+
+        except Exception as e:
+            logger.error(f"faster-whisper transcription failed: {e}", exc_info=True)
+            return []
+
+    def has_speaker_diarization(self):
+        """Check if provider supports speaker diarization"""
+        return False
+
+    def get_speakers(self):
+        """Get speaker profiles"""
+        return [{"id": "Speaker 1", "label": "Speaker 1"}]
@@ -5,13 +5,20 @@ Handles ffmpeg path resolution across different environments
 
 import os
 import shutil
+from functools import lru_cache
 from pathlib import Path
 
+# Prepended to every ffmpeg command: no stdin interaction, and only errors on
+# stderr (the banner and per-frame progress lines are pure overhead in a pipe)
+FFMPEG_QUIET_ARGS = ['-nostdin', '-hide_banner', '-loglevel', 'error']
 
+
+@lru_cache(maxsize=None)
 def get_ffmpeg_path():
     """
     Get the path to ffmpeg executable.
     Tries multiple locations to ensure it works on Windows, Linux, and Railway.
+    Resolved once per process (every ffmpeg command calls this).
 
     Returns:
         str: Path to ffmpeg executable
@@ -52,10 +59,12 @@ def get_ffmpeg_path():
     return 'ffmpeg'
 
 
+@lru_cache(maxsize=None)
 def get_ffprobe_path():
     """
     Get the path to ffprobe executable.
     Tries multiple locations to ensure it works on Windows, Linux, and Railway.
+    Resolved once per process (every ffprobe command calls this).
 
     Returns:
         str: Path to ffprobe executable
@@ -4,13 +4,33 @@ Translates text to Georgian using Google Gemini API (FREE alternative to OpenAI)
 """
 
 import os
+import threading
 from typing import List, Dict, Optional
 from google import genai
 from google.genai import types
 from src.logging_config import get_logger
+from src.translator import (
+    BATCH_SEPARATOR, TRANSLATION_SEMAPHORE, chunk_texts, map_ordered, pace_fallback_request, split_batch
+)
 
 logger = get_logger(__name__)
 
+# genai clients are thread-safe; share one per API key across jobs so
+# connections are reused instead of re-established for every video
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_genai_client(api_key: str) -> 'genai.Client':
+    """Get the shared Gemini client for an API key, creating it on first use"""
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = _clients[api_key] = genai.Client(api_key=api_key)
+    return client
+
 
 class GeminiTranslator:
     """Translator using Google Gemini API"""
@@ -21,8 +41,8 @@ class GeminiTranslator:
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
 
-        # Initialize client with new google.genai package
-        self.client = genai.Client(api_key=api_key)
+        # Shared client (google.genai package)
+        self.client = get_genai_client(api_key)
 
         # Use Gemini 2.5 Flash (free tier: 15 RPM, 1500 RPD, fast and efficient)
         self.model_name = 'models/gemini-2.5-flash'
@@ -47,10 +67,11 @@ Only respond with the translation, no explanations.
 
 Translate to Georgian: {text}"""
 
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+            with TRANSLATION_SEMAPHORE:
+                response = self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt
+                )
             return response.text.strip()
 
         except Exception as e:
@@ -59,49 +80,23 @@ Translate to Georgian: {text}"""
 
     def translate_batch(self, texts: List[str], progress_callback=None) -> List[str]:
         """
-        Translate multiple texts to Georgian
-
-        Args:
-            texts: List of English texts
-            progress_callback: Optional progress callback
-
-        Returns:
-            List of Georgian translations
-        """
-        translations = []
-        total = len(texts)
-
-        for i, text in enumerate(texts):
-            if progress_callback and (i + 1) % 5 == 0:
-                progress_callback(f"Translating {i+1}/{total} segments...")
+        Translate multiple texts to Georgian in a single request
 
-            translation = self.translate_text(text)
-            translations.append(translation)
-
-        return translations
-
-    def translate_segments(self, segments: List[Dict], progress_callback=None) -> List[Dict]:
-        """
-        Translate segments with context awareness
+        Texts are joined with BATCH_SEPARATOR and split back afterwards.
+        Falls back to one request per text if the response doesn't split
+        into the expected number of parts.
 
         Args:
-            segments: List of segments with 'text', 'start', 'end'
+            texts: List of English texts
             progress_callback: Optional progress callback
 
         Returns:
-            Segments with added 'translated_text' field
+            List of Georgian translations, same order and length as texts
         """
-        if progress_callback:
-            progress_callback(f"AI translating {len(segments)} segments to Georgian...")
-
-        # Combine segments for better context
-        full_text = "\n\n".join([f"[{i}] {seg['text']}" for i, seg in enumerate(segments)])
-
-        if progress_callback:
-            progress_callback("Sending to Gemini for context-aware translation...")
+        if len(texts) == 1:
+            return [self.translate_text(texts[0])]
 
         try:
-            # Create context-aware prompt
             prompt = f"""You are an expert translator specializing in English to Georgian translation.
 Your translations must be:
 1. Natural and fluent in Georgian, not word-for-word mechanical translations
@@ -110,59 +105,71 @@ Your translations must be:
 4. Culturally appropriate for Georgian speakers
 5. Maintain the meaning and tone of the original
 
-Translate each numbered segment below into Georgian. Keep the same numbering format [0], [1], etc.
-Do not add any explanations, just provide the translations.
+Translate each text below into Georgian. The texts are separated by lines
+containing only the {BATCH_SEPARATOR.strip()} symbol. Return exactly {len(texts)} translations
+in the same order, separated the same way.
+Do not add numbering or explanations, just provide the translations.
 
-{full_text}"""
+{BATCH_SEPARATOR.join(texts)}"""
 
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
-            translated_full = response.text.strip()
+            with TRANSLATION_SEMAPHORE:
+                response = self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt
+                )
 
-            # Split back into segments
-            translated_lines = translated_full.split('\n\n')
+            translations = split_batch(response.text)
+            if len(translations) == len(texts):
+                return translations
 
-            translated_segments = []
-            for i, segment in enumerate(segments):
-                # Find corresponding translation
-                translation = None
-                for line in translated_lines:
-                    if line.startswith(f"[{i}]"):
-                        translation = line[len(f"[{i}]"):].strip()
-                        break
+            logger.warning(f"Batch translation returned {len(translations)}/{len(texts)} parts, translating individually")
 
-                if not translation:
-                    # Fallback: translate individually
-                    translation = self.translate_text(segment['text'])
+        except Exception as e:
+            logger.error(f"Batch translation failed: {e}")
 
-                translated_segment = segment.copy()
-                translated_segment['translated_text'] = translation
-                translated_segment['original_text'] = segment['text']
-                translated_segments.append(translated_segment)
+        # Fallback: translate individually, paced so it can't burst the 15 RPM quota
+        if progress_callback:
+            progress_callback("Batch translation failed, translating individually...")
 
-                if progress_callback and (i + 1) % 10 == 0:
-                    progress_callback(f"Processed {i + 1}/{len(segments)} translations")
+        translations = []
+        for text in texts:
+            pace_fallback_request()
+            translations.append(self.translate_text(text))
+        return translations
 
-        except Exception as e:
-            logger.error(f"Batch translation failed: {e}")
+    def translate_segments(self, segments: List[Dict], progress_callback=None) -> List[Dict]:
+        """
+        Translate segments in batched requests
 
-            # Fallback: translate individually
-            if progress_callback:
-                progress_callback("Batch translation failed, translating individually...")
+        Segments are packed into batches bounded by BATCH_MAX_SEGMENTS and
+        BATCH_MAX_CHARS, so a long video costs a handful of round trips and
+        a bad response only affects its own batch. Requests share the
+        process-wide TRANSLATION_SEMAPHORE with every other job.
 
-            translated_segments = []
-            for i, segment in enumerate(segments):
-                translation = self.translate_text(segment['text'])
+        Args:
+            segments: List of segments with 'text', 'start', 'end'
+            progress_callback: Optional progress callback
 
-                translated_segment = segment.copy()
-                translated_segment['translated_text'] = translation
-                translated_segment['original_text'] = segment['text']
-                translated_segments.append(translated_segment)
+        Returns:
+            Segments with added 'translated_text' field
+        """
+        if progress_callback:
+            progress_callback(f"AI translating {len(segments)} segments to Georgian...")
 
-                if progress_callback and (i + 1) % 5 == 0:
-                    progress_callback(f"Translated {i + 1}/{len(segments)} segments")
+        translations = []
+        batches = chunk_texts([seg['text'] for seg in segments])
+        for batch_translations in map_ordered(lambda batch: self.translate_batch(batch, progress_callback), batches):
+            translations.extend(batch_translations)
+
+            if progress_callback:
+                progress_callback(f"Processed {len(translations)}/{len(segments)} translations")
+
+        translated_segments = []
+        for segment, translation in zip(segments, translations):
+            translated_segment = segment.copy()
+            translated_segment['translated_text'] = translation
+            translated_segment['original_text'] = segment['text']
+            translated_segments.append(translated_segment)
 
         if progress_callback:
             progress_callback(f"AI translation complete: {len(translated_segments)} segments")
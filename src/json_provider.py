@@ -0,0 +1,65 @@
+"""
+JSON Provider
+orjson-backed JSON for Flask, so jsonify() and request.get_json() skip the
+stdlib json encoder on hot polled endpoints like /status
+"""
+
+from flask.json.provider import DefaultJSONProvider
+from src.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Try to import orjson - optional dependency
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson not available - using Flask's default JSON provider")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes with orjson
+
+    Output matches the default provider: keys are sorted, and dates still go
+    through DefaultJSONProvider.default() (HTTP date format).
+    """
+
+    options = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_SERIALIZE_NUMPY
+        if ORJSON_AVAILABLE else 0
+    )
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.options).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # orjson already produces bytes; skip the str round-trip of dumps()
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.options),
+            mimetype=self.mimetype
+        )
+
+
+def init_json_provider(app):
+    """
+    Install the orjson provider on the app when orjson is installed
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        bool: True if orjson is in use
+    """
+    if not ORJSON_AVAILABLE:
+        return False
+
+    app.json = OrjsonProvider(app)
+    logger.info("JSON: orjson provider enabled")
+    return True
@@ -5,9 +5,22 @@ Handles various Redis URL formats and Railway's environment variables
 
 import os
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# One connection pool per Redis URL, shared by every client in the process
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 32))
+REDIS_CONNECT_TIMEOUT = int(os.getenv('REDIS_CONNECT_TIMEOUT', 10))  # Railway's internal network can be slow
+
+# Reachability probes (/health, the Celery check on /process) run on request
+# threads, so they get their own small pool with short timeouts and no retries
+REDIS_PROBE_TIMEOUT = float(os.getenv('REDIS_PROBE_TIMEOUT', 3))
+REDIS_PROBE_MAX_CONNECTIONS = 4
+
+_pools = {}
+_pools_lock = threading.Lock()
+
 def get_redis_url():
     """
     Get Redis URL from various possible Railway environment variables
@@ -57,4 +70,90 @@ def test_redis_connection(redis_url):
         return True
     except Exception as e:
         logger.error(f"Redis connection failed: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def get_redis_client(redis_url):
+    """
+    Get a Redis client backed by the process-wide connection pool
+
+    Clients are cheap; the pool (and its TCP connections) is created once per
+    URL and shared by the status tracker, cache, API tracker and view counter
+    (reachability probes use get_probe_redis_client instead). Idle connections
+    are health-checked instead of reconnected. redis-py resets the pool in
+    forked children, so this is safe under Celery.
+
+    Args:
+        redis_url: Redis URL
+
+    Returns:
+        redis.Redis client (raw bytes responses)
+
+    Raises:
+        ValueError: If redis_url is empty
+    """
+    import redis
+
+    if not redis_url:
+        raise ValueError("No Redis URL configured")
+
+    pool = _pools.get(redis_url)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(redis_url)
+            if pool is None:
+                # Blocking pool: waits for a free connection instead of erroring at the cap
+                # socket_keepalive causes "Error 22" on Railway, so disabled
+                pool = redis.BlockingConnectionPool.from_url(
+                    redis_url,
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    timeout=REDIS_CONNECT_TIMEOUT,
+                    socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+                    socket_timeout=5,
+                    retry_on_timeout=True,
+                    health_check_interval=30
+                )
+                _pools[redis_url] = pool
+
+    return redis.Redis(connection_pool=pool)
+
+
+def get_probe_redis_client(redis_url):
+    """
+    Get a Redis client for quick reachability checks
+
+    Uses a separate small pool whose connect, read and pool-wait timeouts are
+    all REDIS_PROBE_TIMEOUT, without retry_on_timeout. When Redis is down,
+    a ping fails within a few seconds instead of holding a web thread for
+    the main pool's Railway-sized timeouts.
+
+    Args:
+        redis_url: Redis URL
+
+    Returns:
+        redis.Redis client (raw bytes responses)
+
+    Raises:
+        ValueError: If redis_url is empty
+    """
+    import redis
+
+    if not redis_url:
+        raise ValueError("No Redis URL configured")
+
+    key = ('probe', redis_url)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = redis.BlockingConnectionPool.from_url(
+                    redis_url,
+                    max_connections=REDIS_PROBE_MAX_CONNECTIONS,
+                    timeout=REDIS_PROBE_TIMEOUT,
+                    socket_connect_timeout=REDIS_PROBE_TIMEOUT,
+                    socket_timeout=REDIS_PROBE_TIMEOUT
+                )
+                _pools[key] = pool
+
+    return redis.Redis(connection_pool=pool)
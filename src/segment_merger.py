@@ -10,6 +10,12 @@ from src.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Compiled once at import (used per segment while merging)
+SENTENCE_END_PATTERN = re.compile(r'[.!?]\s*$')
+QUESTION_END_PATTERN = re.compile(r'[?]\s*$')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SENTENCE_SPLIT_PATTERN = re.compile(r'([.!?]\s+)')
+
 
 class SegmentMerger:
     """Intelligently merges segments into paragraphs for translation"""
@@ -181,7 +187,7 @@ class SegmentMerger:
         # Check for sentence boundaries if we have enough content
         if current_duration >= self.min_duration and current_words >= self.min_words:
             # Look for sentence-ending punctuation
-            if re.search(r'[.!?]\s*$', current['text'].strip()):
+            if SENTENCE_END_PATTERN.search(current['text'].strip()):
                 return True
 
         return False
@@ -228,10 +234,10 @@ class SegmentMerger:
     def _clean_text(self, text: str) -> str:
         """Clean up paragraph text"""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
 
         # Ensure proper sentence capitalization
-        sentences = re.split(r'([.!?]\s+)', text)
+        sentences = SENTENCE_SPLIT_PATTERN.split(text)
         cleaned = []
 
         for i, part in enumerate(sentences):
@@ -336,7 +342,7 @@ class SegmentMerger:
         if context['previous']:
             # Check if it's a question-answer pattern
             last_text = context['previous'][-1]['text'] if context['previous'] else ''
-            if re.search(r'[?]\s*$', last_text):
+            if QUESTION_END_PATTERN.search(last_text):
                 context['conversation_flow'].append('responding_to_question')
 
             # Check if speakers are alternating (dialogue)
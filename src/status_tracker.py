@@ -6,12 +6,19 @@ Version: 2.0.0 - Redis-based with in-memory fallback
 
 import os
 import json
+import atexit
 import threading
+import time
 from typing import Dict, Any, Optional
 from src.logging_config import get_logger
+from src.redis_config import get_redis_client
 
 logger = get_logger(__name__)
 
+# Statuses only matter while a job runs (final states live in the database)
+# and every write refreshes the TTL, so an hour after the last update is plenty
+STATUS_TTL = int(os.getenv('STATUS_TTL', 3600))
+
 # Try to import Redis - optional dependency
 try:
     import redis
@@ -21,22 +28,93 @@ except ImportError:
     REDIS_AVAILABLE = False
     logger.warning("Redis not available - falling back to in-memory status tracking")
 
+# Try to import orjson - optional dependency (faster status (de)serialization)
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+
+class StatusNotifier:
+    """
+    Process-local "status changed" signal for streaming clients (SSE).
+
+    Each video has a version counter; notify() bumps it and wakes waiters,
+    wait() blocks until the version differs from the one the caller saw.
+    Only the `maxsize` most recently changed videos keep a counter; an evicted
+    counter reads as 0, which merely wakes its waiters for one extra re-read.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._cond = threading.Condition()
+        self._versions: Dict[str, int] = {}
+
+    def version(self, video_id: str) -> int:
+        """Current change version for a video"""
+        return self._versions.get(video_id, 0)
+
+    def notify(self, video_id: str) -> None:
+        """Signal that a video's status changed"""
+        with self._cond:
+            # Re-insert so dict order is least -> most recently changed
+            self._versions[video_id] = self._versions.pop(video_id, 0) + 1
+            while len(self._versions) > self.maxsize:
+                del self._versions[next(iter(self._versions))]
+            self._cond.notify_all()
+
+    def wait(self, video_id: str, seen: int, timeout: float) -> int:
+        """Wait up to timeout seconds for a change; returns the current version"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._versions.get(video_id, 0) != seen, timeout)
+            return self._versions.get(video_id, 0)
+
+    def forget(self, video_id: str) -> None:
+        """Drop the counter for a finished video"""
+        with self._cond:
+            self._versions.pop(video_id, None)
+            self._cond.notify_all()
+
 
 class RedisStatusTracker:
     """
     Redis-based processing status tracker for distributed environments.
     Provides atomic operations and shared state across workers.
+
+    Each status is a hash (one JSON-encoded value per field), so merges are
+    a single HSET instead of a WATCH/GET/SET retry loop, and reads are one
+    HGETALL.
     """
 
+    # Seconds the pub/sub listener waits per poll (well under the pool's socket_timeout)
+    LISTEN_POLL_TIMEOUT = 1.0
+
     def __init__(self, redis_client: 'redis.Redis'):
         self.redis = redis_client
-        self.key_prefix = "processing_status:"
-        self.default_ttl = 86400  # 24 hours
+        self.key_prefix = "vo:status:"
+        self.channel_prefix = "vo:progress:"
+        self.default_ttl = STATUS_TTL
+        self.notifier = StatusNotifier()
+        self._listener = None
+        self._listener_lock = threading.Lock()
 
     def _get_key(self, video_id: str) -> str:
         """Get Redis key for video status"""
         return f"{self.key_prefix}{video_id}"
 
+    @staticmethod
+    def _encode(status_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode field values for HSET"""
+        return {field: _json_dumps(value) for field, value in status_data.items()}
+
+    @staticmethod
+    def _decode(raw: Dict[bytes, bytes]) -> Dict[str, Any]:
+        """Decode an HGETALL reply"""
+        return {field.decode('utf-8'): _json_loads(value) for field, value in raw.items()}
+
     def get_status(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
         Get processing status for a video.
@@ -48,12 +126,8 @@ class RedisStatusTracker:
             Status dict or None if not found
         """
         try:
-            key = self._get_key(video_id)
-            data = self.redis.get(key)
-
-            if data:
-                return json.loads(data)
-            return None
+            raw = self.redis.hgetall(self._get_key(video_id))
+            return self._decode(raw) if raw else None
 
         except RedisError as e:
             logger.error(f"Redis error in get_status for {video_id}: {e}")
@@ -65,22 +139,22 @@ class RedisStatusTracker:
 
         Args:
             video_id: The video ID
-            status_data: Status dictionary to store
-            ttl: Time to live in seconds (default: 24 hours)
+            status_data: Status dictionary to store (replaces the previous one)
+            ttl: Time to live in seconds (default: STATUS_TTL)
 
         Returns:
             True if successful, False otherwise
         """
         try:
             key = self._get_key(video_id)
-            data = json.dumps(status_data)
 
-            # Set with TTL to automatically expire old statuses
-            self.redis.setex(
-                key,
-                ttl or self.default_ttl,
-                data
-            )
+            # Replace atomically; TTL automatically expires old statuses
+            with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                if status_data:
+                    pipe.hset(key, mapping=self._encode(status_data))
+                    pipe.expire(key, ttl or self.default_ttl)
+                pipe.execute()
 
             logger.debug(f"Updated status for {video_id}: {status_data.get('status', 'unknown')}")
             return True
@@ -103,36 +177,16 @@ class RedisStatusTracker:
         try:
             key = self._get_key(video_id)
 
-            # Use WATCH for optimistic locking
-            with self.redis.pipeline() as pipe:
-                while True:
-                    try:
-                        pipe.watch(key)
-
-                        # Get current data
-                        current_data = pipe.get(key)
-                        if current_data:
-                            status_data = json.loads(current_data)
-                        else:
-                            status_data = {'video_id': video_id}
-
-                        # Merge updates
-                        status_data.update(updates)
-
-                        # Start transaction
-                        pipe.multi()
-                        pipe.setex(key, self.default_ttl, json.dumps(status_data))
-                        pipe.execute()
-
-                        logger.debug(f"Merged status for {video_id}: {updates}")
-                        return True
+            # HSETNX keeps an existing video_id; HSET merges the updated fields
+            with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hsetnx(key, 'video_id', _json_dumps(video_id))
+                if updates:
+                    pipe.hset(key, mapping=self._encode(updates))
+                pipe.expire(key, self.default_ttl)
+                pipe.execute()
 
-                    except redis.WatchError:
-                        # Retry if data changed during transaction
-                        logger.debug(f"Retrying merge_status for {video_id} due to concurrent modification")
-                        continue
-                    finally:
-                        pipe.reset()
+            logger.debug(f"Merged status for {video_id}: {updates}")
+            return True
 
         except RedisError as e:
             logger.error(f"Redis error in merge_status for {video_id}: {e}")
@@ -158,6 +212,64 @@ class RedisStatusTracker:
             logger.error(f"Redis error in delete_status for {video_id}: {e}")
             return False
 
+    def notify_changed(self, video_id: str) -> None:
+        """Publish a change signal so every web process can wake its SSE streams"""
+        try:
+            self.redis.publish(f"{self.channel_prefix}{video_id}", b'1')
+        except RedisError as e:
+            logger.error(f"Redis error in notify_changed for {video_id}: {e}")
+
+    def wait_for_change(self, video_id: str, seen: int, timeout: float) -> int:
+        """
+        Wait for a change signal for a video.
+
+        Args:
+            video_id: The video ID
+            seen: Version returned by the previous call (0 initially)
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Current version (unchanged if the wait timed out)
+        """
+        self._ensure_listener()
+        return self.notifier.wait(video_id, seen, timeout)
+
+    def _ensure_listener(self):
+        """Start the process-wide pub/sub listener (one Redis connection per process)"""
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen,
+                    name="status-listener",
+                    daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        prefix_len = len(self.channel_prefix)
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{self.channel_prefix}*")
+                while True:
+                    # Poll rather than listen(): listen() blocks on the pool's
+                    # socket_timeout and raises TimeoutError whenever no job is
+                    # publishing. An idle poll just returns None.
+                    message = pubsub.get_message(timeout=self.LISTEN_POLL_TIMEOUT)
+                    if message and message.get('type') == 'pmessage':
+                        self.notifier.notify(message['channel'].decode('utf-8')[prefix_len:])
+            except RedisError as e:
+                # Waiters time out and re-read meanwhile; just reconnect
+                logger.warning(f"Redis error in status listener, reconnecting: {e}")
+                time.sleep(1)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except RedisError:
+                        pass
+
     def get_all_statuses(self) -> Dict[str, Dict[str, Any]]:
         """
         Get all processing statuses (for debugging).
@@ -172,9 +284,9 @@ class RedisStatusTracker:
 
             for key in self.redis.scan_iter(match=pattern, count=100):
                 video_id = key.decode('utf-8').replace(self.key_prefix, '')
-                data = self.redis.get(key)
-                if data:
-                    statuses[video_id] = json.loads(data)
+                raw = self.redis.hgetall(key)
+                if raw:
+                    statuses[video_id] = self._decode(raw)
 
             return statuses
 
@@ -187,46 +299,196 @@ class InMemoryStatusTracker:
     """
     In-memory processing status tracker (fallback for development).
     Thread-safe but not distributed across workers.
+
+    Stored status dicts are never mutated in place: writers build a fresh
+    dict and swap it in (atomic under the GIL), so readers take a lock-free
+    snapshot. Writers only serialize per video, never across videos.
+
+    Like the Redis keys, statuses expire `ttl` seconds after their last write,
+    so jobs whose status is never deleted (e.g. in a pool worker process)
+    don't accumulate for the life of the process.
     """
 
+    # How often writers sweep out expired statuses
+    SWEEP_INTERVAL = 60
+
     def __init__(self):
         self.statuses: Dict[str, Dict[str, Any]] = {}
-        self.lock = threading.Lock()
+        self._expires: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._next_sweep = time.monotonic() + self.SWEEP_INTERVAL
+        self.notifier = StatusNotifier()
+
+    def _lock_for(self, video_id: str) -> threading.Lock:
+        """Get (or create) the write lock for a single video"""
+        lock = self._locks.get(video_id)
+        if lock is None:
+            lock = self._locks.setdefault(video_id, threading.Lock())
+        return lock
+
+    def _is_expired(self, video_id: str, now: float) -> bool:
+        return self._expires.get(video_id, now) < now
+
+    def _maybe_sweep(self) -> None:
+        """Drop expired statuses, at most once per SWEEP_INTERVAL (call without a video lock)"""
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.SWEEP_INTERVAL
+        for video_id in [vid for vid in list(self._expires) if self._is_expired(vid, now)]:
+            with self._lock_for(video_id):
+                if not self._is_expired(video_id, now):
+                    continue  # Written again since the scan
+                self.statuses.pop(video_id, None)
+                self._expires.pop(video_id, None)
+            self._locks.pop(video_id, None)
+            self.notifier.forget(video_id)
 
     def get_status(self, video_id: str) -> Optional[Dict[str, Any]]:
-        """Get processing status for a video"""
-        with self.lock:
-            return self.statuses.get(video_id)
+        """Get processing status for a video (lock-free snapshot)"""
+        if self._is_expired(video_id, time.monotonic()):
+            return None
+        return self.statuses.get(video_id)
 
     def update_status(self, video_id: str, status_data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
         """Update processing status for a video"""
-        with self.lock:
+        with self._lock_for(video_id):
             self.statuses[video_id] = dict(status_data)  # Copy to avoid mutations
-            logger.debug(f"Updated in-memory status for {video_id}: {status_data.get('status', 'unknown')}")
-            return True
+            self._expires[video_id] = time.monotonic() + (ttl or STATUS_TTL)
+        self._maybe_sweep()
+        logger.debug(f"Updated in-memory status for {video_id}: {status_data.get('status', 'unknown')}")
+        return True
 
     def merge_status(self, video_id: str, updates: Dict[str, Any]) -> bool:
         """Merge updates into existing status"""
-        with self.lock:
-            if video_id not in self.statuses:
-                self.statuses[video_id] = {'video_id': video_id}
-
-            self.statuses[video_id].update(updates)
-            logger.debug(f"Merged in-memory status for {video_id}: {updates}")
-            return True
+        with self._lock_for(video_id):
+            current = self.get_status(video_id) or {'video_id': video_id}
+            self.statuses[video_id] = {**current, **updates}
+            self._expires[video_id] = time.monotonic() + STATUS_TTL
+        self._maybe_sweep()
+        logger.debug(f"Merged in-memory status for {video_id}: {updates}")
+        return True
 
     def delete_status(self, video_id: str) -> bool:
         """Delete processing status for a video"""
-        with self.lock:
-            if video_id in self.statuses:
-                del self.statuses[video_id]
+        with self._lock_for(video_id):
+            if self.statuses.pop(video_id, None) is not None:
                 logger.debug(f"Deleted in-memory status for {video_id}")
-            return True
+            self._expires.pop(video_id, None)
+        self._locks.pop(video_id, None)
+        self.notifier.forget(video_id)
+        return True
+
+    def notify_changed(self, video_id: str) -> None:
+        """Wake SSE streams waiting on this video"""
+        self.notifier.notify(video_id)
+
+    def wait_for_change(self, video_id: str, seen: int, timeout: float) -> int:
+        """Wait for a change signal for a video; returns the current version"""
+        return self.notifier.wait(video_id, seen, timeout)
 
     def get_all_statuses(self) -> Dict[str, Dict[str, Any]]:
         """Get all processing statuses"""
-        with self.lock:
-            return dict(self.statuses)  # Return copy
+        now = time.monotonic()
+        return {
+            video_id: status for video_id, status in list(self.statuses.items())
+            if not self._is_expired(video_id, now)
+        }
+
+
+class CoalescingStatusWriter:
+    """
+    Background writer that coalesces chatty progress updates.
+
+    Producers call submit() which only records the latest status per video.
+    A single daemon thread flushes pending statuses to the tracker (and the
+    optional persist callback, e.g. the database) every `interval` seconds,
+    so N progress callbacks cost at most one write per interval.
+
+    tracker may be None when only the persist callback is needed.
+    """
+
+    def __init__(self, tracker, persist=None, interval: float = 0.25):
+        self.tracker = tracker
+        self.persist = persist
+        self.interval = interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        atexit.register(self.close)
+
+    def _ensure_started(self):
+        """Start the writer thread on first use"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                name="status-writer",
+                daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, video_id: str, status_data: Dict[str, Any]) -> None:
+        """Queue a status update; replaces any pending update for the video"""
+        with self._cond:
+            self._pending[video_id] = dict(status_data)
+            self._ensure_started()
+            self._cond.notify()
+
+    def flush(self, video_id: Optional[str] = None) -> None:
+        """
+        Synchronously write pending updates (all, or just one video).
+        Call before writing a terminal status so a late flush can't overwrite it.
+        """
+        with self._write_lock:
+            with self._cond:
+                if video_id is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    data = self._pending.pop(video_id, None)
+                    batch = {video_id: data} if data is not None else {}
+            self._write(batch)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Stop the writer thread and write whatever is still pending.
+        A later submit() starts a new thread.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            self._stopping = False
+            if self._thread is thread:
+                self._thread = None
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                # Let further updates accumulate before writing; close() wakes this
+                if self._cond.wait_for(lambda: self._stopping, self.interval):
+                    return
+            self.flush()
+
+    def _write(self, batch: Dict[str, Dict[str, Any]]) -> None:
+        for video_id, status_data in batch.items():
+            if self.tracker is not None:
+                self.tracker.update_status(video_id, status_data)
+            if self.persist:
+                try:
+                    self.persist(video_id, status_data)
+                except Exception as e:
+                    logger.error(f"Status persist failed for {video_id}: {e}")
+            # Signal only once both stores are written, so readers see the update
+            if self.tracker is not None:
+                self.tracker.notify_changed(video_id)
 
 
 def create_status_tracker():
@@ -239,13 +501,7 @@ def create_status_tracker():
     if REDIS_AVAILABLE and redis_url:
         try:
             # Try to connect to Redis
-            redis_client = redis.from_url(
-                redis_url,
-                decode_responses=False,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True
-            )
+            redis_client = get_redis_client(redis_url)
 
             # Test connection
             redis_client.ping()
@@ -4,13 +4,44 @@ Handles video upload and retrieval from Cloudflare R2
 """
 
 import os
+import threading
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from pathlib import Path
 from src.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Multipart upload: 8 MB parts sent 8 at a time, read straight from disk
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=int(os.getenv('R2_UPLOAD_CONCURRENCY', 8)),
+    use_threads=True
+)
+
+
+class _UploadProgress:
+    """boto3 transfer callback (called from upload threads) -> whole-percent progress messages"""
+
+    def __init__(self, total_bytes, progress_callback):
+        self.total_bytes = total_bytes
+        self.progress_callback = progress_callback
+        self._sent = 0
+        self._last_percent = -1
+        self._lock = threading.Lock()
+
+    def __call__(self, bytes_sent):
+        with self._lock:
+            self._sent += bytes_sent
+            percent = int(self._sent * 100 / self.total_bytes) if self.total_bytes else 100
+            if percent == self._last_percent:
+                return
+            self._last_percent = percent
+        total_mb = self.total_bytes // (1024 * 1024)
+        self.progress_callback(f"Uploading... {percent}% ({self._sent // (1024 * 1024)}MB/{total_mb}MB)")
+
 
 class R2Storage:
     def __init__(self):
@@ -63,17 +94,18 @@ class R2Storage:
         s3_key = f"videos/{video_id}_georgian.mp4"
 
         try:
-            # Upload file
-            with open(local_path, 'rb') as f:
-                self.s3_client.upload_fileobj(
-                    f,
-                    self.bucket_name,
-                    s3_key,
-                    ExtraArgs={
-                        'ContentType': 'video/mp4',
-                        'CacheControl': 'public, max-age=31536000',  # Cache for 1 year
-                    }
-                )
+            # Upload file (multipart, parts uploaded concurrently)
+            self.s3_client.upload_file(
+                str(file_path),
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={
+                    'ContentType': 'video/mp4',
+                    'CacheControl': 'public, max-age=31536000',  # Cache for 1 year
+                },
+                Config=UPLOAD_TRANSFER_CONFIG,
+                Callback=_UploadProgress(file_path.stat().st_size, progress_callback) if progress_callback else None
+            )
 
             if progress_callback:
                 progress_callback(f"Video uploaded successfully!")
@@ -104,3 +136,30 @@ class R2Storage:
             # Log error properly instead of bare except
             logger.error("r2_upload_error", error=str(e), exc_info=True)
             return None
+
+    def presign_get(self, filename, expires=3600):
+        """
+        Get a pre-signed download URL for an output file
+
+        Args:
+            filename: Output filename (e.g. '<video_id>_georgian.mp4')
+            expires: URL lifetime in seconds
+
+        Signing is local; the object isn't checked, so callers should only
+        ask for files that were uploaded (a missing key is R2's 404).
+
+        Returns:
+            Signed URL
+        """
+        s3_key = f"videos/{filename}"
+
+        # Signing is local (no request to R2)
+        return self.s3_client.generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': self.bucket_name,
+                'Key': s3_key,
+                'ResponseContentDisposition': f'attachment; filename="{filename}"',
+            },
+            ExpiresIn=expires
+        )
@@ -3,7 +3,7 @@ Celery Tasks
 Background tasks for video processing
 """
 
-import os
+import re
 import traceback
 from celery import Task
 from celery_app import celery_app
@@ -19,12 +19,23 @@ from src.video_processor import VideoProcessor
 from src.database import Database, Video
 from src.storage import R2Storage
 from src.config import Config
+from src.status_tracker import CoalescingStatusWriter, status_tracker
+from src.checkpoints import StageCheckpoints
 from src.logging_config import get_logger
 from src.gender_detector import detect_speaker_genders
 
 load_dotenv()
 logger = get_logger(__name__)
 
+# Stateless, so one mixer (volumes from Config) serves every task
+audio_mixer = AudioMixer(
+    original_volume=Config.ORIGINAL_AUDIO_VOLUME,
+    voiceover_volume=Config.VOICEOVER_VOLUME
+)
+
+# Download percentage in messages like "Downloading... 22.2% (3MB/13MB)"
+DOWNLOAD_PERCENT_PATTERN = re.compile(r'(\d+\.?\d*)%')
+
 
 class CallbackTask(Task):
     """Base task with state callback support"""
@@ -33,6 +44,7 @@ class CallbackTask(Task):
         super().__init__()
         self._db = None
         self._storage = None
+        self._progress_writer = None
 
     @property
     def db(self):
@@ -41,6 +53,20 @@ class CallbackTask(Task):
             logger.info("Celery task initialized database connection")
         return self._db
 
+    @property
+    def progress_writer(self):
+        """Coalesces progress callbacks into one state/DB write per interval"""
+        if self._progress_writer is None:
+            self._progress_writer = CoalescingStatusWriter(None, persist=self._persist_progress)
+        return self._progress_writer
+
+    def _persist_progress(self, video_id, status_data):
+        """Write a coalesced progress update (runs on the writer thread)"""
+        # IMPORTANT: The frontend reads progress from the database
+        # (nothing reads Celery task state, so it isn't written to the result backend)
+        self.db.update_video_progress(video_id, status_data['status'], status_data['progress'])
+        status_tracker.notify_changed(video_id)
+
     @property
     def storage(self):
         if self._storage is None:
@@ -51,7 +77,8 @@ class CallbackTask(Task):
         return self._storage
 
 
-@celery_app.task(bind=True, base=CallbackTask, max_retries=1)  # Only 1 retry to prevent quota waste
+# Outcome and progress are stored in the database, so no Celery result is kept
+@celery_app.task(bind=True, base=CallbackTask, max_retries=1, ignore_result=True)  # Only 1 retry to prevent quota waste
 def process_video_task(self, video_id, youtube_url, user_id=None):
     """
     Celery task for processing video with Georgian voiceover
@@ -66,25 +93,12 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
     """
 
     def update_progress(message, progress=None):
-        """Update task progress - now updates database too!"""
-        # Update Celery state
-        self.update_state(
-            state='PROGRESS',
-            meta={
-                'status': message,
-                'progress': progress or 0,
-                'video_id': video_id
-            }
-        )
-
-        # IMPORTANT: Also update database so frontend can see progress
-        # Use direct database update to ensure it's committed
-        try:
-            # Use the database's own method to ensure proper session handling
-            self.db.update_video_progress(video_id, message, progress or 0)
-            logger.debug(f"Database updated: video_id={video_id}, progress={progress}, message={message[:50]}...")
-        except Exception as db_error:
-            logger.error(f"Database update FAILED: video_id={video_id}, error={str(db_error)}", exc_info=True)
+        """Update task progress (database, coalesced per interval)"""
+        # Only the latest update per interval is written; failures are logged by the writer
+        self.progress_writer.submit(video_id, {
+            'status': message,
+            'progress': progress or 0
+        })
 
         # Log for debugging
         logger.info("task_progress", video_id=video_id, status=message, progress=progress or 0)
@@ -101,28 +115,22 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
 
     try:
         # First, ensure video exists in database
-        session = self.db.get_session()
-        video = session.query(Video).filter_by(video_id=video_id).first()
-        if not video:
-            # Create the video record if it doesn't exist
-            video = Video(
-                video_id=video_id,
-                title="Processing...",
-                original_url=youtube_url,
-                processing_status='processing',
-                progress=0,
-                status_message="Initializing..."
-            )
-            session.add(video)
-            session.commit()
-            logger.info(f"Created video record for {video_id}")
-        self.db.close_session(session)
+        with self.db.session_scope() as session:
+            if session.query(Video.id).filter_by(video_id=video_id).first() is None:
+                # Create the video record if it doesn't exist
+                session.add(Video(
+                    video_id=video_id,
+                    title="Processing...",
+                    original_url=youtube_url,
+                    processing_status='processing',
+                    progress=0,
+                    status_message="Initializing..."
+                ))
+                logger.info(f"Created video record for {video_id}")
 
         # Configuration
-        output_dir = os.getenv('OUTPUT_DIR', 'output')
-        temp_dir = os.getenv('TEMP_DIR', 'temp')
-        original_volume = float(os.getenv('ORIGINAL_AUDIO_VOLUME', 0.05))
-        voiceover_volume = float(os.getenv('VOICEOVER_VOLUME', 1.0))
+        output_dir = Config.OUTPUT_DIR
+        temp_dir = Config.TEMP_DIR
 
         # Check if R2 storage is configured
         use_r2 = self.storage is not None
@@ -132,19 +140,71 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
         transcriber = Transcriber()
         translator = Translator()
         tts = get_tts_provider()  # Uses Gemini TTS
-        mixer = AudioMixer(
-            original_volume=original_volume,
-            voiceover_volume=voiceover_volume
-        )
+        mixer = audio_mixer
         processor = VideoProcessor(output_dir=output_dir)
 
+        # Finished stages are checkpointed, so a retry resumes where it failed
+        checkpoints = StageCheckpoints(temp_dir, video_id, youtube_url)
+        output_filename = f"{video_id}_georgian.mp4"
+
+        def finish(final_video_path, video_title, video_duration_minutes):
+            """Step 7: upload (95-99%), mark completed, charge the user"""
+            r2_url = None
+            if use_r2 and self.storage:
+                update_progress("[CLOUD] Uploading video to cloud storage...", 96)
+                r2_url = self.storage.upload_video(
+                    final_video_path,
+                    video_id,
+                    progress_callback=lambda msg: update_progress(f"[CLOUD] {msg}", 98)
+                )
+                update_progress("[OK] Upload complete! Video ready to watch", 99)
+            else:
+                # Use local file path
+                r2_url = f"/download/{output_filename}"
+                update_progress("[OK] Video saved locally and ready for download", 99)
+
+            # Update database
+            update_progress("🎉 Processing complete! Your Georgian voiceover is ready!", 100)
+            self.progress_writer.flush(video_id)
+            self.db.update_video_status(video_id, 'completed', r2_url=r2_url)
+            status_tracker.notify_changed(video_id)
+
+            # Charge user for minutes used
+            if user_id and video_duration_minutes > 0:
+                try:
+                    self.db.record_user_video(user_id, video_id, video_duration_minutes)
+                    logger.info(f"Charged user {user_id}: {video_duration_minutes:.2f} minutes for video {video_id}")
+                except Exception as charge_err:
+                    logger.error(f"Failed to charge user {user_id}: {charge_err}")
+
+            # Temp files and checkpoints are no longer needed
+            try:
+                downloader.cleanup(video_id)
+                checkpoints.clear()
+            except Exception as cleanup_exc:
+                logger.warning("temp_cleanup_failed", video_id=video_id, error=str(cleanup_exc))
+
+            return {
+                'status': 'completed',
+                'video_id': video_id,
+                'r2_url': r2_url,
+                'title': video_title,
+                'progress': 100,
+                'minutes_charged': video_duration_minutes
+            }
+
+        # Encoded on a previous attempt (e.g. the upload failed): just upload
+        encoded = checkpoints.load('encode', file_fields=('video_path',))
+        if encoded:
+            update_progress("[OK] Reusing video encoded by the previous attempt", 95)
+            return finish(encoded['video_path'], encoded['title'], encoded['duration_minutes'])
+
         # Step 1: Download video (0-20%)
         update_progress("🚀 Initializing video download...", 1)
 
         def download_progress_callback(msg):
             # Parse download percentage from message like "Downloading... 22.2% (3MB/13MB)"
-            import re
-            percent_match = re.search(r'(\d+\.?\d*)%', msg)
+            percent_match = DOWNLOAD_PERCENT_PATTERN.search(msg)
             if percent_match:
                 download_percent = float(percent_match.group(1))
                 # Map 0-100% download to 2-19% overall progress
@@ -154,10 +214,14 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
                 update_progress(f"📥 {msg}", 5)
 
         try:
-            video_info = downloader.download_video(
-                youtube_url,
-                progress_callback=download_progress_callback
-            )
+            # Fully downloaded on a previous attempt (checkpointed below)
+            video_info = checkpoints.load('download', file_fields=('video_path', 'audio_path'))
+            video_restored = video_info is not None
+            if not video_restored:
+                video_info = downloader.download_video(
+                    youtube_url,
+                    progress_callback=download_progress_callback
+                )
             video_title = video_info['title']
             video_duration_minutes = video_info.get('duration', 0) / 60  # Convert seconds to minutes
             update_progress(f"[OK] Video downloaded: {video_title}", 20)
@@ -167,62 +231,62 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
             raise
 
         # Update database with title
-        self.db.update_video_status(video_id, 'processing')
-        session = self.db.get_session()
-        video = session.query(Video).filter_by(video_id=video_id).first()
-        if video:
-            video.title = video_title
-            session.commit()
-        self.db.close_session(session)
+        self.db.update_video_status(video_id, 'processing', title=video_title)
 
         # Step 2: Transcribe audio (20-35%)
-        update_progress("🎵 Extracting audio from video...", 21)
-        logger.info(f"Starting transcription for {video_id}")
-
-        update_progress("🎤 Starting speech recognition...", 23)
-        try:
-            segments = transcriber.transcribe(
-                video_info['audio_path'],
-                progress_callback=lambda msg: update_progress(f"🎤 {msg}", 28)
-            )
+        transcript = checkpoints.load('transcription')
+        if transcript:
+            segments, speakers = transcript['segments'], transcript['speakers']
+            update_progress(f"[OK] Reusing transcription ({len(segments)} segments)", 35)
+        else:
+            update_progress("🎵 Extracting audio from video...", 21)
+            logger.info(f"Starting transcription for {video_id}")
 
-            # Check if we have speaker diarization
-            speakers = None
-            if transcriber.has_speaker_diarization():
-                speakers = transcriber.get_speakers()
-                update_progress(f"[OK] Transcribed with {len(speakers)} speakers detected", 33)
-                logger.info(f"Speaker diarization: {len(speakers)} speakers detected")
-
-                # Apply pitch-based gender detection if gender is unknown
-                if speakers and any(s.get('gender') == 'unknown' for s in speakers):
-                    try:
-                        update_progress("🎵 Detecting speaker genders from voice pitch...", 31)
-                        logger.info("Applying pitch-based gender detection for unknown genders")
-                        speakers = detect_speaker_genders(
-                            video_info['audio_path'],
-                            segments,
-                            speakers
-                        )
-                        # Log detected genders
-                        for speaker in speakers:
-                            gender = speaker.get('gender', 'unknown')
-                            speaker_label = speaker.get('label', speaker.get('id'))
-                            logger.info(f"Gender detection: {speaker_label} -> {gender}")
-                        update_progress(f"[OK] Detected genders for {len(speakers)} speakers", 33)
-                    except Exception as gender_error:
-                        logger.warning(f"Gender detection failed: {gender_error}")
-                        # Continue without gender detection
-            else:
-                segments = transcriber.merge_short_segments(segments)
+            update_progress("🎤 Starting speech recognition...", 23)
+            try:
+                segments = transcriber.transcribe(
+                    video_info['audio_path'],
+                    progress_callback=lambda msg: update_progress(f"🎤 {msg}", 28)
+                )
+
+                # Check if we have speaker diarization
+                speakers = None
+                if transcriber.has_speaker_diarization():
+                    speakers = transcriber.get_speakers()
+                    update_progress(f"[OK] Transcribed with {len(speakers)} speakers detected", 33)
+                    logger.info(f"Speaker diarization: {len(speakers)} speakers detected")
+
+                    # Apply pitch-based gender detection if gender is unknown
+                    if speakers and any(s.get('gender') == 'unknown' for s in speakers):
+                        try:
+                            update_progress("🎵 Detecting speaker genders from voice pitch...", 31)
+                            logger.info("Applying pitch-based gender detection for unknown genders")
+                            speakers = detect_speaker_genders(
+                                video_info['audio_path'],
+                                segments,
+                                speakers
+                            )
+                            # Log detected genders
+                            for speaker in speakers:
+                                gender = speaker.get('gender', 'unknown')
+                                speaker_label = speaker.get('label', speaker.get('id'))
+                                logger.info(f"Gender detection: {speaker_label} -> {gender}")
+                            update_progress(f"[OK] Detected genders for {len(speakers)} speakers", 33)
+                        except Exception as gender_error:
+                            logger.warning(f"Gender detection failed: {gender_error}")
+                            # Continue without gender detection
+                else:
+                    segments = transcriber.merge_short_segments(segments)
 
-            update_progress(f"[OK] Transcribed speech into {len(segments)} segments", 35)
-            logger.info(f"Transcription complete for {video_id}: {len(segments)} segments")
-        except Exception as e:
-            logger.error(f"Transcription failed for {video_id}: {str(e)}", exc_info=True)
-            update_progress(f"[ERROR] Transcription failed: {str(e)}", 35)
-            raise
+                update_progress(f"[OK] Transcribed speech into {len(segments)} segments", 35)
+                logger.info(f"Transcription complete for {video_id}: {len(segments)} segments")
+            except Exception as e:
+                logger.error(f"Transcription failed for {video_id}: {str(e)}", exc_info=True)
+                update_progress(f"[ERROR] Transcription failed: {str(e)}", 35)
+                raise
+            checkpoints.save('transcription', {'segments': segments, 'speakers': speakers})
 
-        # Step 3: Translate to Georgian (35-50%)
+        # Step 3+4: Translate to Georgian and generate voiceover (35-70%)
         update_progress("🌐 Starting translation to Georgian...", 36)
         total_segments = len(segments)
         def translation_progress(message):
@@ -233,17 +297,21 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
                 # If translator sends idx, total, text - handle it
                 update_progress(f"🌐 {message}", 40)
 
-        # Pass speaker information if available for context-aware translation
-        translated_segments = translator.translate_segments(
-            segments,
-            progress_callback=translation_progress,
-            speakers=speakers  # Pass speaker info for context-aware translation
-        )
-        update_progress(f"[OK] Translated all {len(translated_segments)} segments to Georgian", 50)
-
-        # Step 4: Generate Georgian voiceover (50-70%)
         # Check if we have multiple speakers for multi-voice synthesis
         if speakers and len(speakers) > 1:
+            # Voice assignment needs the full translation, so translate up front
+            saved_translation = checkpoints.load('translation')
+            if saved_translation:
+                translated_segments = saved_translation['segments']
+            else:
+                translated_segments = translator.translate_segments(
+                    segments,
+                    progress_callback=translation_progress,
+                    speakers=speakers  # Pass speaker info for context-aware translation
+                )
+                checkpoints.save('translation', {'segments': translated_segments})
+            update_progress(f"[OK] Translated all {len(translated_segments)} segments to Georgian", 50)
+
             update_progress(f"🎙️ Starting multi-voice synthesis for {len(speakers)} speakers...", 51)
 
             # Initialize voice manager
@@ -282,17 +350,35 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
                 progress_callback=tts_progress
             )
         else:
-            # Single speaker or no speaker info - use default voice
-            update_progress("🎙️ Starting Georgian voice synthesis...", 51)
-
+            # Single speaker or no speaker info - use default voice.
+            # Stream translated chunks into TTS so synthesis runs while
+            # later chunks are still being translated.
             def tts_progress(message):
                 if isinstance(message, str):
                     update_progress(f"🎙️ {message}", 60)
                 else:
                     update_progress(f"🎙️ {message}", 60)
 
-            voiceover_segments = tts.generate_voiceover(
-                translated_segments,
+            translated_segments = []
+            saved_translation = checkpoints.load('translation')
+
+            def translated_chunks():
+                if saved_translation:
+                    translated_segments.extend(saved_translation['segments'])
+                    yield saved_translation['segments']
+                    return
+
+                for chunk in translator.translate_stream(
+                    segments,
+                    progress_callback=translation_progress,
+                    speakers=speakers
+                ):
+                    translated_segments.extend(chunk)
+                    yield chunk
+                checkpoints.save('translation', {'segments': translated_segments})
+
+            voiceover_segments = tts.synthesize_stream(
+                translated_chunks(),
                 temp_dir=temp_dir,
                 progress_callback=tts_progress
             )
@@ -332,7 +418,7 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
                         'end': seg.get('end', 0),
                         'speaker': seg.get('speaker', 'unknown'),
                         'audio_duration': seg.get('audio_duration', 0),
-                        'audio_path': seg.get('audio_path', '')
+                        'audio_bytes': len(seg.get('audio_pcm') or b'')
                     }
                     for i, seg in enumerate(voiceover_segments)
                 ],
@@ -349,72 +435,34 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
         except Exception as e:
             logger.error(f"Failed to save debug data: {e}")
 
-        # Step 5: Mix audio (70-85%)
-        update_progress("🎛️ Mixing original audio with Georgian voiceover...", 72)
-        mixed_audio_path = os.path.join(temp_dir, f"{video_id}_mixed.wav")
-        mixer.mix_audio(
-            video_info['audio_path'],
-            voiceover_segments,
-            mixed_audio_path,
-            progress_callback=lambda msg: update_progress(f"🎛️ {msg}", 80)
-        )
-        update_progress("[OK] Audio tracks mixed successfully", 85)
-
-        # Step 6: Combine with video (85-95%)
+        # Step 5+6: Mix audio and combine with video in one ffmpeg pass (70-95%)
         # IMPORTANT: Wait for background video download to complete before combining
-        update_progress("🎬 Preparing video for encoding...", 86)
+        update_progress("🎬 Preparing video for encoding...", 72)
         try:
-            downloader.wait_for_video_download(timeout=600)  # Wait up to 10 minutes
-            update_progress("🎬 Video download complete, encoding...", 87)
+            if not video_restored:
+                downloader.wait_for_video_download(timeout=600)  # Wait up to 10 minutes
+                checkpoints.save('download', video_info)
+            update_progress("🎬 Video download complete, mixing and encoding...", 75)
         except Exception as video_wait_error:
             logger.error(f"Video download failed: {video_wait_error}")
             raise Exception(f"Video download failed: {video_wait_error}")
 
-        update_progress("🎬 Encoding final video with Georgian audio...", 88)
-        output_filename = f"{video_id}_georgian.mp4"
-        final_video_path = processor.combine_video_audio(
+        update_progress("🎛️ Mixing Georgian voiceover and encoding final video...", 78)
+        final_video_path = mixer.mix_and_mux(
             video_info['video_path'],
-            mixed_audio_path,
-            output_filename,
-            progress_callback=lambda msg: update_progress(f"🎬 {msg}", 92)
+            video_info['audio_path'],
+            voiceover_segments,
+            processor.output_dir / output_filename,
+            progress_callback=lambda msg: update_progress(f"🎛️ {msg}", 85)
         )
-        update_progress("[OK] Video encoding complete", 95)
-
-        # Step 7: Upload to R2 if configured (95-99%)
-        r2_url = None
-        if use_r2 and self.storage:
-            update_progress("[CLOUD] Uploading video to cloud storage...", 96)
-            r2_url = self.storage.upload_video(
-                final_video_path,
-                video_id,
-                progress_callback=lambda msg: update_progress(f"[CLOUD] {msg}", 98)
-            )
-            update_progress("[OK] Upload complete! Video ready to watch", 99)
-        else:
-            # Use local file path
-            r2_url = f"/download/{output_filename}"
-            update_progress("[OK] Video saved locally and ready for download", 99)
-
-        # Update database
-        update_progress("🎉 Processing complete! Your Georgian voiceover is ready!", 100)
-        self.db.update_video_status(video_id, 'completed', r2_url=r2_url)
-
-        # Charge user for minutes used
-        if user_id and video_duration_minutes > 0:
-            try:
-                self.db.record_user_video(user_id, video_id, video_duration_minutes)
-                logger.info(f"Charged user {user_id}: {video_duration_minutes:.2f} minutes for video {video_id}")
-            except Exception as charge_err:
-                logger.error(f"Failed to charge user {user_id}: {charge_err}")
-
-        return {
-            'status': 'completed',
-            'video_id': video_id,
-            'r2_url': r2_url,
+        update_progress("[OK] Audio mixed and video encoding complete", 95)
+        checkpoints.save('encode', {
+            'video_path': str(final_video_path),
             'title': video_title,
-            'progress': 100,
-            'minutes_charged': video_duration_minutes
-        }
+            'duration_minutes': video_duration_minutes
+        })
+
+        return finish(final_video_path, video_title, video_duration_minutes)
 
     except Exception as exc:
         # Log error
@@ -424,8 +472,10 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
         # Truncate error message for database (in case column limit)
         error_msg_truncated = error_msg[:900] + '...' if len(error_msg) > 900 else error_msg
 
-        # Update database
+        # Update database (flush first so a late progress write can't follow it)
+        self.progress_writer.flush(video_id)
         self.db.update_video_status(video_id, 'failed', error_message=error_msg_truncated)
+        status_tracker.notify_changed(video_id)
 
         # Smart retry logic: Only retry on transient errors
         # Do NOT retry on permanent failures that waste API quota
@@ -459,11 +509,7 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
         if not is_non_retriable and self.request.retries < self.max_retries:
             # Only retry on transient errors (network issues, timeouts, etc.)
             logger.info("task_retry", video_id=video_id, retry_count=self.request.retries + 1, reason="transient_error")
-            # Cleanup before retry
-            try:
-                downloader.cleanup(video_id)
-            except Exception:
-                pass
+            # Keep temp files and checkpoints: the retry resumes from them
             raise self.retry(exc=exc, countdown=60)
         else:
             if is_non_retriable:
@@ -473,6 +519,7 @@ def process_video_task(self, video_id, youtube_url, user_id=None):
 
             # Cleanup on final failure
             try:
+                StageCheckpoints(Config.TEMP_DIR, video_id).clear()
                 downloader.cleanup(video_id)
                 logger.info("temp_cleanup", video_id=video_id, status="success")
             except Exception as cleanup_exc:
@@ -1,29 +1,77 @@
 """
 Speech Transcription Module - Uses Local Whisper
-Provides accurate transcription using local Whisper (free, no API key needed)
+Provides accurate transcription using local Whisper (free, no API key needed).
+Prefers faster-whisper (CTranslate2, int8, batched) and falls back to openai-whisper.
 """
 
-from src.local_whisper_transcriber import LocalWhisperTranscriber
+import os
+import threading
+from src.audio_utils import remove_silence, restore_timestamps
 from src.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+# The Whisper model is loaded once per process and shared by every job
+# (loading takes seconds and hundreds of MB). Transcriber instances stay
+# cheap and only hold per-job state.
+_backend = None
+_backend_provider = None
+_backend_lock = threading.Lock()
+# One transcription at a time per model; it's CPU-bound and already
+# uses all cores, so concurrent calls would only compete for them
+_transcribe_lock = threading.Lock()
+
+
+def _load_backend(model_size):
+    """Load faster-whisper, falling back to openai-whisper"""
+    try:
+        from src.faster_whisper_transcriber import FasterWhisperTranscriber
+        backend = FasterWhisperTranscriber(
+            model_size=model_size,
+            batch_size=int(os.getenv('WHISPER_BATCH_SIZE', 8))
+        )
+        logger.info(f"Transcriber initialized with faster-whisper ({model_size} model)")
+        return backend, 'faster_whisper'
+    except Exception as e:
+        logger.warning(f"faster-whisper unavailable, falling back to openai-whisper: {e}")
+
+    try:
+        from src.local_whisper_transcriber import LocalWhisperTranscriber
+        backend = LocalWhisperTranscriber(model_size=model_size)
+        logger.info(f"Transcriber initialized with Local Whisper ({model_size} model)")
+        return backend, 'local_whisper'
+    except Exception as e:
+        logger.error(f"Failed to initialize Local Whisper transcriber: {e}")
+        raise ValueError(f"Local Whisper initialization failed: {e}")
+
+
+def get_backend():
+    """Get the shared Whisper backend, loading it on first use"""
+    global _backend, _backend_provider
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                # Use "base" model for good balance of speed/accuracy
+                # Options: "tiny", "base", "small", "medium", "large"
+                _backend, _backend_provider = _load_backend(os.getenv('WHISPER_MODEL', 'base'))
+
+    return _backend, _backend_provider
+
+
 class Transcriber:
     """Main transcriber using Local Whisper"""
 
     def __init__(self):
-        """Initialize Local Whisper transcriber"""
-        try:
-            # Use "base" model for good balance of speed/accuracy
-            # Options: "tiny", "base", "small", "medium", "large"
-            self.transcriber = LocalWhisperTranscriber(model_size="base")
-            self.provider = 'local_whisper'
-            self.speakers = []
-            logger.info("Transcriber initialized with Local Whisper (base model)")
-        except Exception as e:
-            logger.error(f"Failed to initialize Local Whisper transcriber: {e}")
-            raise ValueError(f"Local Whisper initialization failed: {e}")
+        """Attach to the shared Whisper backend (faster-whisper or openai-whisper)"""
+        self.transcriber, self.provider = get_backend()
+        self.speakers = []
+        # faster-whisper runs its own VAD, no need to trim beforehand
+        self.trim_silence = (
+            self.provider == 'local_whisper'
+            and os.getenv('TRIM_SILENCE', 'true').lower() == 'true'
+        )
 
     def transcribe(self, audio_path, progress_callback=None):
         """
@@ -36,16 +84,27 @@ class Transcriber:
         Returns:
             List of segments with timestamps and text
         """
-        # Use Local Whisper transcription
-        segments = self.transcriber.transcribe(
-            audio_path,
-            progress_callback
-        )
+        # Drop long silences so Whisper only spends time on speech
+        compact_path, offsets = remove_silence(audio_path) if self.trim_silence else (audio_path, None)
+
+        try:
+            # Use Local Whisper transcription
+            with _transcribe_lock:
+                segments = self.transcriber.transcribe(
+                    compact_path,
+                    progress_callback
+                )
+        finally:
+            if compact_path != audio_path and os.path.exists(compact_path):
+                os.remove(compact_path)
+
+        # Map timestamps back onto the original audio timeline
+        segments = restore_timestamps(segments, offsets)
 
         # Get speaker info
         self.speakers = self.transcriber.get_speakers()
 
-        logger.info(f"Local Whisper transcription complete: {len(segments)} segments")
+        logger.info(f"{self.provider} transcription complete: {len(segments)} segments")
 
         return segments
 
@@ -5,12 +5,136 @@ Supports both segment-level and paragraph-level translation modes
 """
 
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from src.config import Config
 from src.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Rare separator (SYMBOL FOR RECORD SEPARATOR) used to pack several texts
+# into one translation request
+BATCH_SEPARATOR = "\n\u241E\n"
+BATCH_MAX_SEGMENTS = 50
+BATCH_MAX_CHARS = 4000
+
+# Translation requests are pure network waits; run this many at once
+# (kept low for the Gemini free tier's requests-per-minute limit)
+TRANSLATION_MAX_CONCURRENT = int(os.getenv('TRANSLATION_MAX_CONCURRENT', 4))
+
+# Process-wide cap on in-flight translation requests. map_ordered() pools are
+# per call (and nest inside translate_stream), so every API request takes a
+# slot here; concurrent jobs and nested pools can't multiply the load.
+TRANSLATION_SEMAPHORE = threading.BoundedSemaphore(TRANSLATION_MAX_CONCURRENT)
+
+# Minimum spacing between per-text fallback requests (after a batch response
+# fails to split); 4s keeps a whole fallback batch within 15 requests/minute
+TRANSLATION_FALLBACK_INTERVAL = float(os.getenv('TRANSLATION_FALLBACK_INTERVAL', 4.0))
+
+_fallback_lock = threading.Lock()
+_fallback_next = 0.0
+
+
+def chunk_texts(texts, max_items=BATCH_MAX_SEGMENTS, max_chars=BATCH_MAX_CHARS):
+    """
+    Split texts into consecutive batches bounded by count and total characters
+
+    Yields:
+        Lists of texts; a single oversized text gets a batch of its own
+    """
+    batch = []
+    size = 0
+    for text in texts:
+        if batch and (len(batch) >= max_items or size + len(text) > max_chars):
+            yield batch
+            batch = []
+            size = 0
+        batch.append(text)
+        size += len(text)
+    if batch:
+        yield batch
+
+
+def chunk_segments(segments, max_items=BATCH_MAX_SEGMENTS, max_chars=BATCH_MAX_CHARS):
+    """
+    Split segments along the same boundaries chunk_texts() uses for their texts
+
+    Yields:
+        Consecutive slices of segments, each one translation request
+    """
+    start = 0
+    for batch in chunk_texts([seg['text'] for seg in segments], max_items, max_chars):
+        yield segments[start:start + len(batch)]
+        start += len(batch)
+
+
+def pace_fallback_request():
+    """
+    Wait for this process's next per-text fallback slot
+
+    A batch whose response doesn't split falls back to one request per text,
+    which would otherwise burst up to BATCH_MAX_SEGMENTS requests at the API.
+    """
+    global _fallback_next
+
+    with _fallback_lock:
+        now = time.monotonic()
+        wait = _fallback_next - now
+        _fallback_next = max(now, _fallback_next) + TRANSLATION_FALLBACK_INTERVAL
+    if wait > 0:
+        time.sleep(wait)
+
+
+def map_ordered(func, items, max_workers=None):
+    """
+    Apply func to each item on a small thread pool, yielding results in order
+
+    items is consumed lazily and at most max_workers calls are in flight, so
+    a slow consumer (e.g. TTS reading translate_stream) bounds the look-ahead.
+    This only bounds look-ahead; API concurrency is capped process-wide by
+    TRANSLATION_SEMAPHORE.
+
+    Args:
+        func: Callable taking one item
+        items: Iterable of items
+        max_workers: Concurrent calls (default: TRANSLATION_MAX_CONCURRENT)
+
+    Yields:
+        func(item) for each item, in input order
+    """
+    max_workers = max_workers or TRANSLATION_MAX_CONCURRENT
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translate')
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # On error or early exit, don't start requests nobody will read
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def split_batch(response_text: str) -> List[str]:
+    """Split a packed translation response back into individual texts"""
+    parts = [part.strip() for part in response_text.split(BATCH_SEPARATOR.strip())]
+    # Models sometimes add a leading/trailing separator
+    while parts and not parts[0]:
+        parts.pop(0)
+    while parts and not parts[-1]:
+        parts.pop()
+    return parts
+
 
 class Translator:
     def __init__(self, use_paragraph_mode: bool = True):
@@ -80,16 +204,56 @@ class Translator:
             return self.backend.translate_segments(segments, progress_callback)
 
         # Use paragraph mode if available and segments have speaker info
-        if self.use_paragraph_mode and self.context_translator:
-            has_speakers = any('speaker' in seg for seg in segments) or speakers is not None
-            if has_speakers:
-                logger.info("Using context-aware paragraph translation mode")
-                return self._translate_with_context(segments, speakers, progress_callback)
+        if self._uses_context_mode(segments, speakers):
+            logger.info("Using context-aware paragraph translation mode")
+            return self._translate_with_context(segments, speakers, progress_callback)
 
         # Fall back to original segment-based translation
         logger.info("Using segment-based translation mode")
         return self._translate_segment_mode(segments, progress_callback)
 
+    def _uses_context_mode(self, segments, speakers=None) -> bool:
+        """Whether translate_segments() would take the context-aware paragraph path"""
+        if self.backend or not (self.use_paragraph_mode and self.context_translator):
+            return False
+        return any('speaker' in seg for seg in segments) or speakers is not None
+
+    def translate_stream(self, segments, progress_callback=None, speakers=None):
+        """
+        Translate segments in chunks, yielding each chunk as soon as it is ready
+
+        Lets TTS start on the first chunk while later chunks are still being
+        translated instead of waiting for the whole transcript. Chunks follow
+        the batch limits (BATCH_MAX_SEGMENTS / BATCH_MAX_CHARS), so each chunk
+        is exactly one translation request.
+
+        Context-aware paragraph mode needs the whole conversation to keep its
+        cross-sentence context, so it is translated in one piece and not streamed.
+
+        Args:
+            segments: List of segments with 'text', 'start', 'end'
+            progress_callback: Optional callback for progress updates
+            speakers: Optional speaker information for context-aware translation
+
+        Yields:
+            Lists of translated segments, in original order
+        """
+        if self._uses_context_mode(segments, speakers):
+            yield self.translate_segments(segments, progress_callback, speakers)
+            return
+
+        total = len(segments)
+        done = 0
+
+        # The next few chunks are translated while the caller works on this one
+        chunks = chunk_segments(segments)
+        for translated in map_ordered(lambda chunk: self.translate_segments(chunk, speakers=speakers), chunks):
+            yield translated
+            done += len(translated)
+
+            if progress_callback:
+                progress_callback(f"Translated {min(done, total)}/{total} segments")
+
     def _translate_with_context(
         self,
         segments: List[Dict],
@@ -129,7 +293,7 @@ class Translator:
 
     def _translate_segment_mode(self, segments, progress_callback=None):
         """
-        Original segment-based translation (backward compatible)
+        Segment-based translation, packed into batched requests
 
         Args:
             segments: List of segments
@@ -141,20 +305,55 @@ class Translator:
         if progress_callback:
             progress_callback(f"AI translating {len(segments)} segments to Georgian...")
 
-        # Combine all segments into one request for better context
-        full_text = "\n\n".join([f"[{i}] {seg['text']}" for i, seg in enumerate(segments)])
+        translations = []
+        for batch_translations in map_ordered(self.translate_batch, chunk_texts([seg['text'] for seg in segments])):
+            translations.extend(batch_translations)
+
+            if progress_callback:
+                progress_callback(f"Processed {len(translations)}/{len(segments)} translations")
+
+        translated_segments = []
+        for segment, translation in zip(segments, translations):
+            translated_segment = segment.copy()
+            translated_segment['translated_text'] = translation
+            translated_segment['original_text'] = segment['text']
+            translated_segments.append(translated_segment)
 
         if progress_callback:
-            progress_callback("Sending to GPT-4 for context-aware translation...")
+            progress_callback(f"AI translation complete: {len(translated_segments)} segments")
+
+        return translated_segments
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Translate several texts in a single request
+
+        Texts are joined with BATCH_SEPARATOR and split back afterwards.
+        Falls back to one request per text if the response doesn't split
+        into the expected number of parts.
+
+        Args:
+            texts: List of English texts
+
+        Returns:
+            List of Georgian translations, same order and length as texts
+        """
+        if self.backend:
+            return self.backend.translate_batch(texts)
+
+        if len(texts) == 1:
+            return [self._translate_single(texts[0])]
+
+        import openai
 
-        # Use GPT-4 for high-quality translation
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",  # Latest GPT-4 model
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert translator specializing in English to Georgian translation.
+            with TRANSLATION_SEMAPHORE:
+                response = openai.ChatCompletion.create(
+                    model="gpt-4o",  # Latest GPT-4 model
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": f"""You are an expert translator specializing in English to Georgian translation.
 Your translations must be:
 1. Natural and fluent in Georgian, not word-for-word mechanical translations
 2. Contextually appropriate with proper Georgian grammar
@@ -162,68 +361,34 @@ Your translations must be:
 4. Culturally appropriate for Georgian speakers
 5. Maintain the meaning and tone of the original
 
-Translate each numbered segment below into Georgian. Keep the same numbering format [0], [1], etc.
-Do not add any explanations, just provide the translations."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Translate these segments to Georgian:\n\n{full_text}"
-                    }
-                ],
-                temperature=0.3  # Lower temperature for more consistent translations
-            )
-
-            # Parse the response
-            translated_full = response['choices'][0]['message']['content']
-
-            # Split back into segments
-            translated_lines = translated_full.strip().split('\n\n')
-
-            translated_segments = []
-            for i, segment in enumerate(segments):
-                # Find the corresponding translation
-                translation = None
-                for line in translated_lines:
-                    if line.startswith(f"[{i}]"):
-                        translation = line[len(f"[{i}]"):].strip()
-                        break
+The texts are separated by lines containing only the {BATCH_SEPARATOR.strip()} symbol.
+Return exactly {len(texts)} translations in the same order, separated the same way.
+Do not add numbering or explanations, just provide the translations."""
+                        },
+                        {
+                            "role": "user",
+                            "content": BATCH_SEPARATOR.join(texts)
+                        }
+                    ],
+                    temperature=0.3  # Lower temperature for more consistent translations
+                )
 
-                if not translation:
-                    # Fallback: translate individually if batch failed
-                    translation = self._translate_single(segment['text'])
+            translations = split_batch(response['choices'][0]['message']['content'])
+            if len(translations) == len(texts):
+                return translations
 
-                translated_segment = segment.copy()
-                translated_segment['translated_text'] = translation
-                translated_segment['original_text'] = segment['text']
-                translated_segments.append(translated_segment)
-
-                if progress_callback and (i + 1) % 10 == 0:
-                    progress_callback(f"Processed {i + 1}/{len(segments)} translations")
+            logger.warning("batch_translation_mismatch", expected=len(texts), received=len(translations))
 
         except Exception as e:
             # Log the error properly instead of silently ignoring
             logger.error("batch_translation_failed", error=str(e), exc_info=True)
 
-            # Fallback: translate segments individually
-            if progress_callback:
-                progress_callback(f"Batch translation failed, translating individually...")
-
-            translated_segments = []
-            for i, segment in enumerate(segments):
-                translation = self._translate_single(segment['text'])
-
-                translated_segment = segment.copy()
-                translated_segment['translated_text'] = translation
-                translated_segment['original_text'] = segment['text']
-                translated_segments.append(translated_segment)
-
-                if progress_callback and (i + 1) % 5 == 0:
-                    progress_callback(f"Translated {i + 1}/{len(segments)} segments")
-
-        if progress_callback:
-            progress_callback(f"AI translation complete: {len(translated_segments)} segments")
-
-        return translated_segments
+        # Fallback: translate texts individually, paced so it can't burst the quota
+        translations = []
+        for text in texts:
+            pace_fallback_request()
+            translations.append(self._translate_single(text))
+        return translations
 
     def _translate_single(self, text):
         """
@@ -235,24 +400,27 @@ Do not add any explanations, just provide the translations."""
         Returns:
             Translated text
         """
+        import openai
+
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert translator specializing in English to Georgian translation.
+            with TRANSLATION_SEMAPHORE:
+                response = openai.ChatCompletion.create(
+                    model="gpt-4o",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": """You are an expert translator specializing in English to Georgian translation.
 Provide natural, fluent Georgian translations suitable for voiceover narration.
 Use proper Georgian grammar and culturally appropriate expressions.
 Only respond with the translation, no explanations."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Translate to Georgian: {text}"
-                    }
-                ],
-                temperature=0.3
-            )
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Translate to Georgian: {text}"
+                        }
+                    ],
+                    temperature=0.3
+                )
 
             return response['choices'][0]['message']['content'].strip()
 
@@ -6,9 +6,9 @@ No API key required, supports Georgian with male/female voices
 import os
 import asyncio
 import edge_tts
-from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.logging_config import get_logger
+from src.audio_utils import decode_to_pcm, pcm_duration
 
 logger = get_logger(__name__)
 
@@ -40,86 +40,97 @@ class EdgeTTSProvider:
         Args:
             segments: List of segments with 'translated_text', 'start', 'end'
                      Optional: 'speaker' field for multi-voice support
-            temp_dir: Directory for temporary audio files
+            temp_dir: Unused (audio stays in memory); kept for provider compatibility
             progress_callback: Optional callback for progress updates
 
         Returns:
-            List of segments with 'audio_path' added
+            List of segments with 'audio_pcm' added
         """
-        temp_path = Path(temp_dir)
-        temp_path.mkdir(exist_ok=True)
+        return self.synthesize_stream([segments], temp_dir=temp_dir, progress_callback=progress_callback)
 
-        # Filter out segments with empty text
-        valid_segments = []
-        skipped_indices = []
-        for i, seg in enumerate(segments):
-            text = seg.get('translated_text', '').strip()
-            if text:
-                valid_segments.append((i, seg))
-            else:
-                skipped_indices.append(i)
-                logger.warning(f"Skipping segment {i} - empty translated text")
+    def synthesize_stream(self, segment_batches, temp_dir="temp", progress_callback=None):
+        """
+        Generate Georgian voiceover while segments are still arriving.
 
-        if skipped_indices:
-            logger.info(f"Skipped {len(skipped_indices)} segments with empty text")
+        Each segment is submitted to the thread pool as soon as its batch is
+        yielded, so synthesis overlaps with whatever produces the batches
+        (e.g. Translator.translate_stream).
 
-        if progress_callback:
-            progress_callback(f"Generating Georgian voiceover with Edge TTS ({len(valid_segments)} segments)...")
+        Args:
+            segment_batches: Iterable of segment lists with 'translated_text', 'start', 'end'
+            temp_dir: Unused (audio stays in memory); kept for provider compatibility
+            progress_callback: Optional callback for progress updates
 
-        if not valid_segments:
-            logger.warning("No valid segments to process")
-            return []
+        Returns:
+            List of segments with 'audio_pcm' added, in original order
+        """
+        if progress_callback:
+            progress_callback("Generating Georgian voiceover with Edge TTS...")
 
-        # Process segments in parallel using thread pool
         results = {}
+        futures = {}
+        valid_indices = []
+        skipped_indices = []
         completed_count = 0
-        total_segments = len(valid_segments)
 
-        def process_segment(args):
-            """Process a single segment - runs in thread pool"""
-            idx, segment = args
-            return idx, self._process_single_segment(segment, idx, temp_path)
-
-        # Use ThreadPoolExecutor for parallel processing
+        # Use ThreadPoolExecutor for parallel API calls
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(process_segment, (idx, seg)): idx
-                for idx, seg in valid_segments
-            }
+            index = 0
+            for batch in segment_batches:
+                for seg in batch:
+                    idx = index
+                    index += 1
+
+                    # Skip segments with empty text
+                    if not seg.get('translated_text', '').strip():
+                        skipped_indices.append(idx)
+                        logger.warning(f"Skipping segment {idx} - empty translated text")
+                        continue
+
+                    valid_indices.append(idx)
+                    futures[executor.submit(self._process_single_segment, seg, idx)] = idx
+
+            if skipped_indices:
+                logger.info(f"Skipped {len(skipped_indices)} segments with empty text: {skipped_indices}")
+
+            if not futures:
+                logger.warning("No valid segments to process")
+                return []
 
+            total_segments = len(futures)
+
+            # Process completed tasks as they finish
             for future in as_completed(futures):
+                idx = futures[future]
                 try:
-                    idx, result = future.result()
-                    results[idx] = result
+                    results[idx] = future.result()
                     completed_count += 1
 
                     if progress_callback:
                         progress_callback(f"Generated {completed_count}/{total_segments} voiceover segments")
                 except Exception as e:
-                    idx = futures[future]
                     logger.error(f"Failed to generate segment {idx}: {e}")
                     raise Exception(f"Failed to generate segment {idx}: {str(e)}")
 
         # Return results sorted by original index
-        voiceover_segments = [results[idx] for idx, _ in valid_segments if idx in results]
+        voiceover_segments = [results[idx] for idx in valid_indices if idx in results]
 
         if progress_callback:
             progress_callback(f"Voiceover generation complete: {len(voiceover_segments)} segments")
 
         return voiceover_segments
 
-    def _process_single_segment(self, segment, index, temp_path):
+    def _process_single_segment(self, segment, index):
         """
         Process a single segment: synthesize speech with Edge TTS
 
         Args:
             segment: Segment dict with 'translated_text', 'start', 'end'
                     Optional: 'speaker' for voice selection
-            index: Segment index for filename
-            temp_path: Path object for temp directory
+            index: Segment index (for logging)
 
         Returns:
-            Updated segment dict with 'audio_path' and 'audio_duration'
+            Updated segment dict with 'audio_pcm' (44.1kHz 16-bit mono) and 'audio_duration'
         """
         text = segment['translated_text']
 
@@ -137,7 +148,7 @@ class EdgeTTSProvider:
         for attempt in range(max_retries):
             try:
                 # Synthesize speech using Edge TTS (async)
-                audio_path = asyncio.run(self._synthesize_speech(text, voice, index, temp_path))
+                audio_pcm = asyncio.run(self._synthesize_speech(text, voice))
                 break  # Success
             except Exception as e:
                 last_error = e
@@ -153,16 +164,13 @@ class EdgeTTSProvider:
                     duration = segment.get('end', 0) - segment.get('start', 0)
                     if duration <= 0:
                         duration = 2.0
-                    audio_path = self._generate_silence(duration, index, temp_path)
+                    audio_pcm = self._generate_silence(duration)
                     break
 
-        # Get audio duration
-        duration = self._get_audio_duration(audio_path)
-
-        # Create result segment
+        # Create result segment (audio stays in memory for the mixer)
         voiceover_segment = segment.copy()
-        voiceover_segment['audio_path'] = str(audio_path)
-        voiceover_segment['audio_duration'] = duration
+        voiceover_segment['audio_pcm'] = audio_pcm
+        voiceover_segment['audio_duration'] = pcm_duration(audio_pcm)
 
         return voiceover_segment
 
@@ -196,120 +204,38 @@ class EdgeTTSProvider:
         # Default voice
         return self.default_voice
 
-    async def _synthesize_speech(self, text, voice, index, temp_path):
+    async def _synthesize_speech(self, text, voice):
         """
         Synthesize speech using Edge TTS (async)
 
         Args:
             text: Text to synthesize
             voice: Voice name (e.g., 'ka-GE-GiorgiNeural')
-            index: Segment index for filename
-            temp_path: Path object for temp directory
 
         Returns:
-            Path to generated audio file
+            bytes: 44.1kHz 16-bit mono PCM
         """
-        # Edge TTS outputs MP3 by default, so we save as .mp3 first
-        mp3_filename = f"segment_{index:04d}.mp3"
-        mp3_path = temp_path / mp3_filename
+        # Edge TTS streams MP3; collect it in memory instead of a temp file
+        communicate = edge_tts.Communicate(text, voice)
+        mp3_data = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                mp3_data.extend(chunk["data"])
 
-        wav_filename = f"segment_{index:04d}.wav"
-        wav_path = temp_path / wav_filename
+        # Decode MP3 straight to the mixer's format (in-process with PyAV)
+        return decode_to_pcm(bytes(mp3_data), sample_rate=44100)
 
-        # Use edge-tts to generate audio (saves as MP3)
-        communicate = edge_tts.Communicate(text, voice)
-        await communicate.save(str(mp3_path))
-
-        # Convert MP3 to WAV using ffmpeg
-        import subprocess
-        from src.ffmpeg_utils import get_ffmpeg_path
-
-        ffmpeg_path = get_ffmpeg_path()
-        cmd = [
-            ffmpeg_path,
-            '-i', str(mp3_path),
-            '-acodec', 'pcm_s16le',  # 16-bit PCM
-            '-ar', '44100',          # 44.1kHz sample rate
-            '-ac', '1',              # Mono
-            '-y',                    # Overwrite
-            str(wav_path)
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            logger.error(f"ffmpeg conversion failed: {result.stderr}")
-            raise Exception(f"Failed to convert MP3 to WAV: {result.stderr}")
-
-        # Clean up MP3 file
-        if mp3_path.exists():
-            mp3_path.unlink()
-
-        return wav_path
-
-    def _generate_silence(self, duration_seconds, index, temp_path):
+    def _generate_silence(self, duration_seconds):
         """
-        Generate silent WAV audio for the specified duration
+        Generate silent PCM audio for the specified duration
 
         Args:
             duration_seconds: Duration in seconds
-            index: Segment index for filename
-            temp_path: Path object for temp directory
 
         Returns:
-            Path to generated silence file
+            bytes: 44.1kHz 16-bit mono PCM
         """
-        import struct
-
-        sample_rate = 24000  # Edge TTS uses 24kHz
-        num_samples = int(sample_rate * duration_seconds)
-
-        # WAV header for 16-bit mono PCM
-        wav_header = struct.pack(
-            '<4sI4s4sIHHIIHH4sI',
-            b'RIFF',
-            36 + num_samples * 2,
-            b'WAVE',
-            b'fmt ',
-            16,
-            1,   # PCM
-            1,   # Mono
-            sample_rate,
-            sample_rate * 2,
-            2,
-            16,
-            b'data',
-            num_samples * 2
-        )
-
-        silence_data = b'\x00' * (num_samples * 2)
-
-        wav_filename = f"segment_{index:04d}.wav"
-        wav_path = temp_path / wav_filename
-
-        with open(wav_path, 'wb') as f:
-            f.write(wav_header + silence_data)
-
-        return wav_path
-
-    def _get_audio_duration(self, audio_path):
-        """Get audio duration using ffprobe"""
-        import subprocess
-        from src.ffmpeg_utils import get_ffprobe_path
-
-        ffprobe_path = get_ffprobe_path()
-
-        cmd = [
-            ffprobe_path,
-            '-v', 'quiet',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(audio_path)
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0 and result.stdout.strip():
-            return float(result.stdout.strip())
-        return 0.0
+        return b'\x00' * (int(44100 * duration_seconds) * 2)
 
     def has_speaker_support(self):
         """Check if provider supports multiple speakers"""
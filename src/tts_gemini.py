@@ -6,9 +6,7 @@ Supports parallel requests for faster processing
 
 import os
 import json
-import subprocess
-import shutil
-import tempfile
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
@@ -17,24 +15,29 @@ from google.cloud import texttospeech
 from google.oauth2 import service_account
 
 from src.logging_config import get_logger
-from src.ffmpeg_utils import get_ffprobe_path
+from src.audio_utils import wav_to_pcm, pcm_duration
 
 logger = get_logger(__name__)
 
+# Process-wide cap on in-flight Gemini TTS requests. Each job has its own
+# thread pool, so without this N concurrent videos would multiply the load
+# on the API quota.
+_API_SEMAPHORE = threading.BoundedSemaphore(
+    int(os.getenv('GEMINI_TTS_MAX_IN_FLIGHT', os.getenv('GEMINI_TTS_MAX_CONCURRENT', '5')))
+)
+
 
 class GeminiTextToSpeech:
     """Text-to-Speech using Google Gemini TTS API"""
 
+    # gRPC client shared by all instances: the credential lookup and channel
+    # setup happen once per process instead of once per video
+    _shared_client = None
+    _client_lock = threading.Lock()
+
     def __init__(self):
         """Initialize Google Cloud Text-to-Speech client with Gemini model"""
-        # Try to get credentials from various sources
-        credentials = self._get_credentials()
-
-        if credentials:
-            self.client = texttospeech.TextToSpeechClient(credentials=credentials)
-        else:
-            # Fall back to default credentials (ADC)
-            self.client = texttospeech.TextToSpeechClient()
+        self.client = self._get_client()
 
         # Gemini TTS configuration for Georgian
         self.language_code = "ka-GE"  # Georgian (Georgia)
@@ -53,6 +56,24 @@ class GeminiTextToSpeech:
         # Parallel processing settings
         self.max_workers = int(os.getenv('GEMINI_TTS_MAX_CONCURRENT', '5'))
 
+    def _get_client(self):
+        """Get the shared Text-to-Speech client, creating it on first use"""
+        if GeminiTextToSpeech._shared_client is None:
+            with GeminiTextToSpeech._client_lock:
+                if GeminiTextToSpeech._shared_client is None:
+                    # Try to get credentials from various sources
+                    credentials = self._get_credentials()
+
+                    if credentials:
+                        client = texttospeech.TextToSpeechClient(credentials=credentials)
+                    else:
+                        # Fall back to default credentials (ADC)
+                        client = texttospeech.TextToSpeechClient()
+
+                    GeminiTextToSpeech._shared_client = client
+
+        return GeminiTextToSpeech._shared_client
+
     def _get_credentials(self):
         """Get Google Cloud credentials from environment"""
         logger.info("=== Google Credentials Debug ===")
@@ -101,87 +122,95 @@ class GeminiTextToSpeech:
 
         Args:
             segments: List of segments with 'translated_text', 'start', 'end'
-            temp_dir: Directory for temporary audio files
+            temp_dir: Unused (audio stays in memory); kept for provider compatibility
             progress_callback: Optional callback for progress updates
 
         Returns:
-            List of segments with 'audio_path' added
+            List of segments with 'audio_pcm' added
         """
-        temp_path = Path(temp_dir)
-        temp_path.mkdir(exist_ok=True)
+        return self.synthesize_stream([segments], temp_dir=temp_dir, progress_callback=progress_callback)
 
-        # Filter out segments with empty text
-        valid_segments = []
-        skipped_indices = []
-        for i, seg in enumerate(segments):
-            text = seg.get('translated_text', '').strip()
-            if text:
-                valid_segments.append((i, seg))
-            else:
-                skipped_indices.append(i)
-                logger.warning(f"Skipping segment {i} - empty translated text")
+    def synthesize_stream(self, segment_batches, temp_dir="temp", progress_callback=None):
+        """
+        Generate Georgian voiceover while segments are still arriving.
 
-        if skipped_indices:
-            logger.info(f"Skipped {len(skipped_indices)} segments with empty text: {skipped_indices}")
+        Each segment is submitted to the thread pool as soon as its batch is
+        yielded, so synthesis overlaps with whatever produces the batches
+        (e.g. Translator.translate_stream).
 
-        if progress_callback:
-            progress_callback(f"Generating Georgian voiceover with Gemini TTS ({len(valid_segments)} segments)...")
+        Args:
+            segment_batches: Iterable of segment lists with 'translated_text', 'start', 'end'
+            temp_dir: Unused (audio stays in memory); kept for provider compatibility
+            progress_callback: Optional callback for progress updates
 
-        if not valid_segments:
-            logger.warning("No valid segments to process")
-            return []
+        Returns:
+            List of segments with 'audio_pcm' added, in original order
+        """
+        if progress_callback:
+            progress_callback("Generating Georgian voiceover with Gemini TTS...")
 
-        # Process segments in parallel
         results = {}
+        futures = {}
+        valid_indices = []
+        skipped_indices = []
         completed_count = 0
-        total_segments = len(valid_segments)
-
-        def process_segment(args):
-            """Process a single segment - runs in thread pool"""
-            idx, segment = args
-            return idx, self._process_single_segment(segment, idx, temp_path)
 
         # Use ThreadPoolExecutor for parallel API calls
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks for valid segments only
-            futures = {
-                executor.submit(process_segment, (idx, seg)): idx
-                for idx, seg in valid_segments
-            }
+            index = 0
+            for batch in segment_batches:
+                for seg in batch:
+                    idx = index
+                    index += 1
+
+                    # Skip segments with empty text
+                    if not seg.get('translated_text', '').strip():
+                        skipped_indices.append(idx)
+                        logger.warning(f"Skipping segment {idx} - empty translated text")
+                        continue
+
+                    valid_indices.append(idx)
+                    futures[executor.submit(self._process_single_segment, seg, idx)] = idx
+
+            if skipped_indices:
+                logger.info(f"Skipped {len(skipped_indices)} segments with empty text: {skipped_indices}")
+
+            if not futures:
+                logger.warning("No valid segments to process")
+                return []
+
+            total_segments = len(futures)
 
             # Process completed tasks as they finish
             for future in as_completed(futures):
+                idx = futures[future]
                 try:
-                    idx, result = future.result()
-                    results[idx] = result
+                    results[idx] = future.result()
                     completed_count += 1
 
                     if progress_callback:
                         progress_callback(f"Generated {completed_count}/{total_segments} voiceover segments")
                 except Exception as e:
-                    # Log error but continue with other segments
-                    idx = futures[future]
                     raise Exception(f"Failed to generate segment {idx}: {str(e)}")
 
-        # Return only the results we have (valid segments), sorted by original index
-        voiceover_segments = [results[idx] for idx, _ in valid_segments if idx in results]
+        # Return results sorted by original index
+        voiceover_segments = [results[idx] for idx in valid_indices if idx in results]
 
         if progress_callback:
             progress_callback(f"Voiceover generation complete: {len(voiceover_segments)} segments")
 
         return voiceover_segments
 
-    def _process_single_segment(self, segment, index, temp_path):
+    def _process_single_segment(self, segment, index):
         """
         Process a single segment: synthesize speech with Gemini TTS
 
         Args:
             segment: Segment dict with 'translated_text', 'start', 'end'
-            index: Segment index for filename
-            temp_path: Path object for temp directory
+            index: Segment index (for logging)
 
         Returns:
-            Updated segment dict with 'audio_path' and 'audio_duration'
+            Updated segment dict with 'audio_pcm' (44.1kHz 16-bit mono) and 'audio_duration'
         """
         text = segment['translated_text']
         max_retries = 3
@@ -189,8 +218,8 @@ class GeminiTextToSpeech:
 
         for attempt in range(max_retries):
             try:
-                # Synthesize speech using Gemini TTS
-                audio_content = self._synthesize_speech(text)
+                # Synthesize speech using Gemini TTS (LINEAR16 WAV -> raw PCM)
+                audio_pcm = wav_to_pcm(self._synthesize_speech(text))
                 break  # Success
             except Exception as e:
                 error_str = str(e).lower()
@@ -202,7 +231,7 @@ class GeminiTextToSpeech:
                     duration = segment.get('end', 0) - segment.get('start', 0)
                     if duration <= 0:
                         duration = 2.0
-                    audio_content = self._generate_silence(duration)
+                    audio_pcm = self._generate_silence(duration)
                     break
 
                 # Check if this is a transient error (500, 499, cancelled, timeout) - retry
@@ -221,66 +250,30 @@ class GeminiTextToSpeech:
                         duration = segment.get('end', 0) - segment.get('start', 0)
                         if duration <= 0:
                             duration = 2.0
-                        audio_content = self._generate_silence(duration)
+                        audio_pcm = self._generate_silence(duration)
                         break
 
                 # Other errors - re-raise
                 raise
 
-        # Save to WAV file (Gemini outputs LINEAR16 which is WAV-compatible)
-        wav_filename = f"segment_{index:04d}.wav"
-        wav_path = temp_path / wav_filename
-
-        with open(wav_path, 'wb') as f:
-            f.write(audio_content)
-
-        # Get audio duration using ffprobe
-        duration = self._get_audio_duration(wav_path)
-
-        # Create result segment
+        # Create result segment (audio stays in memory for the mixer)
         voiceover_segment = segment.copy()
-        voiceover_segment['audio_path'] = str(wav_path)
-        voiceover_segment['audio_duration'] = duration
+        voiceover_segment['audio_pcm'] = audio_pcm
+        voiceover_segment['audio_duration'] = pcm_duration(audio_pcm)
 
         return voiceover_segment
 
     def _generate_silence(self, duration_seconds):
         """
-        Generate silent WAV audio for the specified duration
+        Generate silent PCM audio for the specified duration
 
         Args:
             duration_seconds: Duration in seconds
 
         Returns:
-            bytes: WAV audio content
+            bytes: 44.1kHz 16-bit mono PCM
         """
-        import struct
-
-        sample_rate = 44100
-        num_samples = int(sample_rate * duration_seconds)
-
-        # WAV header for 16-bit mono PCM
-        wav_header = struct.pack(
-            '<4sI4s4sIHHIIHH4sI',
-            b'RIFF',
-            36 + num_samples * 2,  # File size - 8
-            b'WAVE',
-            b'fmt ',
-            16,  # Subchunk1 size
-            1,   # Audio format (PCM)
-            1,   # Num channels (mono)
-            sample_rate,
-            sample_rate * 2,  # Byte rate
-            2,   # Block align
-            16,  # Bits per sample
-            b'data',
-            num_samples * 2  # Data size
-        )
-
-        # Generate silence (all zeros)
-        silence_data = b'\x00' * (num_samples * 2)
-
-        return wav_header + silence_data
+        return b'\x00' * (int(44100 * duration_seconds) * 2)
 
     def _synthesize_speech(self, text, prompt=None):
         """
@@ -316,38 +309,18 @@ class GeminiTextToSpeech:
             )
 
             # Make the API request
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=voice,
-                audio_config=audio_config
-            )
+            with _API_SEMAPHORE:
+                response = self.client.synthesize_speech(
+                    input=synthesis_input,
+                    voice=voice,
+                    audio_config=audio_config
+                )
 
             return response.audio_content
 
         except Exception as e:
             raise Exception(f"Gemini TTS error: {str(e)}")
 
-    def _get_audio_duration(self, audio_path):
-        """Get audio duration using ffprobe"""
-        ffprobe_path = self._get_ffprobe_path()
-
-        cmd = [
-            ffprobe_path,
-            '-v', 'quiet',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            str(audio_path)
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0 and result.stdout.strip():
-            return float(result.stdout.strip())
-        return 0.0
-
-    def _get_ffprobe_path(self):
-        """Get ffprobe path"""
-        return get_ffprobe_path()
-
     def set_voice(self, voice_name):
         """
         Change the voice dynamically for multi-speaker support
@@ -5,13 +5,19 @@ No API key needed, no content filtering
 
 import os
 import io
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from gtts import gTTS
-from pydub import AudioSegment
 from typing import List, Dict, Optional
 from src.logging_config import get_logger
+from src.audio_utils import decode_to_pcm, pcm_duration
 
 logger = get_logger(__name__)
 
+# Process-wide cap on in-flight gTTS requests (the free endpoint throttles
+# aggressively); shared by all provider instances and their thread pools
+_API_SEMAPHORE = threading.BoundedSemaphore(int(os.getenv('GTTS_MAX_IN_FLIGHT', '4')))
+
 
 class GTTSProvider:
     """gTTS provider - free, no API key, no content filter"""
@@ -19,75 +25,121 @@ class GTTSProvider:
     def __init__(self):
         """Initialize gTTS provider"""
         self.language = 'ka'  # Georgian
+        self.max_workers = int(os.getenv('TTS_MAX_CONCURRENT', '5'))
         logger.info("gTTS provider initialized (free, no content filter)")
 
     def generate_voiceover(
         self,
         segments: List[Dict],
-        output_dir: str = "temp",
+        temp_dir: str = "temp",
         progress_callback: Optional[callable] = None
-    ) -> List[str]:
+    ) -> List[Dict]:
         """
-        Generate voiceover audio files using gTTS
+        Generate Georgian voiceover for all segments using gTTS
 
         Args:
-            segments: List of segments with 'text' field
-            output_dir: Directory to save audio files
+            segments: List of segments with 'translated_text', 'start', 'end'
+            temp_dir: Unused (audio stays in memory); kept for provider compatibility
             progress_callback: Optional callback for progress updates
 
         Returns:
-            List of audio file paths
+            List of segments with 'audio_pcm' added
         """
-        audio_files = []
-        total_segments = len(segments)
+        return self.synthesize_stream([segments], temp_dir=temp_dir, progress_callback=progress_callback)
 
-        logger.info(f"Generating voiceover for {total_segments} segments with gTTS")
+    def synthesize_stream(
+        self,
+        segment_batches,
+        temp_dir: str = "temp",
+        progress_callback: Optional[callable] = None
+    ) -> List[Dict]:
+        """
+        Generate Georgian voiceover while segments are still arriving.
 
-        for idx, segment in enumerate(segments):
-            try:
-                text = segment.get('text', '').strip()
+        Each segment is submitted to the thread pool as soon as its batch is
+        yielded, so synthesis overlaps with whatever produces the batches
+        (e.g. Translator.translate_stream).
 
-                if not text:
-                    logger.warning(f"Segment {idx} has no text, skipping")
-                    continue
+        Args:
+            segment_batches: Iterable of segment lists with 'translated_text', 'start', 'end'
+            temp_dir: Unused (audio stays in memory); kept for provider compatibility
+            progress_callback: Optional callback for progress updates
 
-                if progress_callback:
-                    progress_callback(
-                        f"TTS: Generating voiceover {idx+1}/{total_segments} with gTTS..."
-                    )
+        Returns:
+            List of segments with 'audio_pcm' added, in original order
+        """
+        if progress_callback:
+            progress_callback("Generating Georgian voiceover with gTTS...")
 
-                # Generate speech with gTTS
-                tts = gTTS(text=text, lang=self.language, slow=False)
+        results = {}
+        futures = {}
+        valid_indices = []
+        completed_count = 0
 
-                # Save to BytesIO first
-                audio_fp = io.BytesIO()
-                tts.write_to_fp(audio_fp)
-                audio_fp.seek(0)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            index = 0
+            for batch in segment_batches:
+                for segment in batch:
+                    idx = index
+                    index += 1
 
-                # Load with pydub and convert to WAV
-                audio = AudioSegment.from_mp3(audio_fp)
+                    if not segment.get('translated_text', '').strip():
+                        logger.warning(f"Segment {idx} has no text, skipping")
+                        continue
 
-                # Save as WAV
-                output_path = os.path.join(output_dir, f"segment_{idx}.wav")
-                audio.export(output_path, format="wav")
+                    valid_indices.append(idx)
+                    futures[executor.submit(self._process_single_segment, segment, idx)] = idx
 
-                audio_files.append(output_path)
+            if not futures:
+                logger.warning("No valid segments to process")
+                return []
 
-                logger.info(f"Segment {idx}: Generated {len(text)} chars → {output_path}")
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = future.result()
+                completed_count += 1
 
-            except Exception as e:
-                logger.error(f"Failed to generate voiceover for segment {idx}: {e}")
-                # Generate silence as fallback
-                silence = AudioSegment.silent(duration=2000)  # 2 seconds
-                output_path = os.path.join(output_dir, f"segment_{idx}.wav")
-                silence.export(output_path, format="wav")
-                audio_files.append(output_path)
+                if progress_callback:
+                    progress_callback(f"Generated {completed_count}/{len(futures)} voiceover segments")
+
+        voiceover_segments = [results[idx] for idx in valid_indices]
 
         if progress_callback:
-            progress_callback(f"TTS: Voiceover generation complete: {len(audio_files)} segments")
+            progress_callback(f"Voiceover generation complete: {len(voiceover_segments)} segments")
+
+        logger.info(f"gTTS generation complete: {len(voiceover_segments)} segments")
+        return voiceover_segments
+
+    def _process_single_segment(self, segment: Dict, idx: int) -> Dict:
+        """Synthesize one segment to in-memory PCM; falls back to silence on failure"""
+        text = segment['translated_text'].strip()
+
+        try:
+            # gTTS returns MP3; collect it in memory instead of a temp file
+            tts = gTTS(text=text, lang=self.language, slow=False)
+            audio_fp = io.BytesIO()
+            with _API_SEMAPHORE:
+                tts.write_to_fp(audio_fp)
+
+            # Decode MP3 straight to the mixer's format (in-process with PyAV)
+            audio_pcm = decode_to_pcm(audio_fp.getvalue(), sample_rate=44100)
+
+            logger.info(f"Segment {idx}: Generated {len(text)} chars")
+
+        except Exception as e:
+            logger.error(f"Failed to generate voiceover for segment {idx}: {e}")
+            # Silence for the segment's duration as fallback
+            duration = segment.get('end', 0) - segment.get('start', 0)
+            if duration <= 0:
+                duration = 2.0
+            audio_pcm = b'\x00' * (int(44100 * duration) * 2)
+
+        # Create result segment (audio stays in memory for the mixer)
+        voiceover_segment = segment.copy()
+        voiceover_segment['audio_pcm'] = audio_pcm
+        voiceover_segment['audio_duration'] = pcm_duration(audio_pcm)
 
-        logger.info(f"gTTS generation complete: {len(audio_files)} audio files")
-        return audio_files
+        return voiceover_segment
 
     def has_speaker_support(self) -> bool:
         """Check if provider supports multiple speakers"""
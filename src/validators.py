@@ -4,24 +4,51 @@ Input validation utilities for API endpoints
 
 import re
 from urllib.parse import urlparse, parse_qs
-from functools import wraps
+from functools import lru_cache, wraps
 from flask import request, jsonify
 
+# Try to import google-re2 - optional dependency (linear-time matching, so
+# user-supplied URLs can't trigger regex backtracking)
+try:
+    import re2 as _regex
+    RE2_AVAILABLE = True
+except ImportError:
+    _regex = re
+    RE2_AVAILABLE = False
 
-# YouTube URL patterns (including voyoutube.com support)
-YOUTUBE_PATTERNS = [
-    r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/watch\?v=([a-zA-Z0-9_-]{11})',
-    r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/embed\/([a-zA-Z0-9_-]{11})',
-    r'(?:https?:\/\/)?youtu\.be\/([a-zA-Z0-9_-]{11})',
-    r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/shorts\/([a-zA-Z0-9_-]{11})',
-    r'(?:https?:\/\/)?(?:www\.)?voyoutube\.com\/watch\?v=([a-zA-Z0-9_-]{11})',
-    r'(?:https?:\/\/)?(?:www\.)?voyoutube\.com\/shorts\/([a-zA-Z0-9_-]{11})',
-    r'[?&]v=([a-zA-Z0-9_-]{11})',  # Query parameter fallback
-]
+
+# YouTube video ID in any supported URL form, as one alternation so a URL is
+# scanned once: youtube.com (and voyoutube.com) /watch?v=, /embed/, /shorts/
+# or youtu.be/ (the leftmost of these wins)
+YOUTUBE_URL_PATTERN = _regex.compile(
+    r'(?:youtube\.com/(?:watch\?v=|embed/|shorts/)|youtu\.be/)([a-zA-Z0-9_-]{11})'
+)
+
+# Bare ?v= / &v= query parameter; only tried when no YouTube URL form matched,
+# so e.g. a non-YouTube page whose query embeds a YouTube URL yields that URL's ID
+YOUTUBE_QUERY_PATTERN = _regex.compile(r'[?&]v=([a-zA-Z0-9_-]{11})')
 
 # Validation constants
 MAX_URL_LENGTH = 2048
-VALID_VIDEO_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]{11}$')
+VALID_VIDEO_ID_PATTERN = _regex.compile(r'^[a-zA-Z0-9_-]{11}$')
+SAFE_FILENAME_PATTERN = _regex.compile(r'^[a-zA-Z0-9._-]+$')
+
+# The frontend re-sends the same few URLs/IDs on every poll; parsing is a pure
+# function of the (stripped) string, so results are memoized
+PARSE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _match_youtube_url(url):
+    """Video ID from the first YouTube URL form found in the string, or None (cached)"""
+    match = YOUTUBE_URL_PATTERN.search(url) or YOUTUBE_QUERY_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _is_valid_video_id(video_id):
+    """Whether a stripped string is an 11-character video ID (cached)"""
+    return VALID_VIDEO_ID_PATTERN.match(video_id) is not None
 
 
 class ValidationError(Exception):
@@ -56,13 +83,9 @@ def validate_youtube_url(url):
     url = url.strip()
 
     # Try to match against YouTube patterns
-    for pattern in YOUTUBE_PATTERNS:
-        match = re.search(pattern, url)
-        if match:
-            video_id = match.group(1)
-            # Validate video ID format
-            if VALID_VIDEO_ID_PATTERN.match(video_id):
-                return video_id
+    video_id = _match_youtube_url(url)
+    if video_id:
+        return video_id
 
     # If no pattern matched, raise error
     raise ValidationError(
@@ -88,18 +111,11 @@ def extract_video_id(url_or_path):
     url_or_path = url_or_path.strip()
 
     # Check if it's already a valid video ID
-    if VALID_VIDEO_ID_PATTERN.match(url_or_path):
+    if _is_valid_video_id(url_or_path):
         return url_or_path
 
     # Try to extract from URL patterns
-    for pattern in YOUTUBE_PATTERNS:
-        match = re.search(pattern, url_or_path)
-        if match:
-            video_id = match.group(1)
-            if VALID_VIDEO_ID_PATTERN.match(video_id):
-                return video_id
-
-    return None
+    return _match_youtube_url(url_or_path)
 
 
 def validate_video_id(video_id):
@@ -120,7 +136,7 @@ def validate_video_id(video_id):
 
     video_id = video_id.strip()
 
-    if not VALID_VIDEO_ID_PATTERN.match(video_id):
+    if not _is_valid_video_id(video_id):
         raise ValidationError(
             "Invalid video ID format. Must be 11 characters (alphanumeric, hyphens, underscores)"
         )
@@ -197,7 +213,7 @@ def sanitize_filename(filename):
         raise ValidationError("Invalid filename: path traversal not allowed")
 
     # Allow only safe characters: alphanumeric, dots, hyphens, underscores
-    if not re.match(r'^[a-zA-Z0-9._-]+$', filename):
+    if not SAFE_FILENAME_PATTERN.match(filename):
         raise ValidationError(
             "Invalid filename: only alphanumeric characters, dots, hyphens, and underscores allowed"
         )
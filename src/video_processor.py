@@ -5,7 +5,7 @@ Combines mixed audio with original video to create final output
 
 import subprocess
 from pathlib import Path
-from src.ffmpeg_utils import get_ffmpeg_path, get_ffprobe_path
+from src.ffmpeg_utils import get_ffmpeg_path, get_ffprobe_path, FFMPEG_QUIET_ARGS
 
 
 class VideoProcessor:
@@ -35,6 +35,7 @@ class VideoProcessor:
         # Use ffmpeg to replace audio track
         cmd = [
             get_ffmpeg_path(),
+            *FFMPEG_QUIET_ARGS,
             '-i', str(video_path),
             '-i', str(audio_path),
             '-c:v', 'copy',  # Copy video stream (no re-encoding)
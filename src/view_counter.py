@@ -0,0 +1,152 @@
+"""
+View Counter Module
+Buffers video view counts and writes them to the database in batches,
+so a page view costs a Redis HINCRBY (or a dict update) instead of a DB write
+"""
+
+import os
+import atexit
+import threading
+import uuid
+from collections import Counter
+from typing import Dict
+from src.logging_config import get_logger
+from src.redis_config import get_redis_client
+
+logger = get_logger(__name__)
+
+# Seconds between flushes; views show up in the database after at most this long
+VIEW_COUNT_FLUSH_INTERVAL = float(os.getenv('VIEW_COUNT_FLUSH_INTERVAL', 60))
+
+# Try to import Redis - optional dependency
+try:
+    import redis
+    from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    logger.warning("Redis not available - view counts buffered per process")
+
+
+class _BufferedViewCounter:
+    """Shared flush loop: a daemon thread calls flush() every `interval` seconds"""
+
+    def __init__(self, db, interval: float = VIEW_COUNT_FLUSH_INTERVAL):
+        self.db = db
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def _ensure_started(self):
+        """Start the flush thread on first use (after any fork)"""
+        if self._thread is None or not self._thread.is_alive():
+            with self._thread_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run,
+                        name="view-counter",
+                        daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def _write(self, counts: Dict[str, int]) -> bool:
+        """Write a batch to the database; returns False if it failed"""
+        try:
+            self.db.add_view_counts(counts)
+            logger.debug("view_counts_flushed", videos=len(counts))
+            return True
+        except Exception as e:
+            logger.error("view_count_flush_failed", error=str(e), videos=len(counts))
+            return False
+
+
+class RedisViewCounter(_BufferedViewCounter):
+    """
+    View counts buffered in one Redis hash, shared by every web worker.
+
+    A flush atomically RENAMEs the hash to a private key before reading it,
+    so concurrent flushers in other processes never apply the same views twice.
+    """
+
+    def __init__(self, redis_client: 'redis.Redis', db, key: str = "vo:views", **kwargs):
+        super().__init__(db, **kwargs)
+        self.redis = redis_client
+        self.key = key
+
+    def record(self, video_id: str) -> None:
+        """Count one view"""
+        try:
+            self.redis.hincrby(self.key, video_id, 1)
+        except RedisError as e:
+            logger.error("view_count_record_failed", video_id=video_id, error=str(e))
+            return
+        self._ensure_started()
+
+    def flush(self) -> None:
+        """Move buffered views into the database"""
+        batch_key = f"{self.key}:flushing:{uuid.uuid4().hex}"
+        try:
+            self.redis.rename(self.key, batch_key)
+        except RedisError:
+            return  # Nothing buffered (RENAME fails on a missing key) or Redis down
+
+        try:
+            raw = self.redis.hgetall(batch_key)
+            counts = {k.decode('utf-8'): int(v) for k, v in raw.items()}
+            if not self._write(counts):
+                # Put the views back for the next flush
+                pipe = self.redis.pipeline()
+                for video_id, delta in counts.items():
+                    pipe.hincrby(self.key, video_id, delta)
+                pipe.execute()
+            self.redis.delete(batch_key)
+        except RedisError as e:
+            logger.error("view_count_flush_redis_error", error=str(e))
+
+
+class LocalViewCounter(_BufferedViewCounter):
+    """Process-local view buffer (fallback when Redis isn't available)"""
+
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, video_id: str) -> None:
+        """Count one view"""
+        with self._lock:
+            self._counts[video_id] += 1
+        self._ensure_started()
+
+    def flush(self) -> None:
+        """Move buffered views into the database"""
+        with self._lock:
+            counts, self._counts = dict(self._counts), Counter()
+        if counts and not self._write(counts):
+            with self._lock:
+                self._counts.update(counts)
+
+
+def create_view_counter(db):
+    """
+    Factory function to create the view counter.
+    Uses Redis if available, otherwise buffers in this process.
+    """
+    redis_url = os.getenv('REDIS_URL')
+
+    if REDIS_AVAILABLE and redis_url:
+        try:
+            redis_client = get_redis_client(redis_url)
+            redis_client.ping()
+            return RedisViewCounter(redis_client, db)
+
+        except (RedisConnectionError, RedisError) as e:
+            logger.warning("view_counter_redis_unavailable", error=str(e), fallback="per-process buffer")
+
+    return LocalViewCounter(db)
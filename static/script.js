@@ -2,6 +2,7 @@
 
 let currentJobId = null;
 let statusCheckInterval = null;
+let statusEvents = null;
 
 // DOM Elements
 const urlInput = document.getElementById('youtube-url');
@@ -152,8 +153,8 @@ async function processVideo() {
 
         currentJobId = data.job_id || data.video_id;
 
-        // Start polling for status immediately
-        startStatusPolling();
+        // Start status updates immediately
+        startStatusUpdates();
 
     } catch (error) {
         console.error('Error:', error);
@@ -162,11 +163,57 @@ async function processVideo() {
     }
 }
 
-// Start polling for status updates
-function startStatusPolling() {
+// Start status updates: server push (SSE) when enabled, else polling
+function startStatusUpdates() {
+    if (window.STATUS_EVENTS_ENABLED && window.EventSource) {
+        startStatusEvents();
+    } else {
+        startStatusPolling();
+    }
+}
+
+// Receive status updates over Server-Sent Events (sent only on change)
+function startStatusEvents() {
+    stopStatusUpdates();
+
+    statusEvents = new EventSource(`/events/${currentJobId}`);
+
+    statusEvents.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        updateStatus(data);
+
+        if (data.complete) {
+            stopStatusUpdates();
+            showResult(data);
+        } else if (data.error) {
+            // Final state; don't let EventSource reconnect
+            stopStatusUpdates();
+        }
+    };
+
+    statusEvents.onerror = () => {
+        // EventSource reconnects by itself unless the server refused the stream
+        if (statusEvents && statusEvents.readyState === EventSource.CLOSED) {
+            console.error('Status stream unavailable, falling back to polling');
+            startStatusPolling();
+        }
+    };
+}
+
+// Stop any running status updates (stream or polling)
+function stopStatusUpdates() {
+    if (statusEvents) {
+        statusEvents.close();
+        statusEvents = null;
+    }
     if (statusCheckInterval) {
         clearInterval(statusCheckInterval);
     }
+}
+
+// Start polling for status updates
+function startStatusPolling() {
+    stopStatusUpdates();
 
     // Poll every 500ms for faster progress updates
     statusCheckInterval = setInterval(async () => {
@@ -248,9 +295,7 @@ function showError(message) {
     errorMessage.textContent = message;
     processBtn.disabled = false;
 
-    if (statusCheckInterval) {
-        clearInterval(statusCheckInterval);
-    }
+    stopStatusUpdates();
 }
 
 // Reset form
@@ -260,9 +305,7 @@ function resetForm() {
     processBtn.disabled = false;
     currentJobId = null;
 
-    if (statusCheckInterval) {
-        clearInterval(statusCheckInterval);
-    }
+    stopStatusUpdates();
 }
 
 // Hide all sections
@@ -284,7 +327,5 @@ function isValidYouTubeUrl(url) {
 
 // Handle page unload
 window.addEventListener('beforeunload', () => {
-    if (statusCheckInterval) {
-        clearInterval(statusCheckInterval);
-    }
+    stopStatusUpdates();
 });
@@ -59,7 +59,6 @@ for var in env_vars:
 print("\n2. CHECKING REQUIRED PACKAGES...")
 packages = {
     "flask": "Flask",
-    "flask_cors": "flask-cors",
     "celery": "Celery",
     "redis": "Redis",
     "openai": "OpenAI",
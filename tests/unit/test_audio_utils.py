@@ -0,0 +1,158 @@
+"""
+Unit Tests for audio_utils.py
+Tests VAD region merging and mapping timestamps back from the trimmed timeline
+"""
+
+import pytest
+from src import audio_utils
+from src.audio_utils import (
+    restore_timestamps,
+    remove_silence,
+    VAD_FRAME_MS,
+    BYTES_PER_MS,
+    KEEP_GAP_MS,
+)
+
+
+# Two kept regions with a 0.5s spacer between them in the compact timeline:
+#   compact 0.0-2.0  <- original 10.0-12.0
+#   compact 2.0-2.5  spacer
+#   compact 2.5-4.5  <- original 30.0-32.0
+OFFSETS = [
+    (0.0, 10.0, 2.0),
+    (2.5, 30.0, 2.0),
+]
+
+
+def _segments(*spans):
+    return [{'start': start, 'end': end, 'text': 'x'} for start, end in spans]
+
+
+# ========================================
+# Test restore_timestamps()
+# ========================================
+
+class TestRestoreTimestamps:
+    """Tests for mapping compact-timeline timestamps back to the original"""
+
+    @pytest.mark.unit
+    def test_none_offsets_is_identity(self):
+        """Test that offsets=None leaves segments untouched"""
+        segments = _segments((1.0, 2.0))
+        assert restore_timestamps(segments, None) == _segments((1.0, 2.0))
+
+    @pytest.mark.unit
+    def test_empty_offsets_is_identity(self):
+        """Test that empty offsets leave segments untouched"""
+        segments = _segments((1.0, 2.0))
+        assert restore_timestamps(segments, []) == _segments((1.0, 2.0))
+
+    @pytest.mark.unit
+    def test_times_inside_first_region(self):
+        """Test times inside the first region shift by its original start"""
+        segments = restore_timestamps(_segments((0.5, 1.5)), OFFSETS)
+        assert segments[0]['start'] == pytest.approx(10.5)
+        assert segments[0]['end'] == pytest.approx(11.5)
+
+    @pytest.mark.unit
+    def test_times_inside_second_region(self):
+        """Test bisect picks the region containing the time"""
+        segments = restore_timestamps(_segments((3.0, 4.5)), OFFSETS)
+        assert segments[0]['start'] == pytest.approx(30.5)
+        assert segments[0]['end'] == pytest.approx(32.0)
+
+    @pytest.mark.unit
+    def test_region_boundary_belongs_to_later_region(self):
+        """Test a time exactly at a region's compact start maps to its original start"""
+        segments = restore_timestamps(_segments((2.5, 2.5)), OFFSETS)
+        assert segments[0]['start'] == pytest.approx(30.0)
+
+    @pytest.mark.unit
+    def test_segment_spanning_spacer(self):
+        """Test a segment crossing the spacer maps each end to its own region"""
+        segments = restore_timestamps(_segments((1.0, 3.5)), OFFSETS)
+        assert segments[0]['start'] == pytest.approx(11.0)
+        assert segments[0]['end'] == pytest.approx(31.0)
+
+    @pytest.mark.unit
+    def test_time_inside_spacer_clamps_to_preceding_region_end(self):
+        """Test times in a spacer clamp to the end of the region before it"""
+        segments = restore_timestamps(_segments((2.1, 2.4)), OFFSETS)
+        assert segments[0]['start'] == pytest.approx(12.0)
+        assert segments[0]['end'] == pytest.approx(12.0)
+
+    @pytest.mark.unit
+    def test_time_past_last_region_clamps_to_its_end(self):
+        """Test times beyond the compact audio clamp to the last region's end"""
+        segments = restore_timestamps(_segments((4.0, 9.0)), OFFSETS)
+        assert segments[0]['start'] == pytest.approx(31.5)
+        assert segments[0]['end'] == pytest.approx(32.0)
+
+    @pytest.mark.unit
+    def test_negative_time_clamps_to_first_region_start(self):
+        """Test times before the first region clamp to its original start"""
+        segments = restore_timestamps(_segments((-0.2, 0.1)), OFFSETS)
+        assert segments[0]['start'] == pytest.approx(10.0)
+        assert segments[0]['end'] == pytest.approx(10.1)
+
+    @pytest.mark.unit
+    def test_modifies_in_place_and_returns_same_list(self):
+        """Test segments are updated in place and the same list is returned"""
+        segments = _segments((0.5, 1.0))
+        assert restore_timestamps(segments, OFFSETS) is segments
+        assert segments[0]['text'] == 'x'
+
+
+# ========================================
+# Test remove_silence() / _voiced_regions()
+# ========================================
+
+class _FakeVad:
+    """webrtcvad.Vad stand-in: a frame is speech if its first byte is non-zero"""
+
+    def __init__(self, aggressiveness):
+        self.aggressiveness = aggressiveness
+
+    def is_speech(self, frame, sample_rate):
+        return frame[0] != 0
+
+
+class _FakeWebrtcvad:
+    Vad = _FakeVad
+
+
+def _pcm(pattern):
+    """16 kHz PCM with one VAD frame per character: '#' speech, '.' silence"""
+    frame_bytes = VAD_FRAME_MS * BYTES_PER_MS
+    return b''.join((b'\x01' if c == '#' else b'\x00') * frame_bytes for c in pattern)
+
+
+class TestRemoveSilence:
+    """Tests for VAD-based silence trimming"""
+
+    @pytest.mark.unit
+    def test_vad_unavailable_returns_original(self, monkeypatch):
+        """Test that without webrtcvad the original path is returned with no offsets"""
+        monkeypatch.setattr(audio_utils, 'VAD_AVAILABLE', False)
+        assert remove_silence('audio.wav') == ('audio.wav', None)
+
+    @pytest.mark.unit
+    def test_voiced_regions_merge_short_gaps(self, monkeypatch):
+        """Test that pauses shorter than KEEP_GAP_MS are merged into one region"""
+        monkeypatch.setattr(audio_utils, 'webrtcvad', _FakeWebrtcvad, raising=False)
+        short_gap = '.' * (KEEP_GAP_MS // VAD_FRAME_MS - 2)
+        long_gap = '.' * (KEEP_GAP_MS // VAD_FRAME_MS + 2)
+
+        regions = audio_utils._voiced_regions(_pcm('##' + short_gap + '##' + long_gap + '#'), 2)
+
+        second_start = (4 + len(short_gap) + len(long_gap)) * VAD_FRAME_MS
+        assert regions == [
+            [0, (4 + len(short_gap)) * VAD_FRAME_MS],
+            [second_start, second_start + VAD_FRAME_MS],
+        ]
+
+    @pytest.mark.unit
+    def test_voiced_regions_no_speech(self, monkeypatch):
+        """Test that silence-only audio has no regions"""
+        monkeypatch.setattr(audio_utils, 'webrtcvad', _FakeWebrtcvad, raising=False)
+        assert audio_utils._voiced_regions(_pcm('.' * 10), 2) == []
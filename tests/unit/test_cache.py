@@ -0,0 +1,344 @@
+"""
+Unit Tests for cache.py
+Tests the process-local caches (SingleFlightCache, LocalTTLCache) and
+RedisCache's versioned set/invalidate
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from src import cache as cache_module
+from src.cache import SingleFlightCache, LocalTTLCache, RedisCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the cache module"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+
+    def advance(seconds):
+        now[0] += seconds
+
+    return advance
+
+
+def _run_threads(count, target):
+    """Start count threads running target(); return them"""
+    threads = [threading.Thread(target=target, daemon=True) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+# ========================================
+# Test SingleFlightCache
+# ========================================
+
+class TestSingleFlightCache:
+    """Tests for coalesced, short-TTL loading"""
+
+    @pytest.mark.unit
+    def test_concurrent_callers_share_one_load(self):
+        """Test that callers arriving during a load wait for it instead of loading again"""
+        sf = SingleFlightCache(ttl=60)
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'value'
+
+        leader = _run_threads(1, lambda: results.append(sf.get_or_load('k', loader)))
+        assert started.wait(5)
+        waiters = _run_threads(5, lambda: results.append(sf.get_or_load('k', loader)))
+        time.sleep(0.05)  # let the waiters block on the in-flight load
+        release.set()
+        for thread in leader + waiters:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert results == ['value'] * 6
+
+    @pytest.mark.unit
+    def test_failed_load_promotes_a_waiter(self):
+        """Test that when the leader's load fails, a waiter loads instead"""
+        sf = SingleFlightCache(ttl=60)
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+        errors = []
+
+        def loader():
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                release.wait(5)
+                raise RuntimeError('load failed')
+            return 'value'
+
+        def leader_call():
+            try:
+                sf.get_or_load('k', loader)
+            except RuntimeError as e:
+                errors.append(e)
+
+        leader = _run_threads(1, leader_call)
+        assert started.wait(5)
+        waiters = _run_threads(3, lambda: results.append(sf.get_or_load('k', loader)))
+        time.sleep(0.05)
+        release.set()
+        for thread in leader + waiters:
+            thread.join(5)
+
+        assert len(errors) == 1
+        assert len(calls) == 2
+        assert results == ['value'] * 3
+        assert not sf._inflight
+
+    @pytest.mark.unit
+    def test_value_reused_until_ttl_expires(self, clock):
+        """Test that a loaded value is reused within the TTL and reloaded after"""
+        sf = SingleFlightCache(ttl=0.5)
+        values = iter(['first', 'second'])
+
+        assert sf.get_or_load('k', lambda: next(values)) == 'first'
+        clock(0.4)
+        assert sf.get_or_load('k', lambda: next(values)) == 'first'
+        clock(0.2)
+        assert sf.get_or_load('k', lambda: next(values)) == 'second'
+
+    @pytest.mark.unit
+    def test_invalidate_forces_reload(self):
+        """Test that invalidate() drops the cached value"""
+        sf = SingleFlightCache(ttl=60)
+        values = iter(['first', 'second'])
+
+        sf.get_or_load('k', lambda: next(values))
+        sf.invalidate('k')
+
+        assert sf.get_or_load('k', lambda: next(values)) == 'second'
+
+    @pytest.mark.unit
+    def test_full_cache_drops_expired_entries(self, clock):
+        """Test that inserting into a full cache first drops expired entries"""
+        sf = SingleFlightCache(ttl=1, maxsize=2)
+        sf.get_or_load('a', lambda: 'a')
+        clock(2)
+        sf.get_or_load('b', lambda: 'b')
+
+        sf.get_or_load('c', lambda: 'c')
+
+        assert set(sf._values) == {'b', 'c'}
+
+    @pytest.mark.unit
+    def test_full_cache_of_fresh_entries_is_cleared(self, clock):
+        """Test that a cache still full after dropping expired entries is cleared"""
+        sf = SingleFlightCache(ttl=60, maxsize=2)
+        sf.get_or_load('a', lambda: 'a')
+        sf.get_or_load('b', lambda: 'b')
+
+        sf.get_or_load('c', lambda: 'c')
+
+        assert set(sf._values) == {'c'}
+
+
+# ========================================
+# Test LocalTTLCache
+# ========================================
+
+class TestLocalTTLCache:
+    """Tests for the process-local LRU + TTL cache"""
+
+    @pytest.mark.unit
+    def test_get_missing_returns_none(self):
+        """Test that a missing key returns None"""
+        assert LocalTTLCache().get('missing') is None
+
+    @pytest.mark.unit
+    def test_set_then_get(self):
+        """Test that a stored value is returned"""
+        local = LocalTTLCache()
+        local.set('k', {'video_id': 'dQw4w9WgXcQ'})
+        assert local.get('k') == {'video_id': 'dQw4w9WgXcQ'}
+
+    @pytest.mark.unit
+    def test_entry_expires_after_ttl(self, clock):
+        """Test that entries expire and are removed after ttl seconds"""
+        local = LocalTTLCache(ttl=10)
+        local.set('k', 'v')
+
+        clock(9)
+        assert local.get('k') == 'v'
+        clock(1)
+        assert local.get('k') is None
+        assert 'k' not in local._values
+
+    @pytest.mark.unit
+    def test_least_recently_used_is_evicted(self):
+        """Test that the least recently used entry is evicted when full"""
+        local = LocalTTLCache(maxsize=2)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')  # 'b' is now least recently used
+
+        local.set('c', 3)
+
+        assert local.get('b') is None
+        assert local.get('a') == 1
+        assert local.get('c') == 3
+
+    @pytest.mark.unit
+    def test_overwrite_refreshes_recency(self):
+        """Test that re-setting a key makes it most recently used"""
+        local = LocalTTLCache(maxsize=2)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.set('a', 10)
+
+        local.set('c', 3)
+
+        assert local.get('b') is None
+        assert local.get('a') == 10
+
+    @pytest.mark.unit
+    def test_invalidate(self):
+        """Test that invalidate() drops the entry"""
+        local = LocalTTLCache()
+        local.set('k', 'v')
+        local.invalidate('k')
+        assert local.get('k') is None
+
+
+# ========================================
+# Test RedisCache.version() / set_if_version() / invalidate()
+# ========================================
+
+class FakeRedis:
+    """Just enough of redis.Redis for RedisCache's versioned writes (WATCH/MULTI included)"""
+
+    def __init__(self):
+        self.data = {}
+        self.changes = {}  # key -> write count, for WATCH
+        self.on_multi = None
+
+    def _touch(self, key):
+        self.changes[key] = self.changes.get(key, 0) + 1
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value if isinstance(value, bytes) else value.encode('utf-8')
+        self._touch(key)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b'0')) + 1).encode('utf-8')
+        self._touch(key)
+
+    def expire(self, key, ttl):
+        pass
+
+    def delete(self, key):
+        self.data.pop(key, None)
+        self._touch(key)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.watched = {}
+        self.immediate = False
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, key):
+        self.watched[key] = self.redis.changes.get(key, 0)
+        self.immediate = True
+
+    def get(self, key):
+        return self.redis.get(key)
+
+    def multi(self):
+        self.immediate = False
+        if self.redis.on_multi:
+            self.redis.on_multi()
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.commands.append((name, args))
+        return queue
+
+    def execute(self):
+        redis_exceptions = pytest.importorskip('redis.exceptions')
+        if any(self.redis.changes.get(k, 0) != n for k, n in self.watched.items()):
+            raise redis_exceptions.WatchError('watched key changed')
+        for name, args in self.commands:
+            getattr(self.redis, name)(*args)
+
+
+@pytest.fixture
+def redis_cache():
+    pytest.importorskip('redis')
+    return RedisCache(FakeRedis())
+
+
+class TestRedisCacheVersioning:
+    """Tests that a load racing an invalidation can't re-cache a stale value"""
+
+    @pytest.mark.unit
+    def test_set_if_version_stores_value(self, redis_cache):
+        """Test that an unchanged version lets the loaded value be cached"""
+        version = redis_cache.version('cache:video:k')
+
+        assert redis_cache.set_if_version('cache:video:k', version, {'status': 'processing'}, ttl=5)
+        assert redis_cache.get('cache:video:k') == {'status': 'processing'}
+
+    @pytest.mark.unit
+    def test_invalidate_during_load_skips_set(self, redis_cache):
+        """Test that a value read before an invalidate() isn't written back"""
+        redis_cache.set_if_version('cache:video:k', redis_cache.version('cache:video:k'), {'status': 'old'})
+        version = redis_cache.version('cache:video:k')
+
+        redis_cache.invalidate('cache:video:k')  # a worker's status update lands here
+
+        assert not redis_cache.set_if_version('cache:video:k', version, {'status': 'old'})
+        assert redis_cache.get('cache:video:k') is None
+
+    @pytest.mark.unit
+    def test_invalidate_between_check_and_exec_skips_set(self, redis_cache):
+        """Test that WATCH catches an invalidate() racing the set itself"""
+        version = redis_cache.version('cache:video:k')
+        redis_cache.redis.on_multi = lambda: redis_cache.invalidate('cache:video:k')
+
+        assert not redis_cache.set_if_version('cache:video:k', version, {'status': 'old'})
+        assert redis_cache.get('cache:video:k') is None
+
+    @pytest.mark.unit
+    def test_load_after_invalidate_is_cached(self, redis_cache):
+        """Test that a load started after the invalidation caches normally"""
+        redis_cache.invalidate('cache:video:k')
+        version = redis_cache.version('cache:video:k')
+
+        assert redis_cache.set_if_version('cache:video:k', version, {'status': 'completed'})
+        assert redis_cache.get('cache:video:k') == {'status': 'completed'}
+
+    @pytest.mark.unit
+    def test_unknown_version_never_sets(self, redis_cache):
+        """Test that a None version (Redis unreachable when read) skips the set"""
+        assert not redis_cache.set_if_version('cache:video:k', None, {'status': 'processing'})
@@ -0,0 +1,92 @@
+"""
+Unit Tests for checkpoints.py
+Tests stage checkpoint save/load, stale-key detection and cleanup
+"""
+
+import pytest
+from src.checkpoints import StageCheckpoints
+
+
+# ========================================
+# Test StageCheckpoints
+# ========================================
+
+class TestStageCheckpoints:
+    """Tests for per-stage pipeline checkpoints"""
+
+    @pytest.mark.unit
+    def test_save_load_round_trip(self, temp_dir):
+        """Test that a saved stage result loads back unchanged"""
+        checkpoints = StageCheckpoints(temp_dir, 'dQw4w9WgXcQ', 'https://youtu.be/dQw4w9WgXcQ')
+        data = {'segments': [{'text': 'გამარჯობა', 'start': 0.0, 'end': 1.5}], 'title': 'Test'}
+
+        checkpoints.save('translation', data)
+
+        assert checkpoints.load('translation') == data
+
+    @pytest.mark.unit
+    def test_missing_checkpoint_returns_none(self, temp_dir):
+        """Test that a stage that was never saved loads as None"""
+        checkpoints = StageCheckpoints(temp_dir, 'dQw4w9WgXcQ')
+        assert checkpoints.load('transcription') is None
+
+    @pytest.mark.unit
+    def test_key_mismatch_is_ignored(self, temp_dir):
+        """Test that a checkpoint written for different job inputs is ignored"""
+        StageCheckpoints(temp_dir, 'dQw4w9WgXcQ', 'input-a').save('translation', {'segments': []})
+
+        checkpoints = StageCheckpoints(temp_dir, 'dQw4w9WgXcQ', 'input-b')
+
+        assert checkpoints.load('translation') is None
+
+    @pytest.mark.unit
+    def test_unreadable_checkpoint_is_ignored(self, temp_dir):
+        """Test that a corrupt checkpoint file loads as None"""
+        checkpoints = StageCheckpoints(temp_dir, 'dQw4w9WgXcQ')
+        (temp_dir / f"dQw4w9WgXcQ_download{StageCheckpoints.SUFFIX}").write_text('{not json')
+
+        assert checkpoints.load('download') is None
+
+    @pytest.mark.unit
+    def test_file_field_present(self, temp_dir):
+        """Test that a checkpoint whose files still exist is used"""
+        video_path = temp_dir / 'dQw4w9WgXcQ.mp4'
+        video_path.write_bytes(b'video')
+        checkpoints = StageCheckpoints(temp_dir, 'dQw4w9WgXcQ')
+        checkpoints.save('download', {'video_path': str(video_path)})
+
+        data = checkpoints.load('download', file_fields=('video_path',))
+
+        assert data == {'video_path': str(video_path)}
+
+    @pytest.mark.unit
+    def test_file_field_missing_file_returns_none(self, temp_dir):
+        """Test that a checkpoint pointing at a deleted file is ignored"""
+        checkpoints = StageCheckpoints(temp_dir, 'dQw4w9WgXcQ')
+        checkpoints.save('download', {'video_path': str(temp_dir / 'gone.mp4')})
+
+        assert checkpoints.load('download', file_fields=('video_path',)) is None
+
+    @pytest.mark.unit
+    def test_file_field_absent_returns_none(self, temp_dir):
+        """Test that a checkpoint without a required file field is ignored"""
+        checkpoints = StageCheckpoints(temp_dir, 'dQw4w9WgXcQ')
+        checkpoints.save('download', {'title': 'Test'})
+
+        assert checkpoints.load('download', file_fields=('video_path',)) is None
+
+    @pytest.mark.unit
+    def test_clear_removes_only_this_video(self, temp_dir):
+        """Test that clear() removes every stage of one video and nothing else"""
+        checkpoints = StageCheckpoints(temp_dir, 'dQw4w9WgXcQ')
+        other = StageCheckpoints(temp_dir, 'abc12345678')
+        checkpoints.save('download', {'title': 'Test'})
+        checkpoints.save('translation', {'segments': []})
+        other.save('download', {'title': 'Other'})
+
+        checkpoints.clear()
+
+        assert checkpoints.load('download') is None
+        assert checkpoints.load('translation') is None
+        assert other.load('download') == {'title': 'Other'}
+        assert not list(temp_dir.glob('*.tmp'))
@@ -0,0 +1,98 @@
+"""
+Unit Tests for console_logger.py
+Tests the per-session cursor used by the console log poller
+"""
+
+import uuid
+
+import pytest
+from src.console_logger import console
+
+
+@pytest.fixture
+def session_id():
+    """Fresh session on the shared console logger, cleared afterwards"""
+    sid = f"test-{uuid.uuid4().hex}"
+    yield sid
+    console.clear_session(sid)
+
+
+# ========================================
+# Test ConsoleLogger.get_logs_since()
+# ========================================
+
+class TestGetLogsSince:
+    """Tests for cursor-based console log reads"""
+
+    @pytest.mark.unit
+    def test_cursor_zero_returns_everything(self, session_id):
+        """Test that cursor 0 returns all buffered entries in order"""
+        console.log('first', session_id=session_id)
+        console.log('second', level='ERROR', session_id=session_id)
+
+        entries, lines, cursor, reset = console.get_logs_since(session_id, 0)
+
+        assert [e['message'] for e in entries] == ['first', 'second']
+        assert [e['seq'] for e in entries] == [1, 2]
+        assert lines[0].startswith('[INFO]') and lines[0].endswith('first')
+        assert lines[1].startswith('[ERROR]')
+        assert cursor == 2
+        assert reset is False
+
+    @pytest.mark.unit
+    def test_cursor_returns_only_newer_entries(self, session_id):
+        """Test that a cursor skips entries the caller has already seen"""
+        console.log('first', session_id=session_id)
+        _, _, cursor, _ = console.get_logs_since(session_id, 0)
+        console.log('second', session_id=session_id)
+        console.log('third', session_id=session_id)
+
+        entries, _, cursor, reset = console.get_logs_since(session_id, cursor)
+
+        assert [e['message'] for e in entries] == ['second', 'third']
+        assert cursor == 3
+        assert reset is False
+
+    @pytest.mark.unit
+    def test_no_new_entries_keeps_cursor(self, session_id):
+        """Test that polling with an up-to-date cursor returns nothing"""
+        console.log('first', session_id=session_id)
+
+        entries, lines, cursor, reset = console.get_logs_since(session_id, 1)
+
+        assert entries == [] and lines == []
+        assert cursor == 1
+        assert reset is False
+
+    @pytest.mark.unit
+    def test_cursor_ahead_resets(self, session_id):
+        """Test that a cursor ahead of the logger (cleared session) returns the whole buffer"""
+        for i in range(5):
+            console.log(f'old {i}', session_id=session_id)
+        console.clear_session(session_id)
+        console.log('new', session_id=session_id)
+
+        entries, _, cursor, reset = console.get_logs_since(session_id, 5)
+
+        assert reset is True
+        assert [e['message'] for e in entries] == ['new']
+        assert cursor == 1
+
+    @pytest.mark.unit
+    def test_unknown_session(self, session_id):
+        """Test that an unknown session returns nothing; a non-zero cursor resets"""
+        assert console.get_logs_since(session_id, 0) == ([], [], 0, False)
+        assert console.get_logs_since(session_id, 3) == ([], [], 0, True)
+
+    @pytest.mark.unit
+    def test_cursor_older_than_buffer_returns_what_is_left(self, session_id):
+        """Test that entries evicted from the bounded buffer are simply skipped"""
+        for i in range(250):
+            console.log(f'line {i}', session_id=session_id)
+
+        entries, _, cursor, reset = console.get_logs_since(session_id, 10)
+
+        assert reset is False
+        assert len(entries) == 200
+        assert entries[0]['seq'] == 51
+        assert cursor == 250
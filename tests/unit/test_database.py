@@ -0,0 +1,94 @@
+"""
+Unit Tests for database.py
+Tests the conditional UPDATE that lets exactly one retry claim a failed video
+"""
+
+import threading
+
+import pytest
+from src.database import Database, Video
+
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+
+
+@pytest.fixture
+def file_db(temp_dir):
+    """Database on a SQLite file, so each thread's connection sees the same rows"""
+    database = Database(f"sqlite:///{temp_dir / 'videos.db'}")
+    yield database
+    database.Session.remove()
+    database.engine.dispose()
+
+
+@pytest.fixture
+def failed_video(file_db):
+    """A video row in the 'failed' state"""
+    file_db.create_video(VIDEO_ID, 'Test Video', f'https://www.youtube.com/watch?v={VIDEO_ID}')
+    file_db.update_video_status(VIDEO_ID, 'failed', error_message='download failed')
+    return VIDEO_ID
+
+
+def _status(database, video_id):
+    session = database.get_session()
+    try:
+        return session.query(Video.processing_status, Video.status_message)\
+            .filter_by(video_id=video_id).one()
+    finally:
+        database.close_session(session)
+
+
+# ========================================
+# Test Database.claim_failed_video()
+# ========================================
+
+class TestClaimFailedVideo:
+    """Tests for claiming a failed video for retry"""
+
+    @pytest.mark.unit
+    @pytest.mark.database
+    def test_first_claim_wins(self, file_db, failed_video):
+        """Test that the first claim flips the row to processing and a second claim loses"""
+        assert file_db.claim_failed_video(failed_video) is True
+        assert file_db.claim_failed_video(failed_video) is False
+
+        status, message = _status(file_db, failed_video)
+        assert status == 'processing'
+        assert message == 'Retrying...'
+
+    @pytest.mark.unit
+    @pytest.mark.database
+    def test_concurrent_claims_only_one_wins(self, file_db, failed_video):
+        """Test that two claims racing on the same failed row give exactly one True"""
+        barrier = threading.Barrier(2)
+        results = []
+
+        def claim():
+            barrier.wait(5)
+            results.append(file_db.claim_failed_video(failed_video))
+
+        threads = [threading.Thread(target=claim) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert sorted(results) == [False, True]
+        assert _status(file_db, failed_video)[0] == 'processing'
+
+    @pytest.mark.unit
+    @pytest.mark.database
+    @pytest.mark.parametrize('status', ['processing', 'completed'])
+    def test_only_failed_rows_are_claimed(self, file_db, status):
+        """Test that a video that isn't failed can't be claimed"""
+        file_db.create_video(VIDEO_ID, 'Test Video', f'https://www.youtube.com/watch?v={VIDEO_ID}')
+        file_db.update_video_status(VIDEO_ID, status)
+
+        assert file_db.claim_failed_video(VIDEO_ID) is False
+        assert _status(file_db, VIDEO_ID)[0] == status
+
+    @pytest.mark.unit
+    @pytest.mark.database
+    def test_missing_video(self, file_db):
+        """Test that claiming an unknown video returns False"""
+        assert file_db.claim_failed_video(VIDEO_ID) is False
@@ -0,0 +1,199 @@
+"""
+Unit Tests for status_tracker.py
+Tests the CoalescingStatusWriter background writer against a fake tracker
+"""
+
+import threading
+import time
+
+import pytest
+from src.status_tracker import CoalescingStatusWriter
+
+
+class FakeTracker:
+    """Records update_status()/notify_changed() calls in order"""
+
+    def __init__(self):
+        self.calls = []
+        self.statuses = {}
+        self.lock = threading.Lock()
+        self.gate = None  # Optional (entered, release) events for the next update
+
+    def update_status(self, video_id, status_data):
+        gate, self.gate = self.gate, None
+        if gate:
+            entered, release = gate
+            entered.set()
+            release.wait(5)
+        with self.lock:
+            self.calls.append(('update', video_id, status_data['status']))
+            self.statuses[video_id] = status_data
+
+    def notify_changed(self, video_id):
+        with self.lock:
+            self.calls.append(('notify', video_id))
+
+    def updates(self, video_id=None):
+        with self.lock:
+            return [c[2] for c in self.calls if c[0] == 'update' and video_id in (None, c[1])]
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def tracker():
+    return FakeTracker()
+
+
+@pytest.fixture
+def make_writer(tracker):
+    """Build writers that are closed after the test"""
+    writers = []
+
+    def make(**kwargs):
+        writer = CoalescingStatusWriter(tracker, **kwargs)
+        writers.append(writer)
+        return writer
+
+    yield make
+    for writer in writers:
+        writer.close()
+
+
+# ========================================
+# Test CoalescingStatusWriter
+# ========================================
+
+class TestCoalescingStatusWriter:
+    """Tests for coalesced background status writes"""
+
+    @pytest.mark.unit
+    def test_updates_within_interval_are_coalesced(self, tracker, make_writer):
+        """Test that a burst of updates costs one write, of the latest value"""
+        writer = make_writer(interval=0.2)
+        for i in range(20):
+            writer.submit('aaaaaaaaaaa', {'status': f'processing {i}'})
+
+        assert _wait_until(lambda: tracker.updates())
+        time.sleep(0.1)
+
+        assert tracker.updates() == ['processing 19']
+        assert tracker.calls[-1] == ('notify', 'aaaaaaaaaaa')
+
+    @pytest.mark.unit
+    def test_last_value_wins_per_video(self, tracker, make_writer):
+        """Test that each video keeps only its newest pending status"""
+        writer = make_writer(interval=60)
+        writer.submit('aaaaaaaaaaa', {'status': 'a1'})
+        writer.submit('bbbbbbbbbbb', {'status': 'b1'})
+        writer.submit('aaaaaaaaaaa', {'status': 'a2'})
+
+        writer.flush()
+
+        assert sorted(tracker.updates()) == ['a2', 'b1']
+        assert tracker.statuses['aaaaaaaaaaa'] == {'status': 'a2'}
+
+    @pytest.mark.unit
+    def test_submit_copies_status(self, tracker, make_writer):
+        """Test that mutating the dict after submit() doesn't change the queued update"""
+        writer = make_writer(interval=60)
+        status = {'status': 'processing'}
+        writer.submit('aaaaaaaaaaa', status)
+        status['status'] = 'changed'
+
+        writer.flush()
+
+        assert tracker.updates() == ['processing']
+
+    @pytest.mark.unit
+    def test_flush_one_video_leaves_others_pending(self, tracker, make_writer):
+        """Test that flush(video_id) writes only that video"""
+        writer = make_writer(interval=60)
+        writer.submit('aaaaaaaaaaa', {'status': 'a'})
+        writer.submit('bbbbbbbbbbb', {'status': 'b'})
+
+        writer.flush('aaaaaaaaaaa')
+
+        assert tracker.updates() == ['a']
+        assert list(writer._pending) == ['bbbbbbbbbbb']
+
+    @pytest.mark.unit
+    def test_flush_waits_for_in_progress_write(self, tracker, make_writer):
+        """Test that a terminal status written after flush() can't be overwritten by a background write"""
+        writer = make_writer(interval=0.01)
+        entered, release = threading.Event(), threading.Event()
+        tracker.gate = (entered, release)
+        writer.submit('aaaaaaaaaaa', {'status': 'processing'})
+        assert entered.wait(5)  # background thread is mid-write
+
+        def finish_job():
+            writer.flush('aaaaaaaaaaa')
+            tracker.update_status('aaaaaaaaaaa', {'status': 'completed'})
+
+        finisher = threading.Thread(target=finish_job, daemon=True)
+        finisher.start()
+        time.sleep(0.05)
+        assert finisher.is_alive()  # blocked on the write lock
+
+        release.set()
+        finisher.join(5)
+
+        assert tracker.updates() == ['processing', 'completed']
+        assert tracker.statuses['aaaaaaaaaaa'] == {'status': 'completed'}
+
+    @pytest.mark.unit
+    def test_close_writes_pending_and_stops_thread(self, tracker, make_writer):
+        """Test that close() stops the writer thread promptly and writes what was pending"""
+        writer = make_writer(interval=60)
+        writer.submit('aaaaaaaaaaa', {'status': 'processing'})
+        thread = writer._thread
+
+        started = time.monotonic()
+        writer.close()
+
+        assert time.monotonic() - started < 1
+        assert not thread.is_alive()
+        assert tracker.updates() == ['processing']
+
+    @pytest.mark.unit
+    def test_submit_after_close_restarts(self, tracker, make_writer):
+        """Test that the writer can be used again after close()"""
+        writer = make_writer(interval=0.01)
+        writer.close()
+        writer.submit('aaaaaaaaaaa', {'status': 'processing'})
+
+        assert _wait_until(lambda: tracker.updates())
+        assert writer._thread.is_alive()
+
+    @pytest.mark.unit
+    def test_persist_failure_still_notifies(self, tracker, make_writer):
+        """Test that a failing persist callback is logged and readers are still woken"""
+        def persist(video_id, status_data):
+            raise RuntimeError('database unavailable')
+
+        writer = make_writer(persist=persist, interval=60)
+        writer.submit('aaaaaaaaaaa', {'status': 'processing'})
+        writer.flush()
+
+        assert tracker.calls == [
+            ('update', 'aaaaaaaaaaa', 'processing'),
+            ('notify', 'aaaaaaaaaaa'),
+        ]
+
+    @pytest.mark.unit
+    def test_persist_only_writer(self):
+        """Test that tracker=None writes only through the persist callback"""
+        persisted = []
+        writer = CoalescingStatusWriter(None, persist=lambda v, s: persisted.append((v, s)), interval=60)
+        writer.submit('aaaaaaaaaaa', {'status': 'processing'})
+
+        writer.close()
+
+        assert persisted == [('aaaaaaaaaaa', {'status': 'processing'})]
@@ -0,0 +1,270 @@
+"""
+Unit Tests for translator.py
+Tests batched translation: separator parsing, the paced per-text fallback
+and the ordered concurrent map
+"""
+
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from src import translator as translator_module
+from src.translator import Translator, split_batch, pace_fallback_request, map_ordered, BATCH_SEPARATOR
+
+
+SEP = BATCH_SEPARATOR.strip()
+
+
+class FakeChatCompletion:
+    """openai.ChatCompletion stand-in: batch requests get `batch_reply`, single ones a tagged echo"""
+
+    def __init__(self, batch_reply):
+        self.batch_reply = batch_reply
+        self.requests = []
+
+    def create(self, model, messages, temperature):
+        prompt = messages[-1]['content']
+        self.requests.append(prompt)
+        if prompt.startswith('Translate to Georgian: '):
+            content = 'ka:' + prompt[len('Translate to Georgian: '):]
+        else:
+            content = self.batch_reply
+        return {'choices': [{'message': {'content': content}}]}
+
+
+@pytest.fixture
+def openai_translator():
+    """Translator on the OpenAI path, built without API keys"""
+    translator = object.__new__(Translator)
+    translator.backend = None
+    return translator
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Install a fake openai module; returns a setter for the batch reply"""
+    def install(batch_reply):
+        completion = FakeChatCompletion(batch_reply)
+        monkeypatch.setitem(sys.modules, 'openai', SimpleNamespace(ChatCompletion=completion))
+        return completion
+    return install
+
+
+@pytest.fixture
+def paced(monkeypatch):
+    """Count pace_fallback_request() calls instead of sleeping"""
+    calls = []
+    monkeypatch.setattr(translator_module, 'pace_fallback_request', lambda: calls.append(1))
+    return calls
+
+
+# ========================================
+# Test split_batch()
+# ========================================
+
+class TestSplitBatch:
+    """Tests for splitting a packed translation response"""
+
+    @pytest.mark.unit
+    def test_splits_on_separator(self):
+        """Test a well-formed response splits into its parts"""
+        assert split_batch(BATCH_SEPARATOR.join(['ერთი', 'ორი', 'სამი'])) == ['ერთი', 'ორი', 'სამი']
+
+    @pytest.mark.unit
+    def test_separator_without_newlines(self):
+        """Test a separator the model put inline still splits"""
+        assert split_batch(f"ერთი {SEP} ორი") == ['ერთი', 'ორი']
+
+    @pytest.mark.unit
+    def test_strips_whitespace(self):
+        """Test surrounding whitespace and blank lines are removed from each part"""
+        assert split_batch(f"  ერთი \n\n{SEP}\n\n  ორი\n") == ['ერთი', 'ორი']
+
+    @pytest.mark.unit
+    def test_leading_and_trailing_separators_ignored(self):
+        """Test separators added before the first or after the last text are dropped"""
+        assert split_batch(f"{SEP}\nერთი\n{SEP}\nორი\n{SEP}\n") == ['ერთი', 'ორი']
+
+    @pytest.mark.unit
+    def test_missing_separator_gives_fewer_parts(self):
+        """Test a reply missing a separator yields fewer parts (caller detects the mismatch)"""
+        assert split_batch(f"ერთი ორი\n{SEP}\nსამი") == ['ერთი ორი', 'სამი']
+
+    @pytest.mark.unit
+    def test_empty_response(self):
+        """Test an empty reply yields no parts"""
+        assert split_batch('  \n') == []
+
+
+# ========================================
+# Test Translator.translate_batch() (OpenAI path)
+# ========================================
+
+class TestTranslateBatch:
+    """Tests for one-request batch translation and its fallback"""
+
+    @pytest.mark.unit
+    def test_matching_reply_uses_one_request(self, openai_translator, fake_openai, paced):
+        """Test a reply with one part per text is returned without fallback"""
+        completion = fake_openai(f"ა\n{SEP}\nბ\n{SEP}\nგ\n{SEP}")
+
+        result = openai_translator.translate_batch(['a', 'b', 'c'])
+
+        assert result == ['ა', 'ბ', 'გ']
+        assert completion.requests == [BATCH_SEPARATOR.join(['a', 'b', 'c'])]
+        assert paced == []
+
+    @pytest.mark.unit
+    def test_count_mismatch_falls_back_per_text(self, openai_translator, fake_openai, paced):
+        """Test a reply with a missing separator is re-translated one text at a time, paced"""
+        completion = fake_openai(f"ა ბ\n{SEP}\nგ")
+
+        result = openai_translator.translate_batch(['a', 'b', 'c'])
+
+        assert result == ['ka:a', 'ka:b', 'ka:c']
+        assert len(completion.requests) == 4
+        assert len(paced) == 3
+
+    @pytest.mark.unit
+    def test_extra_parts_fall_back(self, openai_translator, fake_openai, paced):
+        """Test a reply with too many parts also falls back"""
+        fake_openai(BATCH_SEPARATOR.join(['ა', 'ბ', 'გ']))
+
+        assert openai_translator.translate_batch(['a', 'b']) == ['ka:a', 'ka:b']
+        assert len(paced) == 2
+
+    @pytest.mark.unit
+    def test_request_error_falls_back(self, openai_translator, fake_openai, paced):
+        """Test a failed batch request falls back to per-text requests"""
+        completion = fake_openai('')
+        batch_create = completion.create
+
+        def create(model, messages, temperature):
+            if SEP in messages[-1]['content']:
+                raise RuntimeError('rate limited')
+            return batch_create(model, messages, temperature)
+
+        completion.create = create
+
+        assert openai_translator.translate_batch(['a', 'b']) == ['ka:a', 'ka:b']
+        assert len(paced) == 2
+
+    @pytest.mark.unit
+    def test_single_text_skips_batching(self, openai_translator, fake_openai, paced):
+        """Test a one-text batch is sent as a plain single request"""
+        completion = fake_openai('unused')
+
+        assert openai_translator.translate_batch(['a']) == ['ka:a']
+        assert completion.requests == ['Translate to Georgian: a']
+        assert paced == []
+
+
+# ========================================
+# Test pace_fallback_request()
+# ========================================
+
+class TestPaceFallbackRequest:
+    """Tests for spacing per-text fallback requests"""
+
+    @pytest.mark.unit
+    def test_requests_are_spaced_by_interval(self, monkeypatch):
+        """Test consecutive calls reserve slots TRANSLATION_FALLBACK_INTERVAL apart"""
+        now = [100.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr(translator_module, 'time', SimpleNamespace(monotonic=lambda: now[0], sleep=sleep))
+        monkeypatch.setattr(translator_module, '_fallback_next', 0.0)
+        monkeypatch.setattr(translator_module, 'TRANSLATION_FALLBACK_INTERVAL', 4.0)
+
+        pace_fallback_request()
+        pace_fallback_request()
+        pace_fallback_request()
+        now[0] += 20  # idle long enough that the next slot is free
+        pace_fallback_request()
+
+        assert sleeps == [4.0, 8.0]
+
+
+# ========================================
+# Test map_ordered()
+# ========================================
+
+class TestMapOrdered:
+    """Tests for the ordered, bounded concurrent map"""
+
+    @pytest.mark.unit
+    def test_results_in_input_order(self):
+        """Test results come back in input order even when later items finish first"""
+        def work(i):
+            time.sleep(0.05 if i % 2 == 0 else 0.0)
+            return i * 10
+
+        assert list(map_ordered(work, range(8), max_workers=4)) == [i * 10 for i in range(8)]
+
+    @pytest.mark.unit
+    def test_single_worker_runs_inline(self):
+        """Test max_workers=1 calls func in the caller's thread"""
+        threads = list(map_ordered(lambda _: threading.current_thread(), range(3), max_workers=1))
+        assert threads == [threading.current_thread()] * 3
+
+    @pytest.mark.unit
+    def test_worker_exception_propagates(self):
+        """Test an exception raised in a worker is re-raised to the consumer at its position"""
+        def work(i):
+            if i == 2:
+                raise ValueError('bad item')
+            return i
+
+        results = []
+        with pytest.raises(ValueError, match='bad item'):
+            for result in map_ordered(work, range(6), max_workers=3):
+                results.append(result)
+
+        assert results == [0, 1]
+
+    @pytest.mark.unit
+    def test_look_ahead_is_bounded(self):
+        """Test items are consumed lazily, at most max_workers ahead of the reader"""
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        results = map_ordered(lambda i: i, items(), max_workers=3)
+        assert next(results) == 0
+        assert len(consumed) == 3
+        results.close()
+
+    @pytest.mark.unit
+    def test_semaphore_caps_concurrent_requests(self, monkeypatch, openai_translator, fake_openai):
+        """Test concurrent batches never have more requests in flight than TRANSLATION_SEMAPHORE allows"""
+        monkeypatch.setattr(translator_module, 'TRANSLATION_SEMAPHORE', threading.BoundedSemaphore(2))
+        completion = fake_openai('unused')
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+        echo = completion.create
+
+        def create(model, messages, temperature):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            return echo(model, messages, temperature)
+
+        completion.create = create
+        batches = [[f't{i}'] for i in range(8)]
+
+        results = list(map_ordered(openai_translator.translate_batch, batches, max_workers=6))
+
+        assert results == [[f'ka:t{i}'] for i in range(8)]
+        assert peak[0] == 2
@@ -3,6 +3,8 @@ Unit Tests for validators.py
 Tests URL validation, video ID extraction, and input sanitization
 """
 
+import re
+
 import pytest
 from src.validators import (
     validate_youtube_url,
@@ -10,7 +12,11 @@ from src.validators import (
     validate_video_id,
     sanitize_filename,
     ValidationError,
-    MAX_URL_LENGTH
+    MAX_URL_LENGTH,
+    YOUTUBE_URL_PATTERN,
+    YOUTUBE_QUERY_PATTERN,
+    _match_youtube_url,
+    _is_valid_video_id,
 )
 
 
@@ -357,6 +363,102 @@ class TestSanitizeFilename:
             assert result == filename
 
 
+# ========================================
+# Test YouTube URL patterns and parse caches
+# ========================================
+
+# URL -> expected video ID (None = no match)
+URL_CASES = [
+    ('https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'dQw4w9WgXcQ'),
+    ('https://m.youtube.com/watch?v=dQw4w9WgXcQ', 'dQw4w9WgXcQ'),
+    ('http://youtube.com/embed/dQw4w9WgXcQ?autoplay=1', 'dQw4w9WgXcQ'),
+    ('https://www.youtube.com/shorts/dQw4w9WgXcQ', 'dQw4w9WgXcQ'),
+    ('https://youtu.be/dQw4w9WgXcQ?t=10', 'dQw4w9WgXcQ'),
+    ('https://voyoutube.com/watch?v=dQw4w9WgXcQ', 'dQw4w9WgXcQ'),
+    ('https://www.voyoutube.com/shorts/dQw4w9WgXcQ', 'dQw4w9WgXcQ'),
+    ('https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ', 'dQw4w9WgXcQ'),
+    ('https://example.com/page?v=dQw4w9WgXcQ', 'dQw4w9WgXcQ'),
+    ('https://example.com/page?x=1&v=dQw4w9WgXcQ', 'dQw4w9WgXcQ'),
+    ('https://example.com/watch/dQw4w9WgXcQ', None),
+    ('https://www.youtube.com/watch?v=short', None),
+    ('https://www.youtube.com/channel/UCabcdefghijk', None),
+]
+
+
+def _match_with(pattern_module, url):
+    """Match url the way _match_youtube_url does, compiling with pattern_module"""
+    url_pattern = pattern_module.compile(YOUTUBE_URL_PATTERN.pattern)
+    query_pattern = pattern_module.compile(YOUTUBE_QUERY_PATTERN.pattern)
+    match = url_pattern.search(url) or query_pattern.search(url)
+    return match.group(1) if match else None
+
+
+class TestYouTubeURLPattern:
+    """Tests for the merged URL pattern, its query fallback and the parse caches"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('url,expected', URL_CASES)
+    def test_url_forms(self, url, expected):
+        """Test each supported URL form (and non-matches) through the cached matcher"""
+        assert _match_youtube_url(url) == expected
+
+    @pytest.mark.unit
+    def test_url_form_wins_over_earlier_query_parameter(self):
+        """Test a YouTube URL form is preferred over an earlier bare ?v= parameter"""
+        url = 'https://x.com/?v=AAAAAAAAAAA&next=https://youtube.com/watch?v=BBBBBBBBBBB'
+        assert validate_youtube_url(url) == 'BBBBBBBBBBB'
+
+    @pytest.mark.unit
+    def test_leftmost_url_form_wins(self):
+        """Test that among YouTube URL forms the leftmost one is used"""
+        url = 'https://youtu.be/AAAAAAAAAAA?next=https://youtube.com/watch?v=BBBBBBBBBBB'
+        assert validate_youtube_url(url) == 'AAAAAAAAAAA'
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('url,expected', URL_CASES)
+    def test_stdlib_re_matches_module_patterns(self, url, expected):
+        """Test the pattern sources behave the same under stdlib re"""
+        assert _match_with(re, url) == expected
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('url,expected', URL_CASES)
+    def test_re2_parity(self, url, expected):
+        """Test google-re2 (optional) gives the same results as stdlib re"""
+        re2 = pytest.importorskip('re2')
+        assert _match_with(re2, url) == _match_with(re, url) == expected
+
+    @pytest.mark.unit
+    def test_match_cache_hits_on_repeat(self):
+        """Test repeated URLs are served from the lru_cache"""
+        _match_youtube_url.cache_clear()
+        url = 'https://youtu.be/dQw4w9WgXcQ'
+
+        assert validate_youtube_url(url) == 'dQw4w9WgXcQ'
+        assert validate_youtube_url('  ' + url + '  ') == 'dQw4w9WgXcQ'
+
+        info = _match_youtube_url.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    @pytest.mark.unit
+    def test_match_cache_stores_misses(self):
+        """Test a non-matching URL is cached as None and still raises"""
+        _match_youtube_url.cache_clear()
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                validate_youtube_url('https://example.com/not-a-youtube-url')
+        assert _match_youtube_url.cache_info().hits == 1
+
+    @pytest.mark.unit
+    def test_video_id_cache(self):
+        """Test the cached video ID check agrees with validate_video_id"""
+        _is_valid_video_id.cache_clear()
+        assert validate_video_id('dQw4w9WgXcQ') == 'dQw4w9WgXcQ'
+        assert extract_video_id('dQw4w9WgXcQ') == 'dQw4w9WgXcQ'
+        assert _is_valid_video_id('bad id') is False
+        assert _is_valid_video_id.cache_info().hits >= 1
+
+
 # ========================================
 # Test ValidationError Exception
 # ========================================
@@ -0,0 +1,177 @@
+"""
+Unit Tests for view_counter.py
+Tests buffered view counting and batched flushes (Redis and process-local)
+"""
+
+import pytest
+from src.view_counter import RedisViewCounter, LocalViewCounter
+
+
+class StubDatabase:
+    """Records add_view_counts() batches; fails while `fail` is set"""
+
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+        self.on_write = None
+
+    def add_view_counts(self, counts):
+        if self.on_write:
+            self.on_write()
+        if self.fail:
+            raise RuntimeError('database unavailable')
+        self.batches.append(dict(counts))
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for RedisViewCounter (hashes with bytes fields)"""
+
+    def __init__(self, error_class):
+        self.error_class = error_class
+        self.hashes = {}
+
+    def hincrby(self, key, field, amount):
+        field = field.encode('utf-8') if isinstance(field, str) else field
+        h = self.hashes.setdefault(key, {})
+        h[field] = str(int(h.get(field, b'0')) + amount).encode('utf-8')
+
+    def rename(self, src, dst):
+        if src not in self.hashes:
+            raise self.error_class('ERR no such key')
+        self.hashes[dst] = self.hashes.pop(src)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.commands = []
+
+    def hincrby(self, key, field, amount):
+        self.commands.append((key, field, amount))
+
+    def execute(self):
+        for command in self.commands:
+            self.redis.hincrby(*command)
+        self.commands = []
+
+
+@pytest.fixture
+def db():
+    database = StubDatabase()
+    yield database
+    # Counters flush again at exit; let that write succeed quietly
+    database.fail = False
+    database.on_write = None
+
+
+@pytest.fixture
+def fake_redis():
+    redis_exceptions = pytest.importorskip('redis.exceptions')
+    return FakeRedis(redis_exceptions.RedisError)
+
+
+def _counts(redis_client, key='vo:views'):
+    return {k.decode('utf-8'): int(v) for k, v in redis_client.hgetall(key).items()}
+
+
+# ========================================
+# Test RedisViewCounter
+# ========================================
+
+class TestRedisViewCounter:
+    """Tests for the Redis-hash view buffer"""
+
+    @pytest.mark.unit
+    def test_flush_writes_buffered_counts(self, fake_redis, db):
+        """Test that recorded views are written to the database in one batch"""
+        counter = RedisViewCounter(fake_redis, db, interval=3600)
+        for video_id in ['aaaaaaaaaaa', 'aaaaaaaaaaa', 'bbbbbbbbbbb']:
+            counter.record(video_id)
+
+        counter.flush()
+
+        assert db.batches == [{'aaaaaaaaaaa': 2, 'bbbbbbbbbbb': 1}]
+        assert fake_redis.hashes == {}
+
+    @pytest.mark.unit
+    def test_flush_with_nothing_buffered(self, fake_redis, db):
+        """Test that a flush with no views (RENAME of a missing key) does nothing"""
+        counter = RedisViewCounter(fake_redis, db, interval=3600)
+
+        counter.flush()
+
+        assert db.batches == []
+
+    @pytest.mark.unit
+    def test_failed_write_puts_views_back(self, fake_redis, db):
+        """Test that a failed database write re-adds the batch for the next flush"""
+        counter = RedisViewCounter(fake_redis, db, interval=3600)
+        counter.record('aaaaaaaaaaa')
+        counter.record('aaaaaaaaaaa')
+
+        db.fail = True
+        counter.flush()
+
+        assert _counts(fake_redis) == {'aaaaaaaaaaa': 2}
+        assert list(fake_redis.hashes) == ['vo:views']  # batch key removed
+
+        db.fail = False
+        counter.flush()
+
+        assert db.batches == [{'aaaaaaaaaaa': 2}]
+
+    @pytest.mark.unit
+    def test_views_during_failed_flush_are_merged(self, fake_redis, db):
+        """Test that views recorded while a flush runs aren't lost when it fails"""
+        counter = RedisViewCounter(fake_redis, db, interval=3600)
+        counter.record('aaaaaaaaaaa')
+
+        db.fail = True
+        db.on_write = lambda: counter.record('aaaaaaaaaaa')
+        counter.flush()
+
+        assert _counts(fake_redis) == {'aaaaaaaaaaa': 2}
+
+
+# ========================================
+# Test LocalViewCounter
+# ========================================
+
+class TestLocalViewCounter:
+    """Tests for the process-local fallback buffer"""
+
+    @pytest.mark.unit
+    def test_flush_writes_buffered_counts(self, db):
+        """Test that recorded views are written once and the buffer is emptied"""
+        counter = LocalViewCounter(db, interval=3600)
+        counter.record('aaaaaaaaaaa')
+        counter.record('bbbbbbbbbbb')
+        counter.record('aaaaaaaaaaa')
+
+        counter.flush()
+        counter.flush()
+
+        assert db.batches == [{'aaaaaaaaaaa': 2, 'bbbbbbbbbbb': 1}]
+
+    @pytest.mark.unit
+    def test_failed_write_keeps_counts(self, db):
+        """Test that a failed write keeps the counts, merged with newer views"""
+        counter = LocalViewCounter(db, interval=3600)
+        counter.record('aaaaaaaaaaa')
+
+        db.fail = True
+        counter.flush()
+        counter.record('aaaaaaaaaaa')
+        db.fail = False
+        counter.flush()
+
+        assert db.batches == [{'aaaaaaaaaaa': 2}]